@@ -0,0 +1,86 @@
+"""
+Benchmark presenting to an offscreen canvas with the wgpu-native backend.
+
+An offscreen canvas presents via a bitmap, so each frame is read back from
+the GPU. By default, present() waits for that readback. With
+set_bitmap_present_depth(), the readback of a frame happens while the next
+frame(s) are rendered. This script measures the frames per second for a few
+depths, rendering a full-screen triangle with a somewhat expensive fragment
+shader.
+"""
+
+import time
+
+import wgpu
+from wgpu._canvas import WgpuCanvasInterface
+from wgpu.backends.wgpu_native.extras import set_bitmap_present_depth
+
+
+N = 100
+
+
+SHADER = """
+@vertex
+fn vs_main(@builtin(vertex_index) index: u32) -> @builtin(position) vec4f {
+    let p = array(vec2f(-1.0, -1.0), vec2f(3.0, -1.0), vec2f(-1.0, 3.0));
+    return vec4f(p[index], 0.0, 1.0);
+}
+
+@fragment
+fn fs_main(@builtin(position) pos: vec4f) -> @location(0) vec4f {
+    var v = 0.0;
+    for (var i = 0; i < 16; i++) {
+        v = fract(sin(v + pos.x * 0.01 + pos.y * 0.02) * 43758.5453);
+    }
+    return vec4f(v, v, v, 1.0);
+}
+"""
+
+
+class Canvas(WgpuCanvasInterface):
+    def get_physical_size(self):
+        return (1280, 720)
+
+
+def main():
+    device = wgpu.utils.get_default_device()
+    canvas = Canvas()
+    context = canvas.get_context("wgpu")
+    context.configure(device=device, format=wgpu.TextureFormat.rgba8unorm)
+
+    shader = device.create_shader_module(code=SHADER)
+    pipeline = device.create_render_pipeline(
+        layout="auto",
+        vertex={"module": shader},
+        fragment={"module": shader, "targets": [{"format": "rgba8unorm"}]},
+    )
+
+    def draw_and_present():
+        command_encoder = device.create_command_encoder()
+        render_pass = command_encoder.begin_render_pass(
+            color_attachments=[
+                {
+                    "view": context.get_current_texture().create_view(),
+                    "load_op": wgpu.LoadOp.clear,
+                    "store_op": wgpu.StoreOp.store,
+                }
+            ],
+        )
+        render_pass.set_pipeline(pipeline)
+        render_pass.draw(3)
+        render_pass.end()
+        device.queue.submit([command_encoder.finish()])
+        context.present()
+
+    for depth in (1, 2, 3):
+        set_bitmap_present_depth(context, depth)
+        draw_and_present()  # warmup
+        t0 = time.perf_counter()
+        for _ in range(N):
+            draw_and_present()
+        t = time.perf_counter() - t0
+        print(f"depth {depth}: {N / t:6.1f} fps")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark running a compute shader on many small independent problems.
+
+ComputeKernel.run_batch() packs all input sets into one buffer, dispatches
+for each set using dynamic offsets in a single submit, and reads all outputs
+back at once. This script compares that with calling compute_with_buffers()
+and kernel.run() for each set.
+"""
+
+import time
+
+import numpy as np
+import wgpu
+from wgpu.utils.compute import ComputeKernel, compute_with_buffers
+
+
+NSETS = 1000
+SIZE = 256
+
+
+SHADER = """
+@group(0) @binding(0) var<storage, read> data1: array<f32>;
+@group(0) @binding(1) var<storage, read_write> data2: array<f32>;
+
+@compute @workgroup_size(64)
+fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+    let i = index.x;
+    data2[i] = data1[i] * 2.0;
+}
+"""
+
+
+def main():
+    wgpu.utils.get_default_device()
+    input_sets = [
+        {0: np.random.uniform(size=SIZE).astype(np.float32)} for _ in range(NSETS)
+    ]
+    out_spec = {1: (SIZE, "f")}
+    n = SIZE // 64
+    kernel = ComputeKernel(SHADER, [0], out_spec)
+
+    def with_compute_with_buffers():
+        return [compute_with_buffers(s, out_spec, SHADER, n=n) for s in input_sets]
+
+    def with_run():
+        return [kernel.run(s, n) for s in input_sets]
+
+    def with_run_batch():
+        return kernel.run_batch(input_sets, n)
+
+    print(f"{NSETS} sets of {SIZE} floats:")
+    for name, func in [
+        ("compute_with_buffers", with_compute_with_buffers),
+        ("kernel.run", with_run),
+        ("kernel.run_batch", with_run_batch),
+    ]:
+        func()  # warmup
+        t0 = time.perf_counter()
+        outputs = func()
+        t = (time.perf_counter() - t0) / NSETS
+        assert outputs[-1][1][0] == input_sets[-1][0][0] * 2
+        print(f"    {name:22} {t * 1e6:8.1f} us per set")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark streaming a large array through a compute shader in chunks.
+
+ComputeKernel.run_chunked() uploads, computes and reads back one chunk at a
+time, so arrays larger than a storage buffer (e.g. a numpy.memmap file) can
+be processed with bounded memory. With depth > 1, the upload and compute of
+a chunk overlap with the readback of the previous chunk. This script
+measures the throughput for a few chunk sizes and depths.
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import wgpu
+from wgpu.utils.compute import ComputeKernel
+
+
+NBYTES = 256 * 1024 * 1024
+
+
+SHADER = """
+@group(0) @binding(0) var<storage, read> data1: array<f32>;
+@group(0) @binding(1) var<storage, read_write> data2: array<f32>;
+
+@compute @workgroup_size(64)
+fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+    let i = index.x + index.y * 65535u * 64u;
+    if (i < arrayLength(&data2)) {
+        data2[i] = data1[i] * 2.0;
+    }
+}
+"""
+
+
+def get_dispatch_counts(rows):
+    nx = (rows + 63) // 64
+    return min(nx, 65535), (nx + 65534) // 65535, 1
+
+
+def main():
+    wgpu.utils.get_default_device()
+    kernel = ComputeKernel(SHADER, [0], {1: 4})
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "data.bin")
+        data = np.memmap(filename, np.float32, "w+", shape=(NBYTES // 4,))
+        data[:] = 1.0
+        out = np.zeros_like(data)
+
+        print(f"Streaming {NBYTES // 2**20} MiB from a memmap:")
+        for chunk_mib in (4, 16, 64):
+            for depth in (1, 2, 3):
+                t0 = time.perf_counter()
+                kernel.run_chunked(
+                    {0: data},
+                    {1: out},
+                    chunk_size=chunk_mib * 2**20 // 4,
+                    n=get_dispatch_counts,
+                    depth=depth,
+                )
+                t = time.perf_counter() - t0
+                mib_per_s = NBYTES / 2**20 / t
+                print(
+                    f"    chunks of {chunk_mib:2} MiB, depth {depth}: {mib_per_s:7.1f} MiB/s"
+                )
+        assert out[-1] == 2.0
+        del data
+
+
+if __name__ == "__main__":
+    main()
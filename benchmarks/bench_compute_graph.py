@@ -0,0 +1,70 @@
+"""
+Benchmark chaining compute kernels with wgpu.utils.compute_graph.
+
+Chaining kernels with ComputeKernel.run() means that each intermediate
+result is read back to the CPU and uploaded again. With a ComputeGraph, the
+intermediate results stay on the GPU, all dispatches are submitted in one
+command buffer, and only the final result is read back. This script
+measures a chain of a few kernels for a few array sizes.
+"""
+
+import time
+
+import numpy as np
+import wgpu
+from wgpu.utils.compute import ComputeKernel
+from wgpu.utils.compute_graph import ComputeGraph
+
+
+N = 20
+CHAIN_LENGTH = 8
+
+
+SHADER = """
+@group(0) @binding(0) var<storage, read> data1: array<f32>;
+@group(0) @binding(1) var<storage, read_write> data2: array<f32>;
+
+@compute @workgroup_size(64)
+fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+    let i = index.x;
+    if (i < arrayLength(&data2)) {
+        data2[i] = data1[i] * 0.5 + 1.0;
+    }
+}
+"""
+
+
+def main():
+    wgpu.utils.get_default_device()
+
+    for size in (1024, 64 * 1024, 1024 * 1024):
+        data = np.random.uniform(size=size).astype(np.float32)
+        kernel = ComputeKernel(SHADER, [0], {1: (size, np.float32)})
+        n = (size + 63) // 64
+        graph = ComputeGraph()
+
+        def with_run(data=data, kernel=kernel, n=n):
+            x = data
+            for _ in range(CHAIN_LENGTH):
+                x = kernel.run({0: x}, n)[1]
+            return x
+
+        def with_graph(data=data, kernel=kernel, n=n, graph=graph):
+            x = graph.array(data)
+            for _ in range(CHAIN_LENGTH):
+                x = graph.call(kernel, {0: x}, n)[1]
+            return graph.evaluate(x)[0]
+
+        print(f"Chain of {CHAIN_LENGTH} kernels on {size} floats:")
+        for name, func in [("kernel.run", with_run), ("compute graph", with_graph)]:
+            func()  # warmup
+            t0 = time.perf_counter()
+            for _ in range(N):
+                result = func()
+            t = (time.perf_counter() - t0) / N
+            assert np.allclose(result, with_run())
+            print(f"    {name:16} {t * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark running a compute shader repeatedly using wgpu.utils.compute.
+
+Creating a ComputeKernel compiles the shader and creates the layouts and
+pipeline. Running it uploads the input and reads back the output, reusing
+the buffers. This script compares creating a new kernel for each run (how
+compute_with_buffers() used to work), calling compute_with_buffers() (which
+caches its kernels), and running a single kernel directly.
+"""
+
+import time
+
+import numpy as np
+import wgpu
+from wgpu.utils.compute import ComputeKernel, compute_with_buffers
+
+
+N = 200
+
+
+SHADER = """
+@group(0) @binding(0) var<storage, read> data1: array<f32>;
+@group(0) @binding(1) var<storage, read_write> data2: array<f32>;
+
+@compute @workgroup_size(64)
+fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+    let i = index.x;
+    if (i < arrayLength(&data2)) {
+        data2[i] = data1[i] * 2.0;
+    }
+}
+"""
+
+
+def main():
+    wgpu.utils.get_default_device()
+
+    for size in (1024, 1024 * 1024):
+        data = np.random.uniform(size=size).astype(np.float32)
+        out_spec = {1: (size, "f")}
+        n = (size + 63) // 64
+
+        def new_kernel_per_run(data=data, out_spec=out_spec, n=n):
+            for _ in range(N):
+                ComputeKernel(SHADER, [0], out_spec).run({0: data}, n)
+
+        def with_compute_with_buffers(data=data, out_spec=out_spec, n=n):
+            for _ in range(N):
+                compute_with_buffers({0: data}, out_spec, SHADER, n=n)
+
+        kernel = ComputeKernel(SHADER, [0], out_spec)
+
+        def with_kernel(data=data, kernel=kernel, n=n):
+            for _ in range(N):
+                kernel.run({0: data}, n)
+
+        print(f"{size} floats:")
+        for name, func in [
+            ("new kernel per run", new_kernel_per_run),
+            ("compute_with_buffers", with_compute_with_buffers),
+            ("kernel.run", with_kernel),
+        ]:
+            func()  # warmup
+            t0 = time.perf_counter()
+            func()
+            t = (time.perf_counter() - t0) / N
+            print(f"    {name:22} {t * 1e6:8.1f} us per run")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark deferred error checking in the wgpu-native backend.
+
+By default, each call into wgpu-native (via libf) captures errors, so that
+they can be raised from the call that caused them. With deferred error
+checking, errors are only captured by checkpoint calls like finish(). This
+script compares the time per call for a few API methods in both modes.
+"""
+
+import timeit
+
+import wgpu
+from wgpu.backends.wgpu_native.extras import set_deferred_error_checking
+
+
+N = 100_000
+
+
+def get_cases():
+    device = wgpu.utils.get_default_device()
+    buffer = device.create_buffer(size=64, usage="COPY_DST")
+    texture = device.create_texture(
+        size=(64, 64, 1), format="rgba8unorm", usage="RENDER_ATTACHMENT"
+    )
+    encoder = device.create_command_encoder()
+    render_pass = encoder.begin_render_pass(
+        color_attachments=[
+            {"view": texture.create_view(), "load_op": "clear", "store_op": "store"}
+        ]
+    )
+
+    return {
+        "set_viewport": lambda: render_pass.set_viewport(0, 0, 64, 64, 0, 1),
+        "set_stencil_reference": lambda: render_pass.set_stencil_reference(0),
+        "insert_debug_marker": lambda: render_pass.insert_debug_marker("x"),
+        "clear_buffer": lambda: encoder.clear_buffer(buffer),
+    }
+
+
+def main():
+    cases = get_cases()
+
+    # Alternate between the modes, to average out effects of e.g. the GC
+    results = {}
+    try:
+        for _ in range(3):
+            for deferred in (False, True):
+                set_deferred_error_checking(deferred)
+                for name, func in cases.items():
+                    t = timeit.timeit(func, number=N) / N
+                    key = name, deferred
+                    results[key] = min(results.get(key, t), t)
+    finally:
+        set_deferred_error_checking(False)
+
+    for name in cases:
+        t1 = results[(name, False)] * 1e6
+        t2 = results[(name, True)] * 1e6
+        print(
+            f"{name:22} immediate: {t1:5.2f} us   deferred: {t2:5.2f} us   "
+            f"speedup: {t1 / t2:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark the time to import the wgpu-native backend.
+
+Compares a cold import that uses the precompiled ffi module (_wgpu_ffi.py,
+created with tools/build_wgpu_ffi.py) with one that parses the header at
+import time. Each import runs in a fresh subprocess.
+"""
+
+import sys
+import time
+import subprocess
+
+
+N = 10
+
+CODE_PRECOMPILED = "import wgpu.backends.wgpu_native._ffi"
+
+# Setting the module to None in sys.modules makes its import raise ImportError
+CODE_PARSE_HEADER = (
+    "import sys; sys.modules['wgpu.backends.wgpu_native._wgpu_ffi'] = None; "
+    + CODE_PRECOMPILED
+)
+
+CODE_CHECK = (
+    "import wgpu.backends.wgpu_native._ffi as m; import cffi; "
+    "print(not isinstance(m.ffi, cffi.FFI))"
+)
+
+
+def time_import(code, n=N):
+    times = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    p = subprocess.run(
+        [sys.executable, "-c", CODE_CHECK], check=True, capture_output=True
+    )
+    if p.stdout.decode().strip() != "True":
+        print("The precompiled ffi module is missing or stale.")
+        print("Run tools/build_wgpu_ffi.py first.")
+        return
+
+    t_baseline = time_import("pass")
+    t_parse = time_import(CODE_PARSE_HEADER) - t_baseline
+    t_precompiled = time_import(CODE_PRECOMPILED) - t_baseline
+
+    print(f"import _ffi, parsing header:      {t_parse * 1000:6.1f} ms")
+    print(f"import _ffi, precompiled module:  {t_precompiled * 1000:6.1f} ms")
+    print(f"speedup: {t_parse / t_precompiled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark the device poll thread of the wgpu-native backend.
+
+By default, promise.sync_wait() polls the device, with naps that ramp up to
+10ms in between. With set_poll_thread(), a background thread waits for the
+submitted work, and the waiting thread is woken up as soon as the promise
+resolves. This script measures the time of a small read_buffer() after a
+compute dispatch that keeps the GPU busy for a bit, with and without the
+poll thread. The CPU time of the process is shown as well.
+"""
+
+import time
+
+import wgpu
+from wgpu.backends.wgpu_native.extras import set_poll_thread
+
+
+N = 100
+
+
+SHADER = """
+@group(0) @binding(0) var<storage, read_write> data: array<f32>;
+
+@compute @workgroup_size(64)
+fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+    var v = data[index.x];
+    for (var i = 0; i < 100; i++) {
+        v = fract(sin(v) * 43758.5453);
+    }
+    data[index.x] = v;
+}
+"""
+
+
+def main():
+    device = wgpu.utils.get_default_device()
+    buffer = device.create_buffer(size=4 * 64 * 256, usage="STORAGE | COPY_SRC")
+    pipeline = device.create_compute_pipeline(
+        layout="auto",
+        compute={"module": device.create_shader_module(code=SHADER)},
+    )
+    bind_group = device.create_bind_group(
+        layout=pipeline.get_bind_group_layout(0),
+        entries=[{"binding": 0, "resource": {"buffer": buffer}}],
+    )
+
+    def dispatch_and_read():
+        command_encoder = device.create_command_encoder()
+        compute_pass = command_encoder.begin_compute_pass()
+        compute_pass.set_pipeline(pipeline)
+        compute_pass.set_bind_group(0, bind_group)
+        compute_pass.dispatch_workgroups(256)
+        compute_pass.end()
+        device.queue.submit([command_encoder.finish()])
+        device.queue.read_buffer(buffer, size=256)
+
+    try:
+        for enabled in (False, True, False, True):
+            set_poll_thread(device, enabled)
+            dispatch_and_read()  # warmup
+            t0, c0 = time.perf_counter(), time.process_time()
+            for _ in range(N):
+                dispatch_and_read()
+            t = (time.perf_counter() - t0) / N * 1000
+            c = (time.process_time() - c0) / N * 1000
+            name = "poll thread" if enabled else "sync_wait polling"
+            print(f"{name:20} {t:6.2f} ms per read   cpu: {c:6.2f} ms per read")
+    finally:
+        set_poll_thread(device, False)
+
+
+if __name__ == "__main__":
+    main()
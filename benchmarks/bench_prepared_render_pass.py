@@ -0,0 +1,104 @@
+"""
+Benchmark prepared render passes in the wgpu-native backend.
+
+Compares begin_render_pass(), which converts the full descriptor to C structs
+for every pass, with a descriptor prepared once using prepare_render_pass(),
+of which only the color view and clear value are swapped per pass. Both a
+pass with a single color attachment, and a pass with three color attachments
+plus a depth attachment are measured.
+"""
+
+import timeit
+
+import wgpu
+from wgpu.backends.wgpu_native.extras import (
+    prepare_render_pass,
+    begin_prepared_render_pass,
+)
+
+
+N = 10_000
+
+
+def get_cases():
+    device = wgpu.utils.get_default_device()
+
+    def create_view(format="rgba8unorm"):
+        texture = device.create_texture(
+            size=(64, 64, 1), format=format, usage="RENDER_ATTACHMENT"
+        )
+        return texture.create_view()
+
+    # Two sets of views, to swap between, like the textures of a canvas
+    views = [create_view(), create_view()]
+    extra_views = [create_view(), create_view()]
+    depth_view = create_view("depth32float")
+    encoder = device.create_command_encoder()
+
+    def get_color_attachments(view, n):
+        attachments = [
+            {
+                "view": view,
+                "clear_value": (0, 0, 0, 1),
+                "load_op": "clear",
+                "store_op": "store",
+            }
+        ]
+        for extra_view in extra_views[: n - 1]:
+            attachments.append(
+                {"view": extra_view, "load_op": "load", "store_op": "store"}
+            )
+        return attachments
+
+    depth_stencil_attachment = {
+        "view": depth_view,
+        "depth_clear_value": 1.0,
+        "depth_load_op": "clear",
+        "depth_store_op": "store",
+    }
+
+    cases = {}
+    for name, n, ds_attachment in [
+        ("1 color attachment", 1, None),
+        ("3 color + depth attachments", 3, depth_stencil_attachment),
+    ]:
+        frame = [0]
+
+        def begin_render_pass(n=n, ds_attachment=ds_attachment, frame=frame):
+            frame[0] += 1
+            encoder.begin_render_pass(
+                color_attachments=get_color_attachments(views[frame[0] % 2], n),
+                depth_stencil_attachment=ds_attachment,
+            ).end()
+
+        prepared = prepare_render_pass(
+            device,
+            color_attachments=get_color_attachments(views[0], n),
+            depth_stencil_attachment=ds_attachment,
+        )
+
+        def begin_prepared(prepared=prepared, frame=frame):
+            frame[0] += 1
+            prepared.set_color_attachment(
+                0, view=views[frame[0] % 2], clear_value=(0, 0, 0, 1)
+            )
+            begin_prepared_render_pass(encoder, prepared).end()
+
+        cases[name] = begin_render_pass, begin_prepared
+
+    return cases
+
+
+def main():
+    cases = get_cases()
+    for name, (func1, func2) in cases.items():
+        t1 = min(timeit.repeat(func1, number=N, repeat=3)) / N * 1e6
+        t2 = min(timeit.repeat(func2, number=N, repeat=3)) / N * 1e6
+        print(f"{name}:")
+        print(f"    begin_render_pass:           {t1:6.2f} us per pass")
+        print(f"    begin_prepared_render_pass:  {t2:6.2f} us per pass")
+        print(f"    speedup: {t1 / t2:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark reading buffers back with the wgpu-native backend.
+
+The queue keeps a pool of staging buffers for read_buffer(). This script
+compares reads that create a new staging buffer each time (by disabling the
+pool), reads using the pool, reads into a preallocated array using out=, and
+reads via read_buffer_async() with multiple reads in flight.
+"""
+
+import time
+
+import numpy as np
+import wgpu
+
+
+N = 500
+IN_FLIGHT = 4
+
+
+def main():
+    device = wgpu.utils.get_default_device()
+    queue = device.queue
+    pool = queue._get_staging_pool()
+
+    for nbytes in (1024, 256 * 1024, 4 * 1024 * 1024):
+        buffer = device.create_buffer_with_data(
+            data=bytes(nbytes), usage=wgpu.BufferUsage.COPY_SRC
+        )
+
+        def read_sync(buffer=buffer):
+            for _ in range(N):
+                queue.read_buffer(buffer)
+
+        out = np.empty(nbytes, np.uint8)
+
+        def read_into(buffer=buffer, out=out):
+            for _ in range(N):
+                queue.read_buffer(buffer, out=out)
+
+        def read_async(buffer=buffer):
+            promises = []
+            for _ in range(N):
+                promises.append(queue.read_buffer_async(buffer))
+                if len(promises) >= IN_FLIGHT:
+                    promises.pop(0).sync_wait()
+            for promise in promises:
+                promise.sync_wait()
+
+        results = {}
+        for _ in range(3):
+            for name, max_free, func in [
+                ("new buffer", 0, read_sync),
+                ("pooled", 4, read_sync),
+                ("pooled, out=", 4, read_into),
+                (f"async, {IN_FLIGHT} in flight", 4, read_async),
+            ]:
+                pool.clear()
+                pool.max_free_per_size = max_free
+                t0 = time.perf_counter()
+                func()
+                t = (time.perf_counter() - t0) / N
+                results[name] = min(results.get(name, t), t)
+        pool.max_free_per_size = type(pool).max_free_per_size
+
+        print(f"{nbytes // 1024} KiB:")
+        for name, t in results.items():
+            print(f"    {name:20} {t * 1e6:8.1f} us per read")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark reading textures back with the wgpu-native backend.
+
+When bytes_per_row is not a multiple of 256, read_texture() must remove the
+extra stride from each row. This script measures that de-striding step for
+a few common sizes, comparing slicing memoryviews per row (how it used to be
+done), a loop of ffi.memmove calls (used when numpy is not available), and a
+single strided copy using numpy. The time of the full read_texture() call is
+shown for reference.
+"""
+
+import time
+
+import wgpu
+from wgpu.backends.wgpu_native import _helpers
+from wgpu.backends.wgpu_native._helpers import copy_rows, get_memoryview_and_address
+
+
+SIZES = [
+    ("1000x1000 rgba8unorm", (1000, 1000, 1), "rgba8unorm", 4),
+    ("1366x768 rgba8unorm", (1366, 768, 1), "rgba8unorm", 4),
+    ("257x257x257 r32float", (257, 257, 257), "r32float", 4),
+]
+
+
+def destride_with_slices(dst, src, dst_stride, src_stride, nrows):
+    for i in range(nrows):
+        row = src[i * src_stride : i * src_stride + dst_stride]
+        dst[i * dst_stride : (i + 1) * dst_stride] = row
+
+
+def destride_with_copy_rows(dst, src, dst_stride, src_stride, nrows):
+    dst_address = get_memoryview_and_address(dst)[1]
+    src_address = get_memoryview_and_address(src)[1]
+    copy_rows(dst_address, dst_stride, src_address, src_stride, dst_stride, nrows)
+
+
+def timeit(func, n=5):
+    times = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    return min(times) * 1000
+
+
+def main():
+    device = wgpu.utils.get_default_device()
+    get_numpy = _helpers.get_numpy
+
+    for name, size, format, bpp in SIZES:
+        dst_stride = size[0] * bpp
+        src_stride = dst_stride + (256 - dst_stride % 256) % 256
+        assert src_stride != dst_stride, "this size does not need de-striding"
+        nrows = size[1] * size[2]
+        src = memoryview(bytearray(src_stride * nrows))
+        dst = memoryview(bytearray(dst_stride * nrows))
+
+        texture = device.create_texture(
+            size=size,
+            dimension="3d" if size[2] > 1 else "2d",
+            format=format,
+            usage=wgpu.TextureUsage.COPY_SRC,
+        )
+
+        def read_texture(texture=texture, size=size, dst_stride=dst_stride):
+            device.queue.read_texture(
+                {"texture": texture}, {"bytes_per_row": dst_stride}, size
+            )
+
+        args = dst, src, dst_stride, src_stride, nrows
+        t_slices = timeit(lambda args=args: destride_with_slices(*args))
+        try:
+            _helpers.get_numpy = lambda: None
+            t_memmove = timeit(lambda args=args: destride_with_copy_rows(*args))
+            t_read_memmove = timeit(read_texture)
+        finally:
+            _helpers.get_numpy = get_numpy
+        t_numpy = timeit(lambda args=args: destride_with_copy_rows(*args))
+        t_read_numpy = timeit(read_texture)
+
+        print(f"{name} ({nrows} rows of {dst_stride} bytes, stride {src_stride}):")
+        print(f"    de-stride with memoryview slices {t_slices:8.2f} ms")
+        print(f"    de-stride with memmove loop      {t_memmove:8.2f} ms")
+        print(f"    de-stride with numpy             {t_numpy:8.2f} ms")
+        print(f"    read_texture without numpy       {t_read_memmove:8.2f} ms")
+        print(f"    read_texture with numpy          {t_read_numpy:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark the struct arena in the wgpu-native backend.
+
+Methods decorated with with_struct_arena() keep the objects referenced by
+their structs alive in a per-call list, instead of registering each struct
+in the global _refs_per_struct WeakKeyDictionary. This script compares both
+modes (by calling the undecorated method via __wrapped__), reporting per
+call: the time, and the number of registry entries (each being a weakref
+plus a dict insert, which are cleaned up again when the struct is freed).
+"""
+
+import timeit
+
+import wgpu
+from wgpu.backends.wgpu_native import _api
+
+
+N = 10_000
+
+
+class CountingWeakKeyDictionary(_api.WeakKeyDictionary):
+    count = 0
+
+    def __setitem__(self, key, value):
+        self.count += 1
+        super().__setitem__(key, value)
+
+
+def get_cases():
+    device = wgpu.utils.get_default_device()
+    buffer = device.create_buffer(size=256 * 64, usage="UNIFORM|COPY_DST")
+    layout = device.create_bind_group_layout(
+        entries=[
+            {"binding": i, "visibility": "FRAGMENT", "buffer": {"type": "uniform"}}
+            for i in range(4)
+        ]
+    )
+    texture = device.create_texture(
+        size=(64, 64, 1), format="rgba8unorm", usage="RENDER_ATTACHMENT|COPY_SRC"
+    )
+    view = texture.create_view()
+    readback = device.create_buffer(size=256 * 64, usage="COPY_DST")
+    encoder = device.create_command_encoder()
+
+    def create_bind_group():
+        device.create_bind_group(
+            layout=layout,
+            entries=[
+                {"binding": i, "resource": {"buffer": buffer, "offset": i * 256}}
+                for i in range(4)
+            ],
+        )
+
+    def begin_render_pass():
+        encoder.begin_render_pass(
+            color_attachments=[{"view": view, "load_op": "clear", "store_op": "store"}],
+        ).end()
+
+    def copy_texture_to_buffer():
+        encoder.copy_texture_to_buffer(
+            {"texture": texture},
+            {"buffer": readback, "bytes_per_row": 256},
+            (64, 64, 1),
+        )
+
+    cases = {
+        "create_bind_group": (wgpu.GPUDevice, "create_bind_group", create_bind_group),
+        "begin_render_pass": (
+            wgpu.GPUCommandEncoder,
+            "begin_render_pass",
+            begin_render_pass,
+        ),
+        "copy_texture_to_buffer": (
+            wgpu.GPUCommandEncoder,
+            "copy_texture_to_buffer",
+            copy_texture_to_buffer,
+        ),
+    }
+    return cases
+
+
+def measure(func):
+    registry = CountingWeakKeyDictionary()
+    ori_registry = _api._refs_per_struct
+    _api._refs_per_struct = registry
+    try:
+        t = min(timeit.repeat(func, number=N, repeat=3)) / N
+    finally:
+        _api._refs_per_struct = ori_registry
+
+    return t, registry.count / (3 * N)
+
+
+def main():
+    cases = get_cases()
+    for name, (cls, method_name, func) in cases.items():
+        cls = getattr(_api, cls.__name__)
+        method = getattr(cls, method_name)
+        # Without arena
+        setattr(cls, method_name, method.__wrapped__)
+        try:
+            t1, r1 = measure(func)
+        finally:
+            setattr(cls, method_name, method)
+        # With arena
+        t2, r2 = measure(func)
+        print(f"{name}:")
+        print(f"    registry:  {t1 * 1e6:6.2f} us per call, {r1:4.1f} entries per call")
+        print(f"    arena:     {t2 * 1e6:6.2f} us per call, {r2:4.1f} entries per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark struct creation in the wgpu-native backend.
+
+Compares the generated per-struct builders (_builders.py) with the generic
+code path in _new_struct_p(), both for building a single descriptor, and
+for the create_buffer() and create_bind_group() methods.
+"""
+
+import timeit
+
+import wgpu
+from wgpu.backends.wgpu_native import _api
+
+
+N = 10_000
+
+
+def get_cases():
+    device = wgpu.utils.get_default_device()
+    buffer = device.create_buffer(size=64, usage="UNIFORM|COPY_DST")
+    layout = device.create_bind_group_layout(
+        entries=[
+            {
+                "binding": 0,
+                "visibility": "VERTEX|FRAGMENT",
+                "buffer": {"type": "uniform"},
+            }
+        ]
+    )
+
+    def new_struct_p():
+        _api.new_struct_p(
+            "WGPUTextureViewDescriptor *",
+            label=_api.to_c_string_view(None),
+            format="rgba8unorm",
+            dimension="2d",
+            baseMipLevel=0,
+            mipLevelCount=1,
+            baseArrayLayer=0,
+            arrayLayerCount=1,
+            aspect="all",
+            usage=0,
+        )
+
+    def create_buffer():
+        device.create_buffer(size=64, usage="UNIFORM|COPY_DST")
+
+    def create_bind_group():
+        device.create_bind_group(
+            layout=layout,
+            entries=[{"binding": 0, "resource": {"buffer": buffer}}],
+        )
+
+    return {
+        "new_struct_p": new_struct_p,
+        "create_buffer": create_buffer,
+        "create_bind_group": create_bind_group,
+    }
+
+
+def main():
+    cases = get_cases()
+    builders = _api.struct_builders.copy()
+
+    # Alternate between the modes, to average out effects of e.g. the GC
+    results = {}
+    for _ in range(5):
+        for mode in ("generic", "builders"):
+            _api.struct_builders.clear()
+            if mode == "builders":
+                _api.struct_builders.update(builders)
+            for name, func in cases.items():
+                t = timeit.timeit(func, number=N) / N
+                key = name, mode
+                results[key] = min(results.get(key, t), t)
+    _api.struct_builders.update(builders)
+
+    for name in cases:
+        t1 = results[(name, "generic")] * 1e6
+        t2 = results[(name, "builders")] * 1e6
+        print(
+            f"{name:20} generic: {t1:6.2f} us   builders: {t2:6.2f} us   speedup: {t1 / t2:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+"""
+A benchmark suite for the overhead of the Python side of the wgpu API.
+
+Measures the number of objects per second for each ``GPUDevice.create_*``
+method, the number of encoder commands per second, the bandwidth of the
+queue's read and write methods for a range of sizes, the latency of
+resolving promises, and the import time. The results can be written to a
+JSON file, and compared against a previous result (the baseline) to catch
+regressions:
+
+    python benchmarks/suite.py --output baseline.json
+    ...  # make changes
+    python benchmarks/suite.py --baseline baseline.json
+
+The exit code is 1 if any benchmark regressed by more than the threshold.
+Use ``-k`` to run only the benchmarks whose name contains a given string.
+
+The numbers mostly reflect the CPU side, so the suite can be run with a
+software adapter, e.g. lavapipe or llvmpipe. The adapter can be selected
+with the ``WGPUPY_WGPU_ADAPTER_NAME`` and ``WGPU_BACKEND_TYPE`` environment
+variables. Comparisons are only meaningful on the same machine and adapter.
+"""
+
+import sys
+import json
+import time
+import timeit
+import platform
+import argparse
+import subprocess
+
+import wgpu
+
+
+REPEAT = 5
+N_COMMANDS = 1000
+
+BUFFER_SIZES = [1024, 64 * 1024, 1024**2, 16 * 1024**2]
+TEXTURE_SIZES = [16, 128, 512, 2048]  # square rgba8unorm textures
+
+
+SHADER = """
+@group(0) @binding(0) var<storage, read_write> data: array<f32>;
+
+@compute @workgroup_size(64)
+fn cs_main(@builtin(global_invocation_id) index: vec3<u32>) {
+    data[index.x] = data[index.x] + 1.0;
+}
+
+@vertex
+fn vs_main(@location(0) pos: vec2f) -> @builtin(position) vec4f {
+    return vec4f(pos, 0.0, 1.0);
+}
+
+@fragment
+fn fs_main() -> @location(0) vec4f {
+    return vec4f(1.0);
+}
+"""
+
+
+# %% Helpers
+
+
+def measure(func, number=None, repeat=REPEAT):
+    """Get the best time per call of func, in seconds."""
+    timer = timeit.Timer(func)
+    if number is None:
+        number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def format_size(nbytes):
+    if nbytes >= 1024**2:
+        return f"{nbytes // 1024**2}MiB"
+    return f"{nbytes // 1024}KiB"
+
+
+def result(value, unit, higher_is_better):
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+class Objects:
+    """The objects needed by the benchmarks."""
+
+    def __init__(self, device):
+        self.device = device
+        self.shader = device.create_shader_module(code=SHADER)
+        self.buffer = device.create_buffer(
+            size=64 * 4 * 16, usage="STORAGE | VERTEX | COPY_SRC | COPY_DST"
+        )
+        self.buffer2 = device.create_buffer(size=64 * 4 * 16, usage="COPY_DST")
+        self.bind_group_layout = device.create_bind_group_layout(
+            entries=[
+                {
+                    "binding": 0,
+                    "visibility": wgpu.ShaderStage.COMPUTE,
+                    "buffer": {"type": wgpu.BufferBindingType.storage},
+                }
+            ]
+        )
+        self.pipeline_layout = device.create_pipeline_layout(
+            bind_group_layouts=[self.bind_group_layout]
+        )
+        self.bind_group = device.create_bind_group(
+            layout=self.bind_group_layout,
+            entries=[{"binding": 0, "resource": {"buffer": self.buffer}}],
+        )
+        self.compute_pipeline = device.create_compute_pipeline(
+            layout=self.pipeline_layout,
+            compute={"module": self.shader},
+        )
+        self.render_pipeline = device.create_render_pipeline(
+            **self.get_render_pipeline_descriptor()
+        )
+        self.texture = device.create_texture(
+            size=(64, 64, 1), format="rgba8unorm", usage="RENDER_ATTACHMENT"
+        )
+        self.view = self.texture.create_view()
+
+    def get_render_pipeline_descriptor(self):
+        return {
+            "layout": self.device.create_pipeline_layout(bind_group_layouts=[]),
+            "vertex": {
+                "module": self.shader,
+                "buffers": [
+                    {
+                        "array_stride": 8,
+                        "attributes": [
+                            {"format": "float32x2", "offset": 0, "shader_location": 0}
+                        ],
+                    }
+                ],
+            },
+            "fragment": {"module": self.shader, "targets": [{"format": "rgba8unorm"}]},
+        }
+
+
+# %% Benchmarks
+
+
+def bench_create(objects):
+    """The number of objects per second for each GPUDevice.create_* method."""
+    device = objects.device
+    data = bytes(256)
+    render_pipeline_descriptor = objects.get_render_pipeline_descriptor()
+    cases = {
+        "create_buffer": lambda: device.create_buffer(size=256, usage="STORAGE"),
+        "create_buffer_with_data": lambda: device.create_buffer_with_data(
+            data=data, usage="STORAGE"
+        ),
+        "create_texture": lambda: device.create_texture(
+            size=(16, 16, 1), format="rgba8unorm", usage="TEXTURE_BINDING"
+        ),
+        "create_sampler": lambda: device.create_sampler(),
+        "create_bind_group_layout": lambda: device.create_bind_group_layout(
+            entries=[
+                {
+                    "binding": 0,
+                    "visibility": wgpu.ShaderStage.COMPUTE,
+                    "buffer": {"type": wgpu.BufferBindingType.storage},
+                }
+            ]
+        ),
+        "create_pipeline_layout": lambda: device.create_pipeline_layout(
+            bind_group_layouts=[objects.bind_group_layout]
+        ),
+        "create_bind_group": lambda: device.create_bind_group(
+            layout=objects.bind_group_layout,
+            entries=[{"binding": 0, "resource": {"buffer": objects.buffer}}],
+        ),
+        "create_shader_module": lambda: device.create_shader_module(code=SHADER),
+        "create_compute_pipeline": lambda: device.create_compute_pipeline(
+            layout=objects.pipeline_layout,
+            compute={"module": objects.shader},
+        ),
+        "create_render_pipeline": lambda: device.create_render_pipeline(
+            **render_pipeline_descriptor
+        ),
+        "create_command_encoder": lambda: device.create_command_encoder(),
+        "create_query_set": lambda: device.create_query_set(type="occlusion", count=16),
+        "create_render_bundle_encoder": lambda: device.create_render_bundle_encoder(
+            color_formats=["rgba8unorm"]
+        ),
+    }
+    # The async variants are covered by their sync counterparts
+    names = [
+        name
+        for name in dir(wgpu.GPUDevice)
+        if name.startswith("create_") and not name.endswith("_async")
+    ]
+    for name in names:
+        if name not in cases:
+            print(f"No benchmark for GPUDevice.{name}")
+    for name, func in cases.items():
+        yield (
+            f"create.{name[7:]}",
+            lambda func=func: result(1 / measure(func), "objects/s", True),
+        )
+
+
+def bench_commands(objects):
+    """The number of encoder commands per second."""
+    device = objects.device
+    o = objects
+
+    # Each case returns its command encoder, so it can be checked to be valid
+
+    def compute_pass_case(command):
+        def func():
+            command_encoder = device.create_command_encoder()
+            compute_pass = command_encoder.begin_compute_pass()
+            compute_pass.set_pipeline(o.compute_pipeline)
+            compute_pass.set_bind_group(0, o.bind_group)
+            for _ in range(N_COMMANDS):
+                command(compute_pass)
+            compute_pass.end()
+            return command_encoder
+
+        return func
+
+    def render_pass_case(command):
+        def func():
+            command_encoder = device.create_command_encoder()
+            render_pass = command_encoder.begin_render_pass(
+                color_attachments=[
+                    {"view": o.view, "load_op": "clear", "store_op": "store"}
+                ]
+            )
+            render_pass.set_pipeline(o.render_pipeline)
+            render_pass.set_vertex_buffer(0, o.buffer)
+            for _ in range(N_COMMANDS):
+                command(render_pass)
+            render_pass.end()
+            return command_encoder
+
+        return func
+
+    def command_encoder_case(command):
+        def func():
+            command_encoder = device.create_command_encoder()
+            for _ in range(N_COMMANDS):
+                command(command_encoder)
+            return command_encoder
+
+        return func
+
+    def run_case(func):
+        t = measure(func, number=1)
+        # Raises a validation error if the commands are invalid
+        func().finish()
+        return result(N_COMMANDS / t, "calls/s", True)
+
+    cases = {
+        "compute.set_pipeline": compute_pass_case(
+            lambda p: p.set_pipeline(o.compute_pipeline)
+        ),
+        "compute.set_bind_group": compute_pass_case(
+            lambda p: p.set_bind_group(0, o.bind_group)
+        ),
+        "compute.dispatch_workgroups": compute_pass_case(
+            lambda p: p.dispatch_workgroups(1)
+        ),
+        "render.set_pipeline": render_pass_case(
+            lambda p: p.set_pipeline(o.render_pipeline)
+        ),
+        "render.set_vertex_buffer": render_pass_case(
+            lambda p: p.set_vertex_buffer(0, o.buffer)
+        ),
+        "render.set_viewport": render_pass_case(
+            lambda p: p.set_viewport(0, 0, 64, 64, 0, 1)
+        ),
+        "render.draw": render_pass_case(lambda p: p.draw(3)),
+        "encoder.clear_buffer": command_encoder_case(
+            lambda e: e.clear_buffer(o.buffer)
+        ),
+        "encoder.copy_buffer_to_buffer": command_encoder_case(
+            lambda e: e.copy_buffer_to_buffer(o.buffer, 0, o.buffer2, 256, 256)
+        ),
+    }
+    for name, func in cases.items():
+        yield (f"commands.{name}", lambda func=func: run_case(func))
+
+
+def bench_transfer(objects):
+    """The bandwidth of the queue's read and write methods."""
+    device = objects.device
+    queue = device.queue
+
+    def buffer_case(name, nbytes):
+        buffer = device.create_buffer(size=nbytes, usage="COPY_SRC | COPY_DST")
+        data = bytearray(nbytes)
+        if name == "write_buffer":
+
+            def func():
+                queue.write_buffer(buffer, 0, data)
+                queue.submit([]).wait_sync()
+
+        else:
+
+            def func():
+                queue.read_buffer(buffer)
+
+        return result(nbytes / measure(func) / 1e6, "MB/s", True)
+
+    def texture_case(name, size):
+        nbytes = size * size * 4
+        texture = device.create_texture(
+            size=(size, size, 1), format="rgba8unorm", usage="COPY_SRC | COPY_DST"
+        )
+        data = bytearray(nbytes)
+        data_layout = {"bytes_per_row": size * 4}
+        if name == "write_texture":
+
+            def func():
+                queue.write_texture(
+                    {"texture": texture}, data, data_layout, texture.size
+                )
+                queue.submit([]).wait_sync()
+
+        else:
+
+            def func():
+                queue.read_texture({"texture": texture}, data_layout, texture.size)
+
+        return result(nbytes / measure(func) / 1e6, "MB/s", True)
+
+    for name in ("write_buffer", "read_buffer"):
+        for nbytes in BUFFER_SIZES:
+            yield (
+                f"bandwidth.{name}.{format_size(nbytes)}",
+                lambda n=name, b=nbytes: buffer_case(n, b),
+            )
+    for name in ("write_texture", "read_texture"):
+        for size in TEXTURE_SIZES:
+            yield (
+                f"bandwidth.{name}.{size}x{size}",
+                lambda n=name, s=size: texture_case(n, s),
+            )
+
+
+def bench_promise(objects):
+    """The latency of resolving promises."""
+    device = objects.device
+    buffer = device.create_buffer(size=256, usage="MAP_READ")
+
+    def resolve():
+        promise = wgpu.GPUPromise("bench", None)
+        promise._set_input(None)
+        promise.sync_wait()
+
+    def map_buffer():
+        buffer.map_sync("READ")
+        buffer.unmap()
+
+    cases = {
+        "resolve": resolve,
+        "submit_wait": lambda: device.queue.submit([]).wait_sync(),
+        "on_submitted_work_done": device.queue.on_submitted_work_done_sync,
+        "map_buffer": map_buffer,
+    }
+    for name, func in cases.items():
+        yield (
+            f"promise.{name}",
+            lambda func=func: result(measure(func) * 1e6, "us", False),
+        )
+
+
+def bench_import(objects):
+    """The time to import wgpu, in a fresh process."""
+    cases = {
+        "wgpu": "import wgpu",
+        "wgpu_native": "import wgpu.backends.wgpu_native",
+        "get_default_device": "import wgpu; wgpu.utils.get_default_device()",
+    }
+
+    def time_code(code):
+        times = []
+        for _ in range(REPEAT):
+            t0 = time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], check=True)
+            times.append(time.perf_counter() - t0)
+        return min(times)
+
+    for name, code in cases.items():
+        yield (
+            f"import.{name}",
+            lambda code=code: result(
+                (time_code(code) - time_code("pass")) * 1000, "ms", False
+            ),
+        )
+
+
+BENCHMARKS = [bench_create, bench_commands, bench_transfer, bench_promise, bench_import]
+
+
+# %% Running and comparing
+
+
+def run(filter=""):
+    """Run the benchmarks whose name contains filter, and return the results."""
+    device = wgpu.utils.get_default_device()
+    objects = Objects(device)
+    results = {}
+    for bench in BENCHMARKS:
+        for name, func in bench(objects):
+            if filter not in name:
+                continue
+            results[name] = r = func()
+            print(f"{name:50} {r['value']:12.1f} {r['unit']}")
+    meta = {
+        "wgpu_version": wgpu.__version__,
+        "adapter": device.adapter.summary,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare(data, baseline, threshold):
+    """Print a comparison with the baseline, and return the names that regressed."""
+    if data["meta"]["adapter"] != baseline["meta"]["adapter"]:
+        print("Warning: the baseline used a different adapter:")
+        print(f"    {baseline['meta']['adapter']}")
+    regressions = []
+    for name, r in data["results"].items():
+        b = baseline["results"].get(name, None)
+        if b is None:
+            continue
+        # The speed relative to the baseline, > 1 is better
+        if r["higher_is_better"]:
+            speed = r["value"] / b["value"]
+        else:
+            speed = b["value"] / r["value"]
+        flag = ""
+        if speed < 1 - threshold:
+            flag = "REGRESSION"
+            regressions.append(name)
+        elif speed > 1 + threshold:
+            flag = "improved"
+        print(f"{name:50} {speed:6.2f}x  {flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-o", "--output", help="the JSON file to write results to")
+    parser.add_argument("-b", "--baseline", help="a JSON file to compare against")
+    parser.add_argument(
+        "-t",
+        "--threshold",
+        type=float,
+        default=0.15,
+        help="the relative slowdown that counts as a regression (default 0.15)",
+    )
+    parser.add_argument(
+        "-k", dest="filter", default="", help="only run benchmarks matching this"
+    )
+    args = parser.parse_args()
+
+    data = run(args.filter)
+
+    if args.output:
+        with open(args.output, "wb") as f:
+            f.write(json.dumps(data, indent=2).encode())
+
+    if args.baseline:
+        with open(args.baseline, "rb") as f:
+            baseline = json.loads(f.read().decode())
+        print()
+        regressions = compare(data, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -57,7 +57,8 @@ def update_wgpu_native():
 
     # Write the simple stuff
     wgpu_native_patcher.compare_flags()
-    wgpu_native_patcher.write_mappings()
+    enummap, cstructfield2enum = wgpu_native_patcher.write_mappings()
+    wgpu_native_patcher.write_struct_builders(enummap, cstructfield2enum)
 
     # Patch wgpu_native api
     code1 = file_cache.read("backends/wgpu_native/_api.py")
@@ -38,7 +38,7 @@ def patch_base_api(code):
     idl = get_idl_parser()
 
     # Write __all__
-    extra_public_classes = ["GPUPromise"]
+    extra_public_classes = ["GPUPromise", "GPUSubmission"]
     all_public_classes = [*idl.classes.keys(), *extra_public_classes]
     part1, found_all, part2 = code.partition("\n__all__ =")
     if found_all:
@@ -736,8 +736,9 @@ class StructValidationChecker(Patcher):
         mapping each top-level method in _api.py to the calls to check_struct made by
         that method or by any helper methods called by that method.
 
-        For now, the helper function must be methods within the same class.  This code
-        does not yet deal with global functions or with methods in superclasses.
+        For now, the helper function must be methods within the same class, or methods
+        of the device (called via self._device).  This code does not yet deal with
+        global functions or with methods in superclasses.
         """
         module = ast.parse(file_cache.read("backends/wgpu_native/_api.py"))
         # We only care about top-level classes and their top-level methods.
@@ -750,7 +751,7 @@ class StructValidationChecker(Patcher):
             if isinstance(method_ast, (ast.FunctionDef, ast.AsyncFunctionDef))
         }
 
-        # (class_name, method_name) -> list of helper methods
+        # (class_name, method_name) -> list of (class_name, helper_method_name)
         method_helper_calls = defaultdict(list)
         # (class_name, method_name) -> list of structures checked
         structure_checks = defaultdict(list)
@@ -759,8 +760,11 @@ class StructValidationChecker(Patcher):
             for node in ast.walk(method_ast):
                 if isinstance(node, ast.Call):
                     name = ast.unparse(node.func)
-                    if name.startswith("self._"):
-                        method_helper_calls[key].append(name[5:])
+                    if name.startswith("self._device._"):
+                        helper_key = "GPUDevice", name[13:]
+                        method_helper_calls[key].append(helper_key)
+                    elif name.startswith("self._"):
+                        method_helper_calls[key].append((key[0], name[5:]))
                     if name == "check_struct":
                         assert isinstance(node.args[0], ast.Constant)
                         struct_name = node.args[0].value
@@ -770,8 +774,8 @@ class StructValidationChecker(Patcher):
         @cache
         def get_function_checks(class_name, method_name):
             result = set(structure_checks[class_name, method_name])
-            for helper_method_name in method_helper_calls[class_name, method_name]:
-                result.update(get_function_checks(class_name, helper_method_name))
+            for helper_key in method_helper_calls[class_name, method_name]:
+                result.update(get_function_checks(*helper_key))
             return sorted(result)
 
         return {key: get_function_checks(*key) for key in top_level_methods.keys()}
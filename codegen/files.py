@@ -35,6 +35,7 @@ class FileCache:
         "structs.py",
         "backends/wgpu_native/_api.py",
         "backends/wgpu_native/_mappings.py",
+        "backends/wgpu_native/_builders.py",
         "resources/codegen_report.md",
     ]
 
@@ -5,6 +5,7 @@ The idea is that when there are any changes in wgpu.h that affect how
 wgpu_native/_api.py should be written, this module will:
 
 * For enums: automatically update the mappings.
+* For structs: generate a builder function per struct.
 * For flags: report discrepancies.
 * For structs and functions: update the code, so a diff of _api.py quickly
   shows if manual changes are needed.
@@ -31,6 +32,21 @@ mappings_preamble = '''
 '''.lstrip()
 
 
+builders_preamble = '''
+""" Struct builders for the wgpu-native backend.
+
+Each builder sets the given fields on a freshly allocated struct. Fields
+that are None are left untouched (i.e. zero / null). Enum fields accept
+a str, which is resolved using a lookup table for that enum.
+"""
+
+# ruff: noqa: N802, N803, N816
+
+# THIS CODE IS AUTOGENERATED - DO NOT EDIT
+
+'''.lstrip()
+
+
 def compare_flags():
     """For each flag in WebGPU:
 
@@ -192,6 +208,63 @@ def write_mappings():
         f"Wrote {len(enummap)} enum mappings and {len(cstructfield2enum)} struct-field mappings to wgpu_native/_mappings.py"
     )
 
+    return enummap, cstructfield2enum
+
+
+def write_struct_builders(enummap, cstructfield2enum):
+    """Generate the file with a builder function for each struct. This
+    avoids the generic (and relatively slow) logic in ``_new_struct_p()``,
+    since the fields, and which of these are enums, are known here.
+    """
+
+    hp = get_h_parser()
+
+    pylines = [builders_preamble]
+
+    # Write a lookup table for each enum that is used in a struct
+    enum_tables = defaultdict(dict)
+    for key, val in enummap.items():
+        enumname, _, enumkey = key.partition(".")
+        enum_tables[enumname][enumkey] = val
+    used_enums = sorted(set(cstructfield2enum.values()))
+    pylines.append(f"# There are {len(used_enums)} enum lookup tables\n")
+    for enumname in used_enums:
+        pylines.append(f"enum_{enumname} = " + "{")
+        for enumkey, val in enum_tables[enumname].items():
+            pylines.append(f'    "{enumkey}": {val!r},')
+        pylines.append("}\n")
+
+    # Write a builder for each struct
+    structnames = sorted(name for name in hp.structs if name.startswith("WGPU"))
+    pylines.append(f"# There are {len(structnames)} struct builders\n")
+    for structname in structnames:
+        fields = hp.structs[structname]
+        args = ", ".join(f"{key}=None" for key in fields)
+        pylines.append(f"def build_{structname}(p, {args}):")
+        for key in fields:
+            pylines.append(f"    if {key} is not None:")
+            enumname = cstructfield2enum.get(f"{structname[4:]}.{key}", None)
+            if enumname:
+                pylines.append(
+                    f"        p.{key} = enum_{enumname}[{key}] if isinstance({key}, str) else {key}"
+                )
+            else:
+                pylines.append(f"        p.{key} = {key}")
+        pylines.append("\n")
+
+    # Write the map to find the builders
+    pylines.append("struct_builders = {")
+    for structname in structnames:
+        pylines.append(f'    "{structname} *": build_{structname},')
+    pylines.append("}\n")
+
+    # Wrap up
+    code = format_code("\n".join(pylines))
+    file_cache.write("backends/wgpu_native/_builders.py", code)
+    print(
+        f"Wrote {len(structnames)} struct builders and {len(used_enums)} enum lookup tables to wgpu_native/_builders.py"
+    )
+
 
 def patch_wgpu_native_backend(code):
     """Given the Python code, applies patches to annotate functions
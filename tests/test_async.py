@@ -1,3 +1,7 @@
+import time
+import asyncio
+import threading
+
 import anyio
 
 from pytest import mark, raises
@@ -575,6 +579,47 @@ def test_promise_decorator():
     assert promise(decorated) is decorated
 
 
+def test_promise_sync_wait_woken_by_other_thread(monkeypatch):
+    # Nap so long, that the test only passes if the waiter is woken up
+    def get_backoff_time_generator():
+        while True:
+            yield 10
+
+    monkeypatch.setattr(
+        wgpu._async, "get_backoff_time_generator", get_backoff_time_generator
+    )
+
+    promise = GPUPromise("test", None, poller=lambda: None)
+    threading.Timer(0.01, promise._wgpu_set_input, (42,)).start()
+
+    t0 = time.perf_counter()
+    assert promise.sync_wait() == 42
+    assert time.perf_counter() - t0 < 5
+
+
+def test_promise_loop_call_soon_threadsafe():
+    class ThreadSafeLoop(SillyLoop):
+        def call_soon_threadsafe(self, f, *args):
+            self.threadsafe_calls = getattr(self, "threadsafe_calls", 0) + 1
+            self.call_soon(f, *args)
+
+    loop = ThreadSafeLoop()
+
+    # From the same thread, call_soon is used
+    promise = GPUPromise("same-thread", None, loop=loop)
+    promise._wgpu_set_input(1)
+    assert not hasattr(loop, "threadsafe_calls")
+
+    # From another thread, call_soon_threadsafe is used
+    promise = GPUPromise("other-thread", None, loop=loop)
+    t = threading.Thread(target=promise._wgpu_set_input, args=(2,))
+    t.start()
+    t.join()
+    assert loop.threadsafe_calls == 1
+    loop.process_events()
+    assert promise._state == "fulfilled"
+
+
 # %%%%% Test the async methods
 
 
@@ -670,5 +715,173 @@ async def make_pipeline_async():
     await device.queue.on_submitted_work_done_async()
 
 
+@mark.skipif(not can_use_wgpu_lib, reason="Needs wgpu lib")
+def test_poll_thread():
+    from wgpu.backends.wgpu_native.extras import set_poll_thread
+
+    data = b"1234" * 1000
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        adapter = await wgpu.gpu.request_adapter_async(loop=loop)
+        device = adapter.request_device_sync()
+        set_poll_thread(device)
+        poll_thread = device._poll_thread
+        assert poll_thread.is_alive()
+
+        buffer = device.create_buffer_with_data(data=data, usage="COPY_SRC")
+
+        # With a loop, nobody polls, but the promises resolve anyway
+        result = await asyncio.wait_for(device.queue.read_buffer_async(buffer), 5)
+        assert result == data
+        await asyncio.wait_for(device.queue.on_submitted_work_done_async(), 5)
+
+        # Sync waiting works too
+        assert device.queue.read_buffer(buffer) == data
+
+        set_poll_thread(device, False)
+        assert device._poll_thread is None
+        assert not poll_thread.is_alive()
+
+    asyncio.run(main())
+
+
+def test_queue_submit_returns_submission():
+    adapter = wgpu.gpu.request_adapter_sync()
+    device = adapter.request_device_sync()
+    queue = device.queue
+
+    submission1 = queue.submit([device.create_command_encoder().finish()])
+    submission2 = queue.submit([device.create_command_encoder().finish()])
+    assert isinstance(submission1, wgpu.GPUSubmission)
+    assert submission2.index > submission1.index
+
+    # Wait sync, and waiting again is fine
+    assert submission2.wait_sync() is None
+    assert submission2.wait_sync() is None
+
+    # Wait via a promise
+    submission3 = queue.submit([device.create_command_encoder().finish()])
+    promise = submission3.wait_async()
+    assert isinstance(promise, wgpu.GPUPromise)
+    assert promise.sync_wait() is None
+    assert submission3.wait_async().sync_wait() is None
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        adapter = await wgpu.gpu.request_adapter_async(loop=loop)
+        device = adapter.request_device_sync()
+
+        # With a loop, the poll thread makes the promise resolve
+        from wgpu.backends.wgpu_native.extras import set_poll_thread
+
+        set_poll_thread(device)
+        try:
+            submission = device.queue.submit([device.create_command_encoder().finish()])
+            await asyncio.wait_for(submission.wait_async(), 5)
+        finally:
+            set_poll_thread(device, False)
+
+    asyncio.run(main())
+
+
+def test_submission_wait_async_without_poll_thread():
+    async def main():
+        loop = asyncio.get_running_loop()
+        adapter = await wgpu.gpu.request_adapter_async(loop=loop)
+        device = adapter.request_device_sync()
+        assert device._poll_thread is None
+
+        async def poll_device():
+            while True:
+                device._poll()
+                await asyncio.sleep(0.001)
+
+        poll_task = loop.create_task(poll_device())
+        try:
+            submission = device.queue.submit([device.create_command_encoder().finish()])
+            assert await asyncio.wait_for(submission.wait_async(), 3) is None
+            # Once done, the promise resolves right away
+            assert await asyncio.wait_for(submission.wait_async(), 3) is None
+        finally:
+            poll_task.cancel()
+
+    asyncio.run(main())
+
+
+def test_submission_wait_does_not_wait_for_later_work():
+    adapter = wgpu.gpu.request_adapter_sync()
+    device = adapter.request_device_sync()
+    queue = device.queue
+
+    shader = """
+        @group(0) @binding(0)
+        var<storage, read_write> data: array<f32>;
+
+        @compute @workgroup_size(64)
+        fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+            var x = data[index.x];
+            for (var i = 0u; i < 1000u; i++) {
+                x = sin(x) + 1.0;
+            }
+            data[index.x] = x;
+        }
+    """
+    buffer = device.create_buffer(size=4 * 64 * 64, usage="STORAGE")
+    pipeline = device.create_compute_pipeline(
+        layout="auto", compute={"module": device.create_shader_module(code=shader)}
+    )
+    bind_group = device.create_bind_group(
+        layout=pipeline.get_bind_group_layout(0),
+        entries=[{"binding": 0, "resource": {"buffer": buffer}}],
+    )
+
+    def submit_heavy_work():
+        command_encoder = device.create_command_encoder()
+        compute_pass = command_encoder.begin_compute_pass()
+        compute_pass.set_pipeline(pipeline)
+        compute_pass.set_bind_group(0, bind_group)
+        compute_pass.dispatch_workgroups(64)
+        compute_pass.end()
+        return queue.submit([command_encoder.finish()])
+
+    # Pretend that the GPU is still busy with the later submissions, by
+    # holding back their done-notifications. On a real GPU they are likely
+    # still running anyway.
+    set_done_index = queue._set_done_index
+    held_back = []
+
+    def hold_back_later_work(index):
+        if index > submission1.index:
+            held_back.append(index)
+        else:
+            set_done_index(index)
+
+    queue._set_done_index = hold_back_later_work
+    try:
+        submission1 = queue.submit([device.create_command_encoder().finish()])
+        submission2 = submit_heavy_work()
+        submission3 = submit_heavy_work()
+        promise1 = submission1.wait_async()
+        promise3 = submission3.wait_async()
+
+        # The earlier submission resolves, the later ones are still pending
+        submission1.wait_sync()
+        assert promise1._state != "pending"
+        assert promise1.sync_wait() is None
+        assert promise3._state == "pending"
+        assert queue._done_index < submission2.index
+    finally:
+        del queue._set_done_index
+
+    # When the later work is done, these resolve too
+    for index in held_back:
+        set_done_index(index)
+    submission3.wait_sync()
+    assert promise3._state != "pending"
+    assert promise3.sync_wait() is None
+    assert queue._done_index >= submission3.index
+
+
 if __name__ == "__main__":
     run_tests(globals())
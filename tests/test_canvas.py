@@ -8,7 +8,7 @@ import wgpu
 from rendercanvas.offscreen import RenderCanvas
 from wgpu._canvas import WgpuCanvasInterface
 
-from pytest import skip
+from pytest import raises, skip
 from testutils import run_tests, can_use_wgpu_lib
 
 
@@ -130,6 +130,43 @@ def test_custom_canvas():
     assert m.shape == (200, 300, 4)
 
 
+def test_bitmap_present_depth():
+    """Present bitmaps with a readback ring, so frames arrive with latency."""
+    from wgpu.backends.wgpu_native.extras import set_bitmap_present_depth
+
+    canvas = WgpuCanvasInterface()
+    device = wgpu.utils.get_default_device()
+    context = canvas.get_context("wgpu")
+    context.configure(device=device, format=wgpu.TextureFormat.rgba8unorm)
+    set_bitmap_present_depth(context, 3)
+
+    results = []
+    for i in range(5):
+        command_encoder = device.create_command_encoder()
+        command_encoder.begin_render_pass(
+            color_attachments=[
+                {
+                    "view": context.get_current_texture().create_view(),
+                    "clear_value": (i / 255, 0, 0, 1),
+                    "load_op": wgpu.LoadOp.clear,
+                    "store_op": wgpu.StoreOp.store,
+                }
+            ],
+        ).end()
+        device.queue.submit([command_encoder.finish()])
+        results.append(context.present())
+
+    # The first two presents are skipped, the rest are two frames behind
+    assert [r["method"] for r in results] == ["skip"] * 2 + ["bitmap"] * 3
+    assert [r["data"][0, 0, 0] for r in results[2:]] == [0, 1, 2]
+    assert len(context._bitmap_readbacks) == 2
+
+    with raises(ValueError):
+        set_bitmap_present_depth(context, 0)
+    set_bitmap_present_depth(context, 1)
+    assert not context._bitmap_readbacks
+
+
 def _get_draw_function(device, canvas):
     # Bindings and layout
     pipeline_layout = device.create_pipeline_layout(bind_group_layouts=[])
@@ -0,0 +1,104 @@
+import json
+
+import numpy as np
+import wgpu
+from wgpu.utils.autotune import autotune_workgroup_size, get_autotune_cache_file
+from pytest import skip, raises
+from testutils import run_tests, can_use_wgpu_lib
+
+
+if not can_use_wgpu_lib:
+    skip("Skipping tests that need the wgpu lib", allow_module_level=True)
+
+
+shader = """
+    override workgroup_size: u32 = 64;
+
+    @group(0)
+    @binding(0)
+    var<storage,read> data1: array<f32>;
+
+    @group(0)
+    @binding(1)
+    var<storage,read_write> data2: array<f32>;
+
+    @compute
+    @workgroup_size(workgroup_size)
+    fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+        let i = index.x;
+        if (i < arrayLength(&data2)) {
+            data2[i] = data1[i] * 2.0;
+        }
+    }
+"""
+
+
+def test_autotune_cache_file(monkeypatch):
+    monkeypatch.setenv("WGPU_AUTOTUNE_CACHE", "/tmp/foo.json")
+    assert get_autotune_cache_file() == "/tmp/foo.json"
+    monkeypatch.delenv("WGPU_AUTOTUNE_CACHE")
+    assert get_autotune_cache_file().endswith("autotune.json")
+
+
+def test_autotune_workgroup_size(tmp_path):
+    cache_file = str(tmp_path / "sub" / "autotune.json")
+    data = np.ones(10000, np.float32)
+    args = shader, {0: data}, {1: (10000, "f")}
+
+    size = autotune_workgroup_size(*args, candidates=(16, 64), cache_file=cache_file)
+    assert size in (16, 64)
+
+    with open(cache_file, "rb") as f:
+        cache = json.loads(f.read().decode())
+    ((key, entry),) = cache.items()
+    adapter = wgpu.utils.get_default_device().adapter
+    assert key.startswith(adapter.summary)
+    assert entry["workgroup_size"] == size
+    assert set(entry["timings"]) == {"16", "64"}
+
+    # The result comes from the cache
+    other = 64 if size == 16 else 16
+    entry["workgroup_size"] = other
+    with open(cache_file, "wb") as f:
+        f.write(json.dumps(cache).encode())
+    assert (
+        autotune_workgroup_size(*args, candidates=(16, 64), cache_file=cache_file)
+        == other
+    )
+
+    # Unless the cached value is not a candidate
+    size = autotune_workgroup_size(*args, candidates=(32,), cache_file=cache_file)
+    assert size == 32
+
+    # A corrupt cache is ignored
+    with open(cache_file, "wb") as f:
+        f.write(b"not json")
+    assert autotune_workgroup_size(*args, candidates=(32,), cache_file=cache_file) == 32
+
+    # Without a cache, and with a custom n
+    size = autotune_workgroup_size(
+        *args,
+        candidates=(8, 10**6),
+        n=lambda wg: (10000 + wg - 1) // wg,
+        cache_file=False,
+    )
+    assert size == 8
+
+    with raises(ValueError):
+        autotune_workgroup_size(*args, candidates=(10**6,), cache_file=False)
+
+
+def test_autotune_workgroup_size_timestamps():
+    adapter = wgpu.gpu.request_adapter_sync()
+    if "timestamp-query" not in adapter.features:
+        skip("Needs timestamp-query")
+    device = adapter.request_device_sync(required_features=["timestamp-query"])
+    data = np.ones(10000, np.float32)
+    size = autotune_workgroup_size(
+        shader, {0: data}, {1: (10000, "f")}, device=device, cache_file=False
+    )
+    assert size in (32, 64, 128, 256)
+
+
+if __name__ == "__main__":
+    run_tests(globals())
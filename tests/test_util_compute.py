@@ -1,11 +1,17 @@
 import random
+import threading
 import ctypes
 import base64
 from ctypes import c_int32, c_ubyte
 import sys
 
+import numpy as np
 import wgpu
-from wgpu.utils.compute import compute_with_buffers
+from wgpu.utils.compute import (
+    compute_with_buffers,
+    clear_kernel_cache,
+    ComputeKernel,
+)
 from pytest import skip, mark, raises
 from testutils import run_tests, can_use_wgpu_lib, is_ci, iters_equal
 
@@ -114,6 +120,47 @@ def test_compute_0_1_spirv():
     assert iters_equal(out[0], range(100))
 
 
+def test_compute_0_1_numpy():
+    compute_shader = simple_compute_shader
+
+    out = compute_with_buffers({}, {0: (100, np.int32)}, compute_shader)
+    assert isinstance(out[0], np.ndarray)
+    assert out[0].dtype == np.int32
+    assert out[0].tolist() == list(range(100))
+
+    out = compute_with_buffers({}, {0: (10, 10, np.dtype("i4"))}, compute_shader, n=100)
+    assert out[0].shape == (10, 10)
+    assert out[0].flags.writeable
+    assert out[0].ravel().tolist() == list(range(100))
+
+    with raises(ValueError):  # not a numpy type
+        compute_with_buffers({}, {0: (100, object())}, compute_shader)
+
+
+def test_compute_numpy_strided_input():
+    compute_shader = """
+        @group(0)
+        @binding(0)
+        var<storage,read> data1: array<i32>;
+
+        @group(0)
+        @binding(1)
+        var<storage,read_write> data2: array<i32>;
+
+        @compute
+        @workgroup_size(1)
+        fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+            let i = i32(index.x);
+            data2[i] = data1[i];
+        }
+    """
+
+    a = np.arange(200, dtype=np.int32)[::2]
+    assert not a.flags.c_contiguous
+    out = compute_with_buffers({0: a}, {1: (100, np.int32)}, compute_shader)
+    assert np.all(out[1] == a)
+
+
 def test_compute_1_3():
     compute_shader = """
 
@@ -447,6 +494,254 @@ def test_compute_default_layout2():
     assert out2[-2:] == [-1, -1]
 
 
+def test_compute_kernel():
+    compute_shader = """
+        @group(0)
+        @binding(0)
+        var<storage,read> data1: array<i32>;
+
+        @group(0)
+        @binding(1)
+        var<storage,read_write> data2: array<i32>;
+
+        @compute
+        @workgroup_size(1)
+        fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+            let i = i32(index.x);
+            data2[i] = data1[i] + 1;
+        }
+    """
+
+    kernel = ComputeKernel(compute_shader, [0], {1: (100, "i")})
+    assert kernel.device is wgpu.utils.get_default_device()
+
+    in1 = (c_int32 * 100)(*range(100))
+    out = kernel.run({0: in1})
+    assert out[1].tolist() == list(range(1, 101))
+    buffers = dict(kernel._buffers)
+
+    # Run again with other data, the buffers are reused
+    in2 = (c_int32 * 100)(*range(100, 200))
+    out = kernel.run({0: in2})
+    assert out[1].tolist() == list(range(101, 201))
+    assert kernel._buffers == buffers
+
+    # Output buffers are cleared
+    out = kernel.run({0: in1}, n=50)
+    assert out[1].tolist() == list(range(1, 51)) + [0] * 50
+
+    # Run with a larger input, the input buffer is replaced
+    in3 = (c_int32 * 200)(*range(200))
+    out = kernel.run({0: in3})
+    assert out[1].tolist() == list(range(1, 101))
+    assert kernel._buffers[0] is not buffers[0]
+    assert kernel._buffers[1] is buffers[1]
+
+    with raises(ValueError):  # wrong input bindings
+        kernel.run({1: in1})
+    with raises(TypeError):
+        kernel.run([in1])
+
+
+def test_compute_kernel_chunked(tmp_path):
+    compute_shader = """
+        @group(0)
+        @binding(0)
+        var<storage,read> data1: array<f32>;
+
+        @group(0)
+        @binding(1)
+        var<storage,read_write> data2: array<f32>;
+
+        @compute
+        @workgroup_size(64)
+        fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+            let i = index.x;
+            if (i < arrayLength(&data2)) {
+                data2[i] = data1[i] * 2.0;
+            }
+        }
+    """
+    kernel = ComputeKernel(compute_shader, [0], {1: 4})
+
+    def n(rows):
+        return (rows + 63) // 64
+
+    data = np.arange(1000, dtype=np.float32)
+    for depth in (1, 2, 3):
+        out = np.zeros_like(data)
+        result = kernel.run_chunked(
+            {0: data}, {1: out}, chunk_size=128, n=n, depth=depth
+        )
+        assert result[1] is out
+        assert np.all(out == data * 2)
+
+    # Works with memmaps, and a single chunk
+    filename = str(tmp_path / "data.bin")
+    data_mm = np.memmap(filename, dtype=np.float32, mode="w+", shape=(100, 10))
+    data_mm[:] = np.arange(1000, dtype=np.float32).reshape(100, 10)
+    out = np.zeros((100, 10), np.float32)
+    kernel.run_chunked({0: data_mm}, {1: out}, n=lambda rows: n(rows * 10))
+    assert np.all(out == data_mm * 2)
+
+    out = np.zeros(999, np.float32)
+    with raises(ValueError):  # number of rows does not match
+        kernel.run_chunked({0: data}, {1: out}, n=n)
+    out = np.zeros(1000, np.uint8)
+    with raises(ValueError):  # chunks not a multiple of 4 bytes
+        kernel.run_chunked({0: data}, {1: out}, chunk_size=129, n=n)
+    with raises(ValueError):  # wrong output bindings
+        kernel.run_chunked({0: data}, {0: data}, n=n)
+
+
+def test_compute_kernel_chunked_in_place():
+    compute_shader = """
+        @group(0)
+        @binding(0)
+        var<storage,read_write> data: array<i32>;
+
+        @compute
+        @workgroup_size(1)
+        fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+            data[index.x] += 1;
+        }
+    """
+    # Binding 0 is both input and output
+    kernel = ComputeKernel(compute_shader, [0], {0: (16, "i")})
+    data = np.arange(16, dtype=np.int32)
+    expected = kernel.run({0: data})[0]
+    assert list(expected) == list(range(1, 17))
+
+    out = np.zeros_like(data)
+    kernel.run_chunked({0: data}, {0: out}, chunk_size=4)
+    assert list(out) == list(range(1, 17))
+    assert list(data) == list(range(16))
+
+    # The output array can also be the input array
+    kernel.run_chunked({0: data}, {0: data}, chunk_size=4, depth=3)
+    assert list(data) == list(range(1, 17))
+
+    with raises(ValueError):  # row sizes differ
+        kernel.run_chunked({0: data}, {0: np.zeros(16, np.int16)}, chunk_size=4)
+
+
+def test_compute_kernel_batch():
+    compute_shader = """
+        @group(0)
+        @binding(0)
+        var<storage,read> data1: array<i32>;
+
+        @group(0)
+        @binding(1)
+        var<storage,read_write> data2: array<i32>;
+
+        @group(0)
+        @binding(2)
+        var<storage,read_write> data3: array<i32>;
+
+        @compute
+        @workgroup_size(1)
+        fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+            let i = i32(index.x);
+            data2[i] = data2[i] + data1[i];
+            data3[i] = data1[i] * 2;
+        }
+    """
+
+    kernel = ComputeKernel(compute_shader, [0, 1], {1: (10, "i"), 2: c_int32 * 10})
+    input_sets = []
+    for j in range(50):
+        input_sets.append(
+            {
+                0: np.arange(10, dtype=np.int32) + j,
+                1: np.full(10, 100, np.int32),
+            }
+        )
+    outputs = kernel.run_batch(input_sets)
+    assert len(outputs) == 50
+    for j, output in enumerate(outputs):
+        expected = kernel.run(input_sets[j])
+        assert output[1].tolist() == expected[1].tolist()
+        assert list(output[2]) == list(expected[2])
+        assert output[1].tolist() == [100 + i + j for i in range(10)]
+
+    assert kernel.run_batch([]) == []
+
+    # With numpy outputs
+    kernel = ComputeKernel(compute_shader, [0, 1], {1: (10, np.int32), 2: (10, "i")})
+    outputs = kernel.run_batch(input_sets)
+    assert isinstance(outputs[-1][1], np.ndarray)
+    assert outputs[-1][1].tolist() == [100 + i + 49 for i in range(10)]
+
+    with raises(ValueError):  # sizes differ between sets
+        bad_set = {0: np.zeros(5, np.int32), 1: input_sets[0][1]}
+        kernel.run_batch([*input_sets, bad_set])
+    with raises(ValueError):  # in-place array does not match output size
+        kernel.run_batch([{0: np.zeros(5, np.int32), 1: np.zeros(5, np.int32)}])
+    with raises(ValueError):  # wrong bindings
+        kernel.run_batch([{0: np.zeros(10, np.int32)}])
+
+
+def test_compute_with_buffers_reuses_kernel():
+    in1 = (c_int32 * 100)(*range(100))
+    shader = simple_compute_shader.replace("data2[i] = i32(i);", "data2[i] = 7;")
+
+    out1 = compute_with_buffers({}, {0: c_int32 * 100}, shader)
+    kernel = list(wgpu.utils.compute._kernel_cache.values())[-1]
+    assert kernel._buffers == {}  # the cache does not hold on to buffers
+    out2 = compute_with_buffers({}, {0: c_int32 * 100}, shader)
+    assert list(wgpu.utils.compute._kernel_cache.values())[-1] is kernel
+    assert list(out1[0]) == list(out2[0]) == [7] * 100
+
+    # A different spec means a different kernel
+    compute_with_buffers({1: in1}, {0: c_int32 * 100}, shader)
+    assert list(wgpu.utils.compute._kernel_cache.values())[-1] is not kernel
+
+    clear_kernel_cache()
+    assert not wgpu.utils.compute._kernel_cache
+
+
+def test_compute_with_buffers_threaded():
+    shader = """
+        @group(0) @binding(0)
+        var<storage,read> data1: array<i32>;
+
+        @group(0) @binding(1)
+        var<storage,read_write> data2: array<i32>;
+
+        @compute @workgroup_size(1)
+        fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+            data2[index.x] = data1[index.x] * 2;
+        }
+    """
+    results = {}
+    errors = []
+
+    def work(tid):
+        try:
+            for i in range(10):
+                data = np.full(64, tid * 100 + i, np.int32)
+                out = compute_with_buffers({0: data}, {1: (64, "i")}, shader)
+                results.setdefault(tid, []).append((data * 2, np.array(out[1])))
+        except Exception as err:
+            errors.append(err)
+
+    threads = [threading.Thread(target=work, args=(tid,)) for tid in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert len(results) == 4
+    for pairs in results.values():
+        assert len(pairs) == 10
+        for expected, out in pairs:
+            assert np.all(out == expected)
+    # The kernels were returned to the cache, but never more than the max
+    assert 1 <= len(wgpu.utils.compute._kernel_cache) <= 8
+
+
 def test_compute_fails():
     compute_shader = """
         @group(0)
@@ -0,0 +1,111 @@
+import numpy as np
+import wgpu
+from wgpu.utils.compute import ComputeKernel
+from wgpu.utils.compute_graph import ComputeGraph, LazyArray
+from pytest import skip, raises
+from testutils import run_tests, can_use_wgpu_lib
+
+
+if not can_use_wgpu_lib:
+    skip("Skipping tests that need the wgpu lib", allow_module_level=True)
+
+
+add_shader = """
+    @group(0)
+    @binding(0)
+    var<storage,read> data1: array<i32>;
+
+    @group(0)
+    @binding(1)
+    var<storage,read_write> data2: array<i32>;
+
+    @compute
+    @workgroup_size(1)
+    fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+        let i = i32(index.x);
+        data2[i] = data2[i] + data1[i] + 1;
+    }
+"""
+
+
+def test_compute_graph_chain():
+    kernel = ComputeKernel(add_shader, [0], {1: (100, np.int32)})
+    graph = ComputeGraph()
+    assert graph.device is wgpu.utils.get_default_device()
+
+    a = graph.array(np.arange(100, dtype=np.int32))
+    assert isinstance(a, LazyArray)
+    assert a.nbytes == 400
+    assert not a.pending
+
+    b = graph.call(kernel, {0: a})[1]
+    c = graph.call(kernel, {0: b})[1]
+    d = graph.call(kernel, {0: c})[1]
+    assert b.pending and c.pending and d.pending
+    assert "pending" in repr(d)
+
+    (result,) = graph.evaluate(d)
+    assert isinstance(result, np.ndarray)
+    assert result.tolist() == [i + 3 for i in range(100)]
+
+    # The intermediates are released. The buffer of b was reused for d,
+    # and the buffer of c is in the pool.
+    assert not d.pending
+    assert "released" in repr(b)
+    assert sum(len(buffers) for buffers in graph._pool.values()) == 1
+    with raises(RuntimeError):
+        graph.call(kernel, {0: b})
+    with raises(RuntimeError):
+        graph.evaluate(c)
+
+    # Evaluated arrays stay on the GPU, and can be used again
+    e = graph.call(kernel, {0: d})[1]
+    (result,) = graph.evaluate(e)
+    assert result.tolist() == [i + 4 for i in range(100)]
+    assert graph.evaluate(d)[0].tolist() == [i + 3 for i in range(100)]
+
+    # Deleting a handle gives its buffer back to the pool
+    buffer = e._buffer
+    del e
+    assert buffer in graph._pool[400]
+
+    # The pool is used
+    f = graph.call(kernel, {0: a})[1]
+    graph.evaluate(f)
+    assert f._buffer is buffer
+
+    graph.clear()
+    assert not graph._pool
+
+
+def test_compute_graph_keep_and_pending():
+    kernel = ComputeKernel(add_shader, [0], {1: (100, np.int32)})
+    inplace_kernel = ComputeKernel(add_shader, [0, 1], {1: (100, np.int32)})
+    graph = ComputeGraph()
+
+    data = np.zeros(100, np.int32)
+    b = graph.call(kernel, {0: data})[1]
+    c = graph.call(kernel, {0: b})[1]
+    other = graph.call(kernel, {0: b})[1]
+
+    # Only what's needed is computed, b is kept since other needs it
+    graph.evaluate(keep=[c])
+    assert not c.pending
+    assert other.pending
+    assert not b._released
+
+    # In-place bindings don't affect the input array
+    d = graph.call(inplace_kernel, {0: c, 1: c})[1]
+    result_d, result_c, result_other = graph.evaluate(d, c, other)
+    assert result_c.tolist() == [2] * 100
+    assert result_d.tolist() == [5] * 100
+    assert result_other.tolist() == [2] * 100
+
+    with raises(TypeError):
+        graph.evaluate(data)
+    with raises(ValueError):
+        ComputeGraph().call(kernel, {0: c})
+
+
+if __name__ == "__main__":
+    run_tests(globals())
@@ -0,0 +1,65 @@
+import gc
+import time
+
+import wgpu
+from wgpu.utils.object_sampler import ObjectCountSampler
+from pytest import skip
+from testutils import run_tests, can_use_wgpu_lib
+
+
+if not can_use_wgpu_lib:
+    skip("Skipping tests that need the wgpu lib", allow_module_level=True)
+
+
+def test_object_sampler_leaks():
+    device = wgpu.utils.get_default_device()
+    sampler = ObjectCountSampler(history=4, min_samples=3)
+    assert "0 samples" in repr(sampler)
+
+    # Collect garbage from earlier tests, so that counts don't drop while sampling
+    gc.collect()
+    buffers = []
+    sampler.sample()
+    for _ in range(2):
+        buffers.append(device.create_buffer(size=64, usage="STORAGE"))
+        sampler.sample()
+    assert len(sampler.get_samples()) == 3
+    counts = sampler.get_samples()[-1]["counts"]
+    assert "Buffer.count" in counts
+    assert "native.Buffer.count" in counts
+
+    leaks = sampler.get_leaks()
+    assert leaks["Buffer.count"]["growth"] == 2
+    assert leaks["Buffer.resource_mem"]["growth"] == 128
+    assert "Buffer.count" in wgpu.diagnostics.object_growth.get_dict()
+
+    # When the count drops, it's no longer considered a leak
+    buffers.clear()
+    sampler.sample()
+    assert "Buffer.count" not in sampler.get_leaks()
+
+    # The ring is bounded
+    for _ in range(5):
+        sampler.sample()
+    assert len(sampler.get_samples()) == 4
+
+    sampler.clear()
+    assert sampler.get_samples() == []
+    assert sampler.get_leaks() == {}
+
+
+def test_object_sampler_thread():
+    sampler = ObjectCountSampler(interval=0.01, native=False)
+    sampler.start()
+    assert sampler.running
+    time.sleep(0.1)
+    sampler.stop()
+    assert not sampler.running
+    samples = sampler.get_samples()
+    assert len(samples) >= 2
+    assert not any(key.startswith("native.") for key in samples[0]["counts"])
+    assert samples[0]["time"] <= samples[-1]["time"]
+
+
+if __name__ == "__main__":
+    run_tests(globals())
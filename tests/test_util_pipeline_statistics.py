@@ -0,0 +1,153 @@
+import wgpu
+from wgpu._async import GPUPromise
+from wgpu.utils.pipeline_statistics import (
+    PipelineStatisticsProfiler,
+    _normalize_statistics,
+)
+from pytest import skip, raises
+from testutils import run_tests, can_use_wgpu_lib
+
+
+if not can_use_wgpu_lib:
+    skip("Skipping tests that need the wgpu lib", allow_module_level=True)
+
+
+shader = """
+    @compute
+    @workgroup_size(64)
+    fn main() {
+    }
+"""
+
+
+def get_statistics_device():
+    adapter = wgpu.gpu.request_adapter_sync()
+    if "pipeline-statistics-query" not in adapter.features:
+        skip("Needs pipeline-statistics-query")
+    return adapter.request_device_sync(required_features=["pipeline-statistics-query"])
+
+
+def run_frame(device, pipeline, profiler, passes):
+    command_encoder = device.create_command_encoder()
+    for label, n in passes:
+        compute_pass = command_encoder.begin_compute_pass()
+        profiler.begin(compute_pass, label)
+        compute_pass.set_pipeline(pipeline)
+        compute_pass.dispatch_workgroups(n)
+        profiler.end(compute_pass)
+        compute_pass.end()
+    device.queue.submit([command_encoder.finish()])
+    profiler.end_frame()
+
+
+def create_pipeline(device):
+    return device.create_compute_pipeline(
+        layout="auto", compute={"module": device.create_shader_module(code=shader)}
+    )
+
+
+def test_normalize_statistics():
+    assert _normalize_statistics(
+        ["compute_shader_invocations", "VertexShaderInvocations"]
+    ) == ("vertex-shader-invocations", "compute-shader-invocations")
+    with raises(ValueError):
+        _normalize_statistics(["foo"])
+    with raises(ValueError):
+        _normalize_statistics([])
+
+
+def test_pipeline_statistics_disabled():
+    device = wgpu.utils.get_default_device()
+    if "pipeline-statistics-query" in device.features:
+        skip("Default device has pipeline-statistics-query")
+    profiler = PipelineStatisticsProfiler(device)
+    assert not profiler.enabled
+    run_frame(device, create_pipeline(device), profiler, [("a", 1)])
+    profiler.flush()
+    assert profiler.get_stats() == {}
+
+
+def test_pipeline_statistics():
+    device = get_statistics_device()
+    profiler = PipelineStatisticsProfiler(
+        device,
+        name="test",
+        statistics=["compute-shader-invocations"],
+        ring_size=2,
+        max_passes=3,
+    )
+    assert profiler.enabled
+    assert "test" in repr(profiler)
+    pipeline = create_pipeline(device)
+
+    # The results come in a frame later
+    run_frame(device, pipeline, profiler, [("a", 1), ("b", 2)])
+    assert profiler.get_stats() == {}
+    run_frame(device, pipeline, profiler, [("a", 1), ("b", 2)])
+    stats = profiler.get_stats()
+    assert stats["a"]["compute-shader-invocations"]["last"] == 64
+    assert stats["b"]["compute-shader-invocations"]["last"] == 128
+
+    # Same labels are summed, passes beyond max_passes are not queried
+    run_frame(device, pipeline, profiler, [("c", 1), ("c", 3), ("d", 1), ("e", 1)])
+    profiler.flush()
+    stats = profiler.get_stats()
+    assert set(stats) == {"a", "b", "c", "d"}
+    assert stats["c"]["compute-shader-invocations"]["last"] == 4 * 64
+    assert stats["a"]["compute-shader-invocations"]["mean"] == 64
+
+    # Statistics are exposed via diagnostics
+    d = wgpu.diagnostics.pipeline_statistics.get_dict()
+    assert d["test.b"] == {"compute-shader-invocations": 128}
+
+    profiler.clear()
+    assert profiler.get_stats() == {}
+
+
+def test_pipeline_statistics_does_not_stall():
+    device = get_statistics_device()
+    profiler = PipelineStatisticsProfiler(
+        device, statistics=["compute-shader-invocations"], ring_size=2
+    )
+    pipeline = create_pipeline(device)
+
+    # Pretend that the GPU is behind, by handing out readback promises that
+    # we resolve ourselves. They are resolved after many polls, so that a
+    # profiler that waits won't hang.
+    read_buffer_async = device.queue.read_buffer_async
+    promises = []
+    polls = []
+
+    def resolve_promises():
+        while promises:
+            promise, real_promise = promises.pop(0)
+            promise._wgpu_set_input(real_promise.sync_wait())
+
+    def poll():
+        polls.append(None)
+        if len(polls) > 100:
+            resolve_promises()
+
+    def fake_read_buffer_async(*args):
+        promise = GPUPromise("readback", None, poller=poll)
+        promises.append((promise, read_buffer_async(*args)))
+        return promise
+
+    device.queue.read_buffer_async = fake_read_buffer_async
+    try:
+        for n in range(1, 6):
+            run_frame(device, pipeline, profiler, [("a", n)])
+        assert profiler.get_stats() == {}
+        assert len(polls) <= 5  # one non-blocking poll per end_frame()
+        resolve_promises()
+    finally:
+        del device.queue.read_buffer_async
+
+    # The frames are collected in order, once they are available
+    profiler.flush()
+    values = list(profiler._values["a"]["compute-shader-invocations"])
+    assert values == [64, 128, 192, 256, 320]
+
+
+if __name__ == "__main__":
+    run_tests(globals())
@@ -0,0 +1,168 @@
+import wgpu
+from wgpu._async import GPUPromise
+from wgpu.utils.profiler import GpuProfiler
+from pytest import skip
+from testutils import run_tests, can_use_wgpu_lib
+
+
+if not can_use_wgpu_lib:
+    skip("Skipping tests that need the wgpu lib", allow_module_level=True)
+
+
+shader = """
+    @group(0)
+    @binding(0)
+    var<storage,read_write> data: array<f32>;
+
+    @compute
+    @workgroup_size(64)
+    fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+        data[index.x] = data[index.x] * 2.0 + 1.0;
+    }
+"""
+
+
+def get_timestamp_device():
+    adapter = wgpu.gpu.request_adapter_sync()
+    if "timestamp-query" not in adapter.features:
+        skip("Needs timestamp-query")
+    return adapter.request_device_sync(required_features=["timestamp-query"])
+
+
+def run_frame(device, pipeline, bind_group, profiler, labels):
+    command_encoder = device.create_command_encoder()
+    for label in labels:
+        compute_pass = command_encoder.begin_compute_pass(
+            timestamp_writes=profiler.timestamp_writes(label)
+        )
+        compute_pass.set_pipeline(pipeline)
+        compute_pass.set_bind_group(0, bind_group)
+        compute_pass.dispatch_workgroups(16)
+        compute_pass.end()
+    device.queue.submit([command_encoder.finish()])
+    profiler.end_frame()
+
+
+def setup_pipeline(device):
+    buffer = device.create_buffer(size=4 * 64 * 16, usage="STORAGE")
+    pipeline = device.create_compute_pipeline(
+        layout="auto", compute={"module": device.create_shader_module(code=shader)}
+    )
+    bind_group = device.create_bind_group(
+        layout=pipeline.get_bind_group_layout(0),
+        entries=[{"binding": 0, "resource": {"buffer": buffer}}],
+    )
+    return pipeline, bind_group
+
+
+def test_profiler_disabled():
+    device = wgpu.utils.get_default_device()
+    if "timestamp-query" in device.features:
+        skip("Default device has timestamp-query")
+    profiler = GpuProfiler(device)
+    assert not profiler.enabled
+    pipeline, bind_group = setup_pipeline(device)
+    run_frame(device, pipeline, bind_group, profiler, ["a"])
+    profiler.flush()
+    assert profiler.get_times() == {}
+
+
+def test_profiler():
+    device = get_timestamp_device()
+    profiler = GpuProfiler(device, name="test", ring_size=3, max_passes=3)
+    assert profiler.enabled
+    assert "test" in repr(profiler)
+    pipeline, bind_group = setup_pipeline(device)
+
+    # The results come in a few frames later
+    run_frame(device, pipeline, bind_group, profiler, ["a", "b"])
+    run_frame(device, pipeline, bind_group, profiler, ["a", "b"])
+    assert profiler.get_times() == {}
+    run_frame(device, pipeline, bind_group, profiler, ["a", "b"])
+    assert set(profiler.get_times()) == {"a", "b"}
+    assert len(profiler._times["a"]) == 1
+
+    # Same labels are summed, passes beyond max_passes are not profiled
+    run_frame(device, pipeline, bind_group, profiler, ["c", "c", "d", "e"])
+    profiler.flush()
+    times = profiler.get_times()
+    assert set(times) == {"a", "b", "c", "d"}
+    assert len(profiler._times["a"]) == 3
+    assert len(profiler._times["c"]) == 1
+    for t in times.values():
+        assert 0 <= t["min"] <= t["mean"] <= t["max"]
+        assert t["last"] >= 0
+
+    # Times are exposed via diagnostics
+    d = wgpu.diagnostics.gpu_timings.get_dict()
+    assert set(d["test.a"]) == {"last", "mean", "min", "max"}
+    assert "gpu_timings" in wgpu.diagnostics.get_report()
+
+    profiler.clear()
+    assert profiler.get_times() == {}
+
+
+def test_profiler_callback():
+    device = get_timestamp_device()
+    timestamps = []
+    profiler = GpuProfiler(
+        device, callback=lambda *args: timestamps.append(args), ring_size=1
+    )
+    pipeline, bind_group = setup_pipeline(device)
+    run_frame(device, pipeline, bind_group, profiler, ["a", "b"])
+    profiler.flush()
+    assert [t[0] for t in timestamps] == ["a", "b"]
+    for _, begin, end in timestamps:
+        assert 0 < begin <= end
+
+
+def test_profiler_does_not_stall():
+    device = get_timestamp_device()
+    labels = []
+    profiler = GpuProfiler(
+        device, callback=lambda label, *args: labels.append(label), ring_size=2
+    )
+    pipeline, bind_group = setup_pipeline(device)
+
+    # Pretend that the GPU is behind, by handing out readback promises that
+    # we resolve ourselves. They are resolved after many polls, so that a
+    # profiler that waits won't hang.
+    read_buffer_async = device.queue.read_buffer_async
+    promises = []
+    polls = []
+
+    def resolve_promises():
+        while promises:
+            promise, real_promise = promises.pop(0)
+            promise._wgpu_set_input(real_promise.sync_wait())
+
+    def poll():
+        polls.append(None)
+        if len(polls) > 100:
+            resolve_promises()
+
+    def fake_read_buffer_async(*args):
+        promise = GPUPromise("readback", None, poller=poll)
+        promises.append((promise, read_buffer_async(*args)))
+        return promise
+
+    device.queue.read_buffer_async = fake_read_buffer_async
+    try:
+        for label in "abcde":
+            run_frame(device, pipeline, bind_group, profiler, [label])
+        assert labels == []
+        assert len(polls) <= 5  # one non-blocking poll per end_frame()
+        resolve_promises()
+    finally:
+        del device.queue.read_buffer_async
+
+    # The frames are collected in order, once they are available
+    run_frame(device, pipeline, bind_group, profiler, ["f"])
+    assert labels[:4] == ["a", "b", "c", "d"]
+    profiler.flush()
+    assert labels == ["a", "b", "c", "d", "e", "f"]
+    assert len(profiler._times["a"]) == 1
+
+
+if __name__ == "__main__":
+    run_tests(globals())
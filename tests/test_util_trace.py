@@ -0,0 +1,107 @@
+import json
+
+import wgpu
+from wgpu.utils.trace import TraceRecorder
+from pytest import skip, raises
+from testutils import run_tests, can_use_wgpu_lib
+
+
+if not can_use_wgpu_lib:
+    skip("Skipping tests that need the wgpu lib", allow_module_level=True)
+
+
+shader = """
+    @group(0)
+    @binding(0)
+    var<storage,read_write> data: array<f32>;
+
+    @compute
+    @workgroup_size(64)
+    fn main(@builtin(global_invocation_id) index: vec3<u32>) {
+        data[index.x] = data[index.x] * 2.0 + 1.0;
+    }
+"""
+
+
+def get_timestamp_device():
+    adapter = wgpu.gpu.request_adapter_sync()
+    if "timestamp-query" not in adapter.features:
+        skip("Needs timestamp-query")
+    return adapter.request_device_sync(required_features=["timestamp-query"])
+
+
+def run_work(device, label):
+    buffer = device.create_buffer(size=4 * 64 * 16, usage="STORAGE | COPY_SRC")
+    pipeline = device.create_compute_pipeline(
+        layout="auto", compute={"module": device.create_shader_module(code=shader)}
+    )
+    bind_group = device.create_bind_group(
+        layout=pipeline.get_bind_group_layout(0),
+        entries=[{"binding": 0, "resource": {"buffer": buffer}}],
+    )
+    command_encoder = device.create_command_encoder()
+    compute_pass = command_encoder.begin_compute_pass(label=label)
+    compute_pass.set_pipeline(pipeline)
+    compute_pass.set_bind_group(0, bind_group)
+    compute_pass.dispatch_workgroups(16)
+    compute_pass.end()
+    device.queue.submit([command_encoder.finish()])
+    return device.queue.read_buffer(buffer)
+
+
+def test_trace_recorder_patching():
+    device = wgpu.utils.get_default_device()
+    submit = type(device.queue).submit
+    sync_wait = wgpu.classes.GPUPromise.sync_wait
+
+    recorder = TraceRecorder(device)
+    assert recorder.get_events() == []
+    with recorder:
+        assert recorder.recording
+        assert type(device.queue).submit is not submit
+        assert wgpu.classes.GPUPromise.sync_wait is not sync_wait
+        with raises(RuntimeError):
+            TraceRecorder(device).start()
+    assert not recorder.recording
+    assert type(device.queue).submit is submit
+    assert wgpu.classes.GPUPromise.sync_wait is sync_wait
+
+
+def test_trace_recorder(tmp_path):
+    device = get_timestamp_device()
+    recorder = TraceRecorder(device)
+    with recorder:
+        for _ in range(4):
+            data = run_work(device, "double")
+    assert data.nbytes == 4 * 64 * 16
+
+    # Not recording anymore
+    run_work(device, "other")
+
+    filename = tmp_path / "trace.json"
+    recorder.save(filename)
+    with open(filename, "rb") as f:
+        trace = json.loads(f.read().decode())
+    assert trace["metadata"]["adapter"] == device.adapter.summary
+    assert "diagnostics" in trace["metadata"]
+
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    cpu_names = {e["name"] for e in spans if e["pid"] == 1}
+    assert "encode double" in cpu_names
+    assert "queue.submit" in cpu_names
+    assert "queue.read_buffer" in cpu_names
+    assert "command_encoder.finish" in cpu_names
+    assert any(name.startswith("sync_wait") for name in cpu_names)
+    assert not any("other" in name for name in cpu_names)
+
+    # Each pass is on the GPU timeline, after it was submitted
+    gpu_spans = [e for e in spans if e["pid"] == 2]
+    assert [e["name"] for e in gpu_spans] == ["double"] * 4
+    encode_spans = [e for e in spans if e["name"] == "encode double"]
+    for gpu_span, encode_span in zip(gpu_spans, encode_spans, strict=True):
+        assert gpu_span["dur"] >= 0
+        assert gpu_span["ts"] > encode_span["ts"] + encode_span["dur"]
+
+
+if __name__ == "__main__":
+    run_tests(globals())
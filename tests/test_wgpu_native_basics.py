@@ -1,3 +1,4 @@
+import gc
 import os
 import base64
 import shutil
@@ -59,6 +60,86 @@ def test_override_wgpu_lib_path():
     assert path == old_path
 
 
+@mark.skipif(not can_use_wgpu_lib, reason="Needs wgpu lib")
+def test_precompiled_ffi_module():
+    _ffi = wgpu.backends.wgpu_native._ffi
+    ffi_build = wgpu.backends.wgpu_native._ffi_build
+    header_filenames = _ffi._get_header_filenames()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = ffi_build.build_ffi_module(header_filenames, tmpdir)
+        assert os.path.basename(filename) == "_wgpu_ffi.py"
+        namespace = {}
+        with open(filename, "rb") as f:
+            exec(f.read().decode(), namespace)
+
+    # The hash matches the current header
+    assert namespace["header_hash"] == ffi_build.get_header_hash(*header_filenames)
+
+    # The precompiled ffi knows the same types as the runtime-parsed one
+    ffi1 = namespace["ffi"]
+    ffi2 = _ffi.FFI()
+    ffi2.cdef(_ffi.get_wgpu_header())
+    for name in ["WGPURenderPassDescriptor", "WGPUBufferDescriptor"]:
+        assert ffi1.sizeof(name) == ffi2.sizeof(name)
+    assert ffi1.list_types() == ffi2.list_types()
+
+    # Works with the lib that we have loaded
+    lib = ffi1.dlopen(wgpu.backends.wgpu_native.lib_path)
+    assert lib.wgpuGetVersion() == _ffi.lib.wgpuGetVersion()
+
+
+def test_struct_builders():
+    _api = wgpu.backends.wgpu_native._api
+    ffi = wgpu.backends.wgpu_native.ffi
+
+    kwargs = dict(format="bgra8unorm", dimension="2d", mipLevelCount=2, aspect=1)
+    builder = _api.struct_builders["WGPUTextureViewDescriptor *"]
+    try:
+        _api.struct_builders.pop("WGPUTextureViewDescriptor *")
+        s1 = _api.new_struct_p("WGPUTextureViewDescriptor *", **kwargs)
+    finally:
+        _api.struct_builders["WGPUTextureViewDescriptor *"] = builder
+    s2 = _api.new_struct_p("WGPUTextureViewDescriptor *", **kwargs)
+
+    size = ffi.sizeof("WGPUTextureViewDescriptor")
+    assert bytes(ffi.buffer(s1, size)) == bytes(ffi.buffer(s2, size))
+    assert s2.format == _api.enummap["TextureFormat.bgra8unorm"]
+    assert s2.aspect == 1
+    assert s2.arrayLayerCount == 0
+
+    with raises(KeyError):
+        _api.new_struct_p("WGPUTextureViewDescriptor *", format="not-a-format")
+
+
+def test_struct_arena():
+    _api = wgpu.backends.wgpu_native._api
+
+    @_api.with_struct_arena
+    def func(inner):
+        refs = _api._struct_arena.refs
+        assert refs == []
+        s = _api.new_struct("WGPUColor", r=1, g=2, b=3, a=4)
+        array = _api.new_array("WGPUColor[]", [s])
+        assert len(refs) == 4
+        assert array in refs
+        if inner:
+            inner(None)
+            assert _api._struct_arena.refs is refs
+        return array
+
+    n_refs = len(_api._refs_per_struct)
+    assert _api._struct_arena.refs is None
+    array = func(func)
+    assert _api._struct_arena.refs is None
+    assert array[0].b == 3
+    assert len(_api._refs_per_struct) == n_refs
+
+    with raises(ValueError):
+        _api.with_struct_arena(lambda: int("x"))()
+    assert _api._struct_arena.refs is None
+
+
 def test_tuple_from_tuple_or_dict():
     func = wgpu.backends.wgpu_native._api._tuple_from_tuple_or_dict
 
@@ -463,5 +544,81 @@ def test_limits_are_not_legal():
     assert not are_limits_wgpu_legal({"max-bind-group": 8})
 
 
+@mark.skipif(not can_use_wgpu_lib, reason="Needs wgpu lib")
+def test_call_instrumentation():
+    from wgpu.backends.wgpu_native._api import libf
+    from wgpu.backends.wgpu_native import GPUCommandEncoder, GPURenderPassEncoder
+    from wgpu.backends.wgpu_native.extras import set_call_instrumentation
+
+    device = wgpu.utils.get_default_device()
+    buffer = device.create_buffer(size=64, usage="COPY_DST")
+    topic = wgpu.diagnostics.native_calls
+    proxy_func = libf.wgpuQueueWriteBuffer
+
+    topic.reset()
+    device.queue.write_buffer(buffer, 0, b"x" * 16)
+    assert topic.get_dict() == {}
+
+    set_call_instrumentation(True)
+    try:
+        assert libf.wgpuQueueWriteBuffer is not proxy_func
+        device.queue.write_buffer(buffer, 0, b"x" * 16)
+        device.queue.write_buffer(buffer, 0, b"x" * 32)
+        device.create_command_encoder()
+        d = topic.get_dict()
+        assert d["wgpuQueueWriteBuffer"]["count"] == 2
+        assert d["wgpuQueueWriteBuffer"]["bytes"] == 48
+        assert d["wgpuQueueWriteBuffer"]["time_ms"] >= 0
+        assert d["wgpuDeviceCreateCommandEncoder"]["count"] == 1
+        assert "bytes" not in d["wgpuDeviceCreateCommandEncoder"]
+        assert d["total"]["count"] >= 3
+        assert "wgpuQueueWriteBuffer" in topic.get_report()
+
+        # Errors are still raised, and the call is counted
+        with raises(wgpu.GPUValidationError):
+            device.create_buffer(size=16, usage=0)
+        assert topic.get_dict()["wgpuDeviceCreateBuffer"]["count"] == 1
+
+        topic.reset()
+        assert topic.get_dict() == {}
+
+        # Functions that are bound to the classes are counted too, including
+        # the hot paths that call into the lib directly.
+        encoder = device.create_command_encoder()
+        encoder.push_debug_group("group")
+        encoder.insert_debug_marker("marker")
+        encoder.pop_debug_group()
+        texture = device.create_texture(
+            size=(4, 4, 1), format="rgba8unorm", usage="RENDER_ATTACHMENT"
+        )
+        render_pass = encoder.begin_render_pass(
+            color_attachments=[
+                {"view": texture.create_view(), "load_op": "clear", "store_op": "store"}
+            ]
+        )
+        render_pass.set_scissor_rect(0, 0, 2, 2)
+        render_pass.end()
+        del encoder, render_pass
+        gc.collect()
+        d = topic.get_dict()
+        assert d["wgpuCommandEncoderPushDebugGroup"]["count"] == 1
+        assert d["wgpuCommandEncoderInsertDebugMarker"]["count"] == 1
+        assert d["wgpuCommandEncoderPopDebugGroup"]["count"] == 1
+        assert d["wgpuRenderPassEncoderSetScissorRect"]["count"] == 1
+        assert d["wgpuCommandEncoderRelease"]["count"] == 1
+        topic.reset()
+    finally:
+        set_call_instrumentation(False)
+
+    # No overhead when disabled: the original functions are back
+    assert libf.wgpuQueueWriteBuffer is proxy_func
+    assert GPUCommandEncoder._write_timestamp_function is (
+        libf.wgpuCommandEncoderWriteTimestamp
+    )
+    assert GPURenderPassEncoder._draw_function is libf.wgpuRenderPassEncoderDraw
+    device.queue.write_buffer(buffer, 0, b"x" * 16)
+    assert topic.get_dict() == {}
+
+
 if __name__ == "__main__":
     run_tests(globals())
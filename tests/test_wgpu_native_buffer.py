@@ -238,6 +238,241 @@ def test_consecutive_reads():
     buf.unmap()
 
 
+@mark.skipif(not can_use_wgpu_lib, reason="Needs wgpu lib")
+def test_read_buffer_async():
+    device = wgpu.utils.get_default_device()
+
+    buffers = []
+    for i in range(4):
+        data = f"{i + 1}".encode() * 8 * (i + 1)
+        buffers.append(
+            device.create_buffer_with_data(data=data, usage=wgpu.BufferUsage.COPY_SRC)
+        )
+
+    # Multiple reads can be in flight
+    promises = [device.queue.read_buffer_async(buf) for buf in buffers]
+    for i, promise in enumerate(promises):
+        assert promise.sync_wait() == f"{i + 1}".encode() * 8 * (i + 1)
+
+    # Read part of a buffer
+    data = device.queue.read_buffer_async(buffers[3], 8, 8).sync_wait()
+    assert data == b"4" * 8
+
+
+@mark.skipif(not can_use_wgpu_lib, reason="Needs wgpu lib")
+def test_read_buffer_staging_pool():
+    device = wgpu.utils.get_default_device()
+    pool = device.queue._get_staging_pool()
+    pool.clear()
+
+    def get_free_buffers():
+        return [b for _, b in pool._free[pool.min_size]]
+
+    # The staging buffers are reused, also for reads of a different size
+    buf = device.create_buffer_with_data(
+        data=b"x" * 1024, usage=wgpu.BufferUsage.COPY_SRC
+    )
+    device.queue.read_buffer(buf)
+    staging_buffers = get_free_buffers()
+    assert len(staging_buffers) == 1
+    assert device.queue.read_buffer(buf, size=512) == b"x" * 512
+    assert get_free_buffers() == staging_buffers
+
+    # Reads that are in flight at the same time use different buffers
+    promises = [device.queue.read_buffer_async(buf) for _ in range(3)]
+    assert len(get_free_buffers()) == 0
+    for promise in promises:
+        promise.sync_wait()
+    assert len(get_free_buffers()) == 3
+
+    # Small sizes are rounded up to a power of two
+    assert pool.get_size_class(1) == pool.min_size
+    assert pool.get_size_class(pool.min_size + 1) == pool.min_size * 2
+    assert pool.get_size_class(pool.min_size * 2) == pool.min_size * 2
+
+    # Large sizes are rounded up to a multiple of max_pow2_size
+    step = pool.max_pow2_size
+    assert pool.get_size_class(step) == step
+    assert pool.get_size_class(step + 1) == 2 * step
+    assert pool.get_size_class(5 * step + 1) == 6 * step
+
+    # Sizes do not exceed the device limit
+    max_size = device.limits["max-buffer-size"]
+    assert pool.get_size_class(max_size - 1) == max_size
+    assert pool.get_size_class(max_size) == max_size
+
+    pool.clear()
+    assert not pool._free
+
+
+@mark.skipif(not can_use_wgpu_lib, reason="Needs wgpu lib")
+def test_staging_pool_limits_and_errors():
+    device = wgpu.utils.get_default_device()
+    pool = device.queue._get_staging_pool()
+    pool.clear()
+
+    # The pool holds at most max_free_bytes in free buffers
+    buf = device.create_buffer(size=pool.min_size, usage=wgpu.BufferUsage.COPY_SRC)
+    texture = device.create_texture(
+        size=(4, 4, 1), format="rgba8unorm", usage=wgpu.TextureUsage.COPY_SRC
+    )
+    pool.max_free_bytes = pool.min_size
+    try:
+        promises = [device.queue.read_buffer_async(buf) for _ in range(3)]
+        for promise in promises:
+            promise.sync_wait()
+    finally:
+        del pool.max_free_bytes
+    assert len(pool._free[pool.min_size]) == 1
+    assert pool._free_bytes == pool.min_size
+
+    # When reading the mapped data fails, the buffer is still given back
+    pool.clear()
+    ori_read_mapped = wgpu.backends.wgpu_native.GPUBuffer.read_mapped
+
+    def read_mapped(*args, **kwargs):
+        raise RuntimeError("oops")
+
+    wgpu.backends.wgpu_native.GPUBuffer.read_mapped = read_mapped
+    try:
+        with raises(RuntimeError):
+            device.queue.read_buffer(buf)
+    finally:
+        wgpu.backends.wgpu_native.GPUBuffer.read_mapped = ori_read_mapped
+    staging_buffer = pool._free[pool.min_size][0][1]
+    assert staging_buffer.map_state == "unmapped"
+    assert device.queue.read_buffer(buf) == bytes(pool.min_size)
+
+    # When mapping fails, the buffer is destroyed instead
+    pool.clear()
+    buffer_class = wgpu.backends.wgpu_native.GPUBuffer
+    ori_map_async, ori_destroy = buffer_class._map_async, buffer_class.destroy
+    staging_buffers, destroyed_buffers = [], []
+
+    def map_async(self, *args):
+        staging_buffers.append(self)
+        error_handler = args[-1]
+        error_handler()
+        raise RuntimeError("oops")
+
+    def destroy(self):
+        destroyed_buffers.append(self)
+        ori_destroy(self)
+
+    buffer_class._map_async, buffer_class.destroy = map_async, destroy
+    try:
+        for read_async in [
+            lambda: device.queue.read_buffer_async(buf),
+            lambda: device.queue.read_texture_async(
+                {"texture": texture}, {"bytes_per_row": 256}, (4, 4, 1)
+            ),
+        ]:
+            with raises(RuntimeError):
+                read_async()
+    finally:
+        buffer_class._map_async, buffer_class.destroy = ori_map_async, ori_destroy
+    assert len(staging_buffers) == 2
+    assert destroyed_buffers == staging_buffers
+    assert not pool._free.get(pool.min_size)
+
+    pool.clear()
+
+
+@mark.skipif(not can_use_wgpu_lib, reason="Needs wgpu lib")
+def test_staging_pool_eviction_and_stats():
+    device = wgpu.utils.get_default_device()
+    pool = device.queue._get_staging_pool()
+    pool.clear()
+    pool._stats.clear()
+
+    buf = device.create_buffer_with_data(
+        data=b"x" * 1024, usage=wgpu.BufferUsage.COPY_SRC
+    )
+    for _ in range(3):
+        device.queue.read_buffer(buf)
+    stats = pool.get_stats()[pool.min_size]
+    assert stats == {"free": 1, "hits": 2, "misses": 1, "evicted": 0}
+
+    # Also used by read_texture, for any texture
+    texture = device.create_texture(
+        size=(16, 16, 1), format="rgba8unorm", usage=wgpu.TextureUsage.COPY_SRC
+    )
+    for _ in range(2):
+        device.queue.read_texture(
+            {"texture": texture}, {"bytes_per_row": 64}, (16, 16, 1)
+        )
+    stats = pool.get_stats()[pool.min_size]
+    assert stats == {"free": 1, "hits": 4, "misses": 1, "evicted": 0}
+
+    # Buffers that are not used for a while are destroyed
+    big_buf = device.create_buffer(
+        size=pool.min_size * 2, usage=wgpu.BufferUsage.COPY_SRC
+    )
+    pool.max_idle_time = 0
+    try:
+        device.queue.read_buffer(big_buf)
+    finally:
+        del pool.max_idle_time
+    stats = pool.get_stats()
+    assert stats[pool.min_size]["evicted"] == 1
+    assert stats[pool.min_size]["free"] == 0
+
+    # Idle buffers are also destroyed when the device is polled
+    pool.max_idle_time = 0
+    try:
+        assert pool.get_stats()[pool.min_size * 2]["free"] == 1
+        device._poll()
+    finally:
+        del pool.max_idle_time
+    stats = pool.get_stats()
+    assert stats[pool.min_size * 2]["evicted"] == 1
+    assert stats[pool.min_size * 2]["free"] == 0
+
+    # The stats show up in the diagnostics
+    d = wgpu.diagnostics.staging_buffers.get_dict()
+    assert d["total"]["evicted"] >= 1
+    assert "staging_buffers" in wgpu.diagnostics.get_report()
+
+    pool.clear()
+
+
+@mark.skipif(not can_use_wgpu_lib, reason="Needs wgpu lib")
+def test_read_buffer_out():
+    device = wgpu.utils.get_default_device()
+    data1 = np.arange(64, dtype=np.float32)
+    buf = device.create_buffer_with_data(data=data1, usage=wgpu.BufferUsage.COPY_SRC)
+
+    # Read into a preallocated array
+    out = np.zeros(64, np.float32)
+    assert device.queue.read_buffer(buf, out=out) is out
+    assert np.all(out == data1)
+
+    # The out can be larger than the data
+    out = np.zeros(64, np.float32)
+    result = device.queue.read_buffer_async(buf, 128, 64, out=out).sync_wait()
+    assert result is out
+    assert np.all(out[:16] == data1[32:48])
+    assert np.all(out[16:] == 0)
+
+    # Via read_mapped
+    buf2 = device.create_buffer_with_data(data=data1, usage=wgpu.BufferUsage.MAP_READ)
+    out = bytearray(32)
+    buf2.map_sync("read")
+    assert buf2.read_mapped(0, 32, out=out) is out
+    assert out == data1[:8].tobytes()
+    with raises(ValueError):  # cannot combine with copy=False
+        buf2.read_mapped(0, 32, copy=False, out=out)
+    buf2.unmap()
+
+    # Errors
+    with raises(ValueError):  # too small
+        device.queue.read_buffer(buf, out=np.zeros(63, np.float32))
+    with raises(ValueError):  # readonly
+        device.queue.read_buffer(buf, out=bytes(256))
+    with raises(ValueError):  # not contiguous
+        device.queue.read_buffer(buf, out=np.zeros(128, np.float32)[::2])
+
+
 @mark.skipif(not can_use_wgpu_lib, reason="Needs wgpu lib")
 def test_buffer_mapping_fails():
     device = wgpu.utils.get_default_device()
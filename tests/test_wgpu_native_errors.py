@@ -1,3 +1,5 @@
+import threading
+
 import wgpu.utils
 
 from testutils import run_tests
@@ -246,5 +248,148 @@ def test_validate_shader_error2(caplog):
     assert err.value.message.strip() == expected2, f"Expected:\n\n{expected2}"
 
 
+def test_render_pass_errors_are_raised_per_call():
+    device = wgpu.utils.get_default_device()
+    texture = device.create_texture(
+        size=(4, 4, 1), format="rgba8unorm", usage="RENDER_ATTACHMENT"
+    )
+
+    encoder = device.create_command_encoder()
+    render_pass = encoder.begin_render_pass(
+        color_attachments=[
+            {"view": texture.create_view(), "load_op": "clear", "store_op": "store"}
+        ]
+    )
+    render_pass.end()
+
+    with raises(wgpu.GPUValidationError) as err:
+        render_pass.set_scissor_rect(0, 0, 2, 2)
+    assert "must not have ended" in err.value.message
+
+
+def test_render_pass_errors_are_raised_at_finish():
+    # Some errors of the commands recorded in a render pass are only
+    # detected when the encoder is finished.
+    device = wgpu.utils.get_default_device()
+    texture = device.create_texture(
+        size=(4, 4, 1), format="rgba8unorm", usage="RENDER_ATTACHMENT"
+    )
+    buffer = device.create_buffer(size=64, usage="VERTEX")
+
+    encoder = device.create_command_encoder()
+    render_pass = encoder.begin_render_pass(
+        color_attachments=[
+            {"view": texture.create_view(), "load_op": "clear", "store_op": "store"}
+        ]
+    )
+    render_pass.set_vertex_buffer(0, buffer)
+    render_pass.set_scissor_rect(0, 0, 100, 100)  # larger than the target
+    render_pass.draw(3)  # no pipeline set
+    render_pass.end()
+
+    with raises(wgpu.GPUValidationError) as err:
+        encoder.finish()
+    assert "Scissor" in err.value.message
+
+
+def test_deferred_error_checking():
+    from wgpu.backends.wgpu_native.extras import set_deferred_error_checking
+
+    device = wgpu.utils.get_default_device()
+
+    set_deferred_error_checking(True)
+    try:
+        # Does not raise here ...
+        device.create_buffer(size=16, usage=0)
+        encoder = device.create_command_encoder()
+        # ... but at the next checkpoint
+        with raises(wgpu.GPUValidationError) as err:
+            encoder.finish()
+        assert "wgpuDeviceCreateBuffer" in err.value.message
+        # The error is raised only once
+        device.queue.submit([])
+    finally:
+        set_deferred_error_checking(False)
+
+    with raises(wgpu.GPUValidationError):
+        device.create_buffer(size=16, usage=0)
+
+
+def test_deferred_error_checking_render_pass():
+    from wgpu.backends.wgpu_native._api import GPURenderPassEncoder, lib, libf
+    from wgpu.backends.wgpu_native.extras import set_deferred_error_checking
+
+    device = wgpu.utils.get_default_device()
+    texture = device.create_texture(
+        size=(4, 4, 1), format="rgba8unorm", usage="RENDER_ATTACHMENT"
+    )
+
+    set_deferred_error_checking(True)
+    try:
+        # The commands call into wgpu-native directly
+        assert GPURenderPassEncoder._draw_function is lib.wgpuRenderPassEncoderDraw
+        assert libf.wgpuRenderPassEncoderEnd is not lib.wgpuRenderPassEncoderEnd
+        encoder = device.create_command_encoder()
+        render_pass = encoder.begin_render_pass(
+            color_attachments=[
+                {"view": texture.create_view(), "load_op": "clear", "store_op": "store"}
+            ]
+        )
+        render_pass.end()
+        render_pass.set_scissor_rect(0, 0, 2, 2)  # Does not raise here
+        with raises(wgpu.GPUValidationError) as err:
+            encoder.finish()
+        assert "must not have ended" in err.value.message
+    finally:
+        set_deferred_error_checking(False)
+
+    assert GPURenderPassEncoder._draw_function is libf.wgpuRenderPassEncoderDraw
+
+
+def test_deferred_error_checking_submit():
+    from wgpu.backends.wgpu_native.extras import set_deferred_error_checking
+
+    device = wgpu.utils.get_default_device()
+
+    set_deferred_error_checking(True)
+    try:
+        device.create_buffer(size=16, usage=0)
+        # Submit is a checkpoint too
+        with raises(wgpu.GPUValidationError) as err:
+            device.queue.submit([])
+        assert "wgpuDeviceCreateBuffer" in err.value.message
+        device.queue.submit([])
+    finally:
+        set_deferred_error_checking(False)
+
+
+def test_deferred_error_checking_disable_flushes_all_threads(caplog):
+    from wgpu.backends.wgpu_native.extras import set_deferred_error_checking
+
+    device = wgpu.utils.get_default_device()
+
+    set_deferred_error_checking(True)
+    try:
+        # The error is collected for the other thread, which never reaches a checkpoint
+        thread = threading.Thread(target=lambda: device.create_buffer(size=16, usage=0))
+        thread.start()
+        thread.join()
+        assert not caplog.records
+    finally:
+        set_deferred_error_checking(False)
+
+    # Disabling logs the collected error, so it does not get lost
+    assert len(caplog.records) == 1
+    assert "wgpuDeviceCreateBuffer" in caplog.records[0].msg
+
+    # And it is not raised later
+    set_deferred_error_checking(True)
+    try:
+        device.queue.submit([])
+    finally:
+        set_deferred_error_checking(False)
+    assert len(caplog.records) == 1
+
+
 if __name__ == "__main__":
     run_tests(globals())
@@ -0,0 +1,132 @@
+"""
+Test the prepared render passes in the wgpu-native extras.
+"""
+
+import numpy as np
+import wgpu
+from pytest import mark, raises
+from testutils import run_tests, get_default_device
+from testutils import can_use_wgpu_lib
+
+from wgpu.backends.wgpu_native.extras import (
+    prepare_render_pass,
+    begin_prepared_render_pass,
+)
+
+
+if not can_use_wgpu_lib:
+    mark.skip("Skipping tests that need the wgpu lib", allow_module_level=True)
+
+
+SIZE = 4, 4, 1
+
+
+def create_target(device, format=wgpu.TextureFormat.rgba8unorm):
+    return device.create_texture(
+        size=SIZE,
+        format=format,
+        usage=wgpu.TextureUsage.RENDER_ATTACHMENT | wgpu.TextureUsage.COPY_SRC,
+    )
+
+
+def read_first_pixel(device, texture):
+    data = device.queue.read_texture(
+        {"texture": texture},
+        {"bytes_per_row": SIZE[0] * 4},
+        SIZE,
+    )
+    return tuple(np.frombuffer(data, np.uint8)[:4])
+
+
+def test_prepared_render_pass_swap_view_and_clear_value():
+    device = get_default_device()
+    texture1 = create_target(device)
+    texture2 = create_target(device)
+
+    prepared = prepare_render_pass(
+        device,
+        label="prepared",
+        color_attachments=[
+            {
+                "view": texture1.create_view(),
+                "clear_value": (1, 0, 0, 1),
+                "load_op": wgpu.LoadOp.clear,
+                "store_op": wgpu.StoreOp.store,
+            }
+        ],
+    )
+
+    encoder = device.create_command_encoder()
+    render_pass = begin_prepared_render_pass(encoder, prepared)
+    assert render_pass.label == "prepared"
+    render_pass.end()
+
+    # Swap the view and clear value, and render again, with the same descriptor
+    prepared.set_color_attachment(
+        0, view=texture2.create_view(), clear_value={"r": 0, "g": 0, "b": 1, "a": 1}
+    )
+    begin_prepared_render_pass(encoder, prepared).end()
+    device.queue.submit([encoder.finish()])
+
+    assert read_first_pixel(device, texture1) == (255, 0, 0, 255)
+    assert read_first_pixel(device, texture2) == (0, 0, 255, 255)
+
+
+def test_prepared_render_pass_depth_stencil():
+    device = get_default_device()
+    depth_texture1 = create_target(device, wgpu.TextureFormat.depth32float)
+    depth_texture2 = create_target(device, wgpu.TextureFormat.depth32float)
+
+    prepared = prepare_render_pass(
+        device,
+        color_attachments=[
+            {
+                "view": create_target(device).create_view(),
+                "load_op": wgpu.LoadOp.clear,
+                "store_op": wgpu.StoreOp.store,
+            }
+        ],
+        depth_stencil_attachment={
+            "view": depth_texture1.create_view(),
+            "depth_clear_value": 0.25,
+            "depth_load_op": wgpu.LoadOp.clear,
+            "depth_store_op": wgpu.StoreOp.store,
+        },
+    )
+    depth_view2 = depth_texture2.create_view()
+    prepared.set_depth_stencil_attachment(view=depth_view2, depth_clear_value=0.75)
+
+    c_attachment = prepared._struct.depthStencilAttachment
+    assert c_attachment.view == depth_view2._internal
+    assert c_attachment.depthClearValue == 0.75
+
+    encoder = device.create_command_encoder()
+    begin_prepared_render_pass(encoder, prepared).end()
+    device.queue.submit([encoder.finish()])
+
+
+def test_prepared_render_pass_errors():
+    device = get_default_device()
+    texture = create_target(device)
+
+    prepared = prepare_render_pass(
+        device,
+        color_attachments=[
+            {
+                "view": texture.create_view(),
+                "load_op": wgpu.LoadOp.clear,
+                "store_op": wgpu.StoreOp.store,
+            }
+        ],
+    )
+
+    with raises(IndexError):
+        prepared.set_color_attachment(1, clear_value=(0, 0, 0, 0))
+    with raises(TypeError):
+        prepared.set_color_attachment(0, view=texture)
+    with raises(ValueError):
+        prepared.set_depth_stencil_attachment(depth_clear_value=1.0)
+
+
+if __name__ == "__main__":
+    run_tests(globals())
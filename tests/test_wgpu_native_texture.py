@@ -281,5 +281,64 @@ def test_write_texture2():
     assert iters_equal(data0, data2)
 
 
+@mark.skipif(not can_use_wgpu_lib, reason="Needs wgpu lib")
+def test_read_texture_out():
+    device = wgpu.utils.get_default_device()
+
+    # 3 bytes per row is not a multiple of 256, so the rows are de-strided
+    for nx in (3, 64):
+        ny, nz = 5, 2
+        data1 = np.random.randint(0, 255, size=(nz, ny, nx), dtype=np.uint8)
+        texture = device.create_texture(
+            size=(nx, ny, nz),
+            dimension="3d",
+            format=wgpu.TextureFormat.r8uint,
+            usage=wgpu.TextureUsage.COPY_SRC | wgpu.TextureUsage.COPY_DST,
+        )
+        layout = {"bytes_per_row": nx, "rows_per_image": ny}
+        device.queue.write_texture({"texture": texture}, data1, layout, (nx, ny, nz))
+
+        out = np.zeros((nz, ny, nx), np.uint8)
+        data2 = device.queue.read_texture(
+            {"texture": texture}, layout, (nx, ny, nz), out=out
+        )
+        assert data2 is out
+        assert np.all(out == data1)
+
+        # With an offset, the data is written after it
+        out = np.zeros(4 + data1.size, np.uint8)
+        layout["offset"] = 4
+        device.queue.read_texture({"texture": texture}, layout, (nx, ny, nz), out=out)
+        assert np.all(out[:4] == 0)
+        assert np.all(out[4:] == data1.flat)
+
+        with raises(ValueError):
+            device.queue.read_texture(
+                {"texture": texture}, layout, (nx, ny, nz), out=out[:-1]
+            )
+
+
+def test_copy_rows():
+    from wgpu.backends.wgpu_native import _helpers
+
+    def get_address(a):
+        return _helpers.get_memoryview_and_address(a)[1]
+
+    src = np.arange(10 * 16, dtype=np.uint8).reshape(10, 16)
+    get_numpy = _helpers.get_numpy
+    try:
+        for numpy_or_none in (np, None):
+            _helpers.get_numpy = lambda numpy_or_none=numpy_or_none: numpy_or_none
+            for nrows in (0, 1, 10):
+                dst = np.zeros((10, 12), np.uint8)
+                _helpers.copy_rows(
+                    get_address(dst), 12, get_address(src), 16, 12, nrows
+                )
+                assert np.all(dst[:nrows] == src[:nrows, :12])
+                assert np.all(dst[nrows:] == 0)
+    finally:
+        _helpers.get_numpy = get_numpy
+
+
 if __name__ == "__main__":
     run_tests(globals())
@@ -0,0 +1,47 @@
+"""
+Build the precompiled cffi module for the wgpu-native backend.
+
+This parses the headers in wgpu/resources once, and writes the result to
+wgpu/backends/wgpu_native/_wgpu_ffi.py, so that importing the backend does
+not have to parse the headers. The module is platform-specific (like the
+lib), and is therefore not tracked in git. If it is missing or stale,
+the backend falls back to parsing the headers at import time.
+"""
+
+import os
+import importlib.util
+
+
+ROOT_DIR = os.path.abspath(os.path.join(__file__, "..", ".."))
+RESOURCE_DIR = os.path.join(ROOT_DIR, "wgpu", "resources")
+BACKEND_DIR = os.path.join(ROOT_DIR, "wgpu", "backends", "wgpu_native")
+
+
+def _load_ffi_build_module():
+    # Load by filename, so we don't import wgpu (which would load the lib)
+    filename = os.path.join(BACKEND_DIR, "_ffi_build.py")
+    spec = importlib.util.spec_from_file_location("_wgpu_ffi_build", filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def remove_ffi_module():
+    filename = os.path.join(BACKEND_DIR, "_wgpu_ffi.py")
+    if os.path.isfile(filename):
+        os.remove(filename)
+        print("Removed _wgpu_ffi.py from backend dir")
+
+
+def main():
+    ffi_build = _load_ffi_build_module()
+    header_filenames = [
+        os.path.join(RESOURCE_DIR, "webgpu.h"),
+        os.path.join(RESOURCE_DIR, "wgpu.h"),
+    ]
+    filename = ffi_build.build_ffi_module(header_filenames, BACKEND_DIR)
+    print(f"Written precompiled ffi module to {filename}")
+
+
+if __name__ == "__main__":
+    main()
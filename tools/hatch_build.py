@@ -3,6 +3,7 @@ Hook for building wheels with the hatchling build backend.
 
 * Set wheel to being platform-specific (not pure Python).
 * Download the wgpu-native library before creating the wheel.
+* Build the precompiled cffi module, so the headers need not be parsed at import.
 * Support cross-platform wheel building with a custom env var.
 * Note that for sdist we go into pure-Python mode.
 """
@@ -33,6 +34,7 @@ root_dir = os.path.abspath(os.path.join(__file__, "..", ".."))
 sys.path.insert(0, os.path.join(root_dir, "tools"))
 
 from download_wgpu_native import main as download_lib  # noqa: E402
+from build_wgpu_ffi import main as build_ffi, remove_ffi_module  # noqa: E402
 
 
 class CustomBuildHook(BuildHookInterface):
@@ -67,6 +69,11 @@ class CustomBuildHook(BuildHookInterface):
                 build_data["infer_tag"] = True
                 download_lib()
 
+            # Pre-parse the header. The module includes a hash to detect
+            # a mismatch (e.g. size_t on win32), in which case the header
+            # is parsed at import time as before.
+            build_ffi()
+
             # Make sure that the download did not bump the wgpu-native version
             check_git_status()
 
@@ -91,3 +98,4 @@ def remove_all_libs():
         if fname.endswith((".so", ".dll", ".dylib")):
             os.remove(os.path.join(dir, fname))
             print(f"Removed {fname} from resource dir")
+    remove_ffi_module()
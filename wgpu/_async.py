@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import sys
-import time
 import logging
 import threading
 from typing import Callable, Awaitable, Generator, Generic, TypeVar
@@ -117,6 +116,8 @@ class GPUPromise(Awaitable[AwaitedType], Generic[AwaitedType]):
         self._value = None  # The incoming value, final value, or error
         self._event = None  # AsyncEvent for __await__
         self._lock = threading.RLock()  # Allow threads to set the value
+        self._condition = threading.Condition(self._lock)  # To wake sync waiters
+        self._thread_id = threading.get_ident()  # The 'reference' thread
         self._done_callbacks = []
         self._error_callbacks = []
         self._UNRESOLVED.add(self)
@@ -183,16 +184,28 @@ class GPUPromise(Awaitable[AwaitedType], Generic[AwaitedType]):
         """The promise received its input (or error), and now we need to handle it, then call callbacks etc."""
         # We can now drop the reference.
         self._UNRESOLVED.discard(self)
+        # If this is a different thread than the reference thread, we must
+        # use call_soon_threadsafe, if the loop has it.
+        call_soon = None
+        if self._loop is not None:
+            call_soon = self._loop.call_soon
+            if threading.get_ident() != self._thread_id:
+                call_soon = getattr(self._loop, "call_soon_threadsafe", call_soon)
         # Do or schedule a call to resolve.
         if resolve_now:
             self._resolve_callback()
-        elif self._loop is not None:
-            self._loop.call_soon(self._resolve_callback)
+        elif call_soon is not None:
+            call_soon(self._resolve_callback)
+        # Wake up threads that are in sync_wait().
+        self._condition.notify_all()
         # Allow tasks that await this promise to continue. Do this last, since
         # it allows any waiting tasks to continue. These taks are assumed to be
         # on the 'reference' thread, but *this* may be a different thread.
         if self._event is not None:
-            self._event.set()
+            if call_soon is not None and threading.get_ident() != self._thread_id:
+                call_soon(self._event.set)
+            else:
+                self._event.set()
 
     def _resolve_callback(self):
         # The callback may already be resolved
@@ -251,12 +264,16 @@ class GPUPromise(Awaitable[AwaitedType], Generic[AwaitedType]):
                 raise RuntimeError(
                     "Cannot GPUPromise.sync_wait(), if the polling function is not set."
                 )
-            # Do small incremental sync naps. Other threads can run.
-            # Note that time.sleep is accurate (does not suffer from the inaccuracy issue on Windows).
+            # Do small incremental sync naps. Other threads can run. We nap by
+            # waiting for the condition, so that when the promise is resolved
+            # from another thread (e.g. a thread that polls the device), we
+            # wake up right away.
             sleep_gen = get_backoff_time_generator()
             self._poller()
             while self._state == "pending":
-                time.sleep(next(sleep_gen))
+                with self._condition:
+                    if self._state == "pending":
+                        self._condition.wait(next(sleep_gen))
                 self._poller()
 
         return self._resolve()  # returns result if fulfilled or raise error if rejected
@@ -57,6 +57,7 @@ __all__ = [
     "GPURenderPipeline",
     "GPUSampler",
     "GPUShaderModule",
+    "GPUSubmission",
     "GPUTexture",
     "GPUTextureView",
     "GPUValidationError",
@@ -243,6 +244,11 @@ class GPUCanvasContext:
         # The last used texture
         self._texture = None
 
+        # Pending readbacks for the bitmap present method. With a depth larger
+        # than one, frames are returned with a latency of depth - 1 frames.
+        self._bitmap_readback_depth = 1
+        self._bitmap_readbacks = []
+
         # Determine the present method
         self._present_methods = present_methods
         self._present_method = "screen" if "screen" in present_methods else "bitmap"
@@ -430,6 +436,7 @@ class GPUCanvasContext:
             self._unconfigure_screen()
         self._config = None
         self._drop_texture()
+        self._bitmap_readbacks.clear()
 
     def _unconfigure_screen(self):
         raise NotImplementedError()
@@ -461,8 +468,6 @@ class GPUCanvasContext:
         width, height = canvas.get_physical_size()
         width, height = max(width, 1), max(height, 1)
 
-        # Note that the label 'present' is used by read_texture() to determine
-        # that it can use a shared copy buffer.
         device = self._config["device"]
         return device.create_texture(
             label="present",
@@ -494,7 +499,10 @@ class GPUCanvasContext:
             result = {"method": "screen"}
         elif self._present_method == "bitmap":
             bitmap = self._present_bitmap()
-            result = {"method": "bitmap", "format": "rgba-u8", "data": bitmap}
+            if bitmap is None:
+                result = {"method": "skip"}  # still in flight
+            else:
+                result = {"method": "bitmap", "format": "rgba-u8", "data": bitmap}
         else:
             result = {"method": "fail", "message": "incompatible present methods"}
 
@@ -521,7 +529,7 @@ class GPUCanvasContext:
                 f"Image present unsupported texture format bitdepth {format}."
             )
 
-        data = device.queue.read_texture(
+        promise = device.queue.read_texture_async(
             {
                 "texture": texture,
                 "mip_level": 0,
@@ -551,8 +559,16 @@ class GPUCanvasContext:
 
         # Represent as memory object to avoid numpy dependency
         # Equivalent: np.frombuffer(data, np.uint8).reshape(size[1], size[0], nchannels)
+        shape = size[1], size[0], nchannels
+        self._bitmap_readbacks.append((promise, memoryview_type, shape))
 
-        return data.cast(memoryview_type, (size[1], size[0], nchannels))
+        # With a depth > 1, the copy of this frame is done while the next
+        # frame(s) are being rendered, and we return an older frame.
+        if len(self._bitmap_readbacks) < self._bitmap_readback_depth:
+            return None
+        promise, memoryview_type, shape = self._bitmap_readbacks.pop(0)
+        data = promise.sync_wait()
+        return data.cast(memoryview_type, shape)
 
     def _present_screen(self):
         raise NotImplementedError()
@@ -1484,6 +1500,7 @@ class GPUBuffer(GPUObjectBase):
         size: int | None = None,
         *,
         copy: bool = True,
+        out: ArrayLike | None = None,
     ) -> ArrayLike:
         """Read mapped buffer data.
 
@@ -1506,6 +1523,11 @@ class GPUBuffer(GPUObjectBase):
                 which can result in corrupted data and segfaults. Therefore, when
                 setting copy to False, make *very* sure the memory is not accessed
                 after the buffer is unmapped.
+            out (buffer-like, None): an object to copy the data into, e.g. a
+                preallocated numpy array. Must support the buffer protocol, and
+                be contiguous, writable, and at least ``size`` bytes large.
+                If given, the data is copied into it and it is returned.
+                Cannot be combined with ``copy=False``.
 
         Alignment: the buffer offset must be a multiple of 8, the size must be a multiple of 4.
 
@@ -2361,11 +2383,17 @@ class GPUQueue(GPUObjectBase):
     """
 
     # IDL: undefined submit(sequence<GPUCommandBuffer> commandBuffers);
-    def submit(self, command_buffers: Sequence[GPUCommandBuffer] | None = None) -> None:
+    @apidiff.change("Returns a GPUSubmission")
+    def submit(
+        self, command_buffers: Sequence[GPUCommandBuffer] | None = None
+    ) -> GPUSubmission:
         """Submit a `GPUCommandBuffer` to the queue.
 
         Arguments:
             command_buffers (list): The `GPUCommandBuffer` objects to add.
+
+        Returns a `GPUSubmission` that can be used to wait for this work to
+        be done, without waiting for work that is submitted later.
         """
         raise NotImplementedError()
 
@@ -2404,7 +2432,12 @@ class GPUQueue(GPUObjectBase):
 
     @apidiff.add("For symmetry with queue.write_buffer")
     def read_buffer(
-        self, buffer: GPUBuffer, buffer_offset: int = 0, size: int | None = None
+        self,
+        buffer: GPUBuffer,
+        buffer_offset: int = 0,
+        size: int | None = None,
+        *,
+        out: ArrayLike | None = None,
     ) -> ArrayLike:
         """Takes the data contents of the buffer and return them as a memoryview.
 
@@ -2412,8 +2445,11 @@ class GPUQueue(GPUObjectBase):
             buffer: The `GPUBuffer` object to read from.
             buffer_offset (int, None): The offset in the buffer to start reading from.
             size: The number of bytes to read. Default all minus offset.
+            out (buffer-like, None): An object to copy the data into, e.g. a
+                preallocated numpy array. Must be contiguous, writable, and
+                large enough. If given, it is returned instead of a memoryview.
 
-        This copies the data in the given buffer to a temporary buffer
+        This copies the data in the given buffer to a staging buffer
         and then maps that buffer to read the data. The given buffer's
         usage must include COPY_SRC.
 
@@ -2421,6 +2457,23 @@ class GPUQueue(GPUObjectBase):
         """
         raise NotImplementedError()
 
+    @apidiff.add("So that multiple reads can be in flight")
+    def read_buffer_async(
+        self,
+        buffer: GPUBuffer,
+        buffer_offset: int = 0,
+        size: int | None = None,
+        *,
+        out: ArrayLike | None = None,
+    ) -> GPUPromise[ArrayLike]:
+        """Async version of `read_buffer()`.
+
+        Returns a `GPUPromise` that resolves to a memoryview with the data. The
+        copy to the staging buffer is submitted right away, so multiple reads
+        can be in flight, while other work is being submitted.
+        """
+        raise NotImplementedError()
+
     # IDL: undefined writeTexture( GPUTexelCopyTextureInfo destination, AllowSharedBufferSource data, GPUTexelCopyBufferLayout dataLayout, GPUExtent3D size);
     def write_texture(
         self,
@@ -2451,7 +2504,12 @@ class GPUQueue(GPUObjectBase):
 
     @apidiff.add("For symmetry, and to help work around the bytes_per_row constraint")
     def read_texture(
-        self, source: dict, data_layout: dict, size: tuple[int, int, int]
+        self,
+        source: dict,
+        data_layout: dict,
+        size: tuple[int, int, int],
+        *,
+        out: ArrayLike | None = None,
     ) -> ArrayLike:
         """Reads the contents of the texture and return them as a memoryview.
 
@@ -2461,12 +2519,32 @@ class GPUQueue(GPUObjectBase):
             data_layout: A dict with fields: "offset" (an int, default 0),
                 "bytes_per_row" (an int), "rows_per_image" (an int, default 0).
             size: A 3-tuple of ints specifying the size to write.
+            out (buffer-like, None): An object to copy the data into, e.g. a
+                preallocated numpy array. Must be contiguous, writable, and
+                large enough. If given, it is returned instead of a memoryview.
 
         Unlike `GPUCommandEncoder.copyBufferToTexture()`, there is
         no alignment requirement on `bytes_per_row`, although in the
         current implementation there will be a performance penalty if
         ``bytes_per_row`` is not a multiple of 256 (because we'll be
-        copying data row-by-row in Python).
+        copying data row-by-row).
+        """
+        raise NotImplementedError()
+
+    @apidiff.add("So that multiple reads can be in flight")
+    def read_texture_async(
+        self,
+        source: dict,
+        data_layout: dict,
+        size: tuple[int, int, int],
+        *,
+        out: ArrayLike | None = None,
+    ) -> GPUPromise[ArrayLike]:
+        """Async version of `read_texture()`.
+
+        Returns a `GPUPromise` that resolves to a memoryview with the data. The
+        copy to the staging buffer is submitted right away, so multiple reads
+        can be in flight, while other work is being submitted.
         """
         raise NotImplementedError()
 
@@ -2631,6 +2709,37 @@ class GPUCompilationInfo:
         raise NotImplementedError()
 
 
+@apidiff.add("To wait for a specific submission")
+class GPUSubmission:
+    """Represents work that was submitted with `GPUQueue.submit()`.
+
+    Can be used to wait until that work is done, e.g. to reuse the resources
+    of a frame, without waiting for work that was submitted later.
+    """
+
+    def __init__(self, queue, index):
+        self._queue = queue
+        self._index = index
+        self._done = False
+
+    @property
+    def index(self) -> int:
+        """The submission index. Work that is submitted later has a higher index."""
+        return self._index
+
+    def wait_sync(self) -> None:
+        """Sync version of `wait_async()`."""
+        return self._wait()
+
+    def wait_async(self) -> GPUPromise[None]:
+        """Get a promise that resolves when the submitted work is done."""
+        raise NotImplementedError()
+
+    def _wait(self):
+        # Backends can implement this to block more efficiently
+        return self.wait_async().sync_wait()
+
+
 class GPUQuerySet(GPUObjectBase):
     """An object to store the results of queries on passes.
 
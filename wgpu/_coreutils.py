@@ -172,6 +172,22 @@ class BaseEnum(metaclass=EnumType):
         raise RuntimeError("Cannot instantiate an enum.")
 
 
+_numpy = False  # False means not yet imported
+
+
+def get_numpy():
+    """Get the numpy module, or None if it's not available.
+    We don't depend on numpy, but can use it to speed things up.
+    """
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+
 _flag_cache = {}  # str -> int
 
 
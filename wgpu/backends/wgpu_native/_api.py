@@ -18,9 +18,12 @@ Read the codegen/readme.md for more information.
 from __future__ import annotations
 
 import os
-import time
+import weakref
 import logging
-from weakref import WeakKeyDictionary
+import itertools
+import threading
+import functools
+from weakref import WeakKeyDictionary, WeakValueDictionary
 from typing import NoReturn, Sequence
 
 from ..._async import LoopInterface
@@ -29,14 +32,20 @@ from ... import classes, flags, enums, structs
 
 from ._ffi import ffi, lib
 from ._mappings import cstructfield2enum, enummap, enum_str2int, enum_int2str
+from ._builders import struct_builders
 from ._helpers import (
     get_wgpu_instance,
     get_surface_id_from_info,
     get_memoryview_from_address,
     get_memoryview_and_address,
+    get_out_memoryview_and_address,
+    copy_rows,
     to_snake_case,
     ErrorHandler,
     SafeLibCalls,
+    StagingBufferPool,
+    DevicePollThread,
+    StructArenaState,
 )
 
 logger = logging.getLogger("wgpu")
@@ -88,14 +97,42 @@ def print_struct(s, indent=""):
             print(indent + key + ":", val)
 
 
+# Thread-local state for with_struct_arena()
+_struct_arena = StructArenaState()
+
+
+def with_struct_arena(func):
+    """Decorator for methods that create structs which are consumed by a
+    synchronous call into the lib. Instead of binding the kwargs to each
+    struct via the global ``_refs_per_struct``, everything is kept alive
+    by a plain list, which is dropped when the method returns.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        prev_refs = _struct_arena.refs
+        _struct_arena.refs = []
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _struct_arena.refs = prev_refs
+
+    return wrapper
+
+
 def new_struct_p(ctype, **kwargs):
     """Create a pointer to an ffi struct. Provides a flatter syntax
     and converts our string enums to int enums needed in C. The passed
     kwargs are also bound to the lifetime of the new struct.
     """
     assert ctype.endswith(" *")
-    struct_p = _new_struct_p(ctype, **kwargs)
-    _refs_per_struct[struct_p] = kwargs
+    struct_p = _new_struct_p(ctype, kwargs)
+    refs = _struct_arena.refs
+    if refs is None:
+        _refs_per_struct[struct_p] = kwargs
+    else:
+        refs.append(struct_p)
+        refs.append(kwargs)
     return struct_p
     # Some kwargs may be other ffi objects, and some may represent
     # pointers. These need special care because them "being in" the
@@ -104,6 +141,7 @@ def new_struct_p(ctype, **kwargs):
     # calling code is painful and prone to missing cases, so we solve
     # the issue here. We cannot attach an attribute to the struct directly,
     # so we use a global WeakKeyDictionary. Also see issue #52.
+    # Methods that consume their structs right away can use with_struct_arena().
 
 
 def new_struct(ctype, **kwargs):
@@ -111,14 +149,25 @@ def new_struct(ctype, **kwargs):
     to the lifetime of the new struct.
     """
     assert not ctype.endswith("*")
-    struct_p = _new_struct_p(ctype + " *", **kwargs)
+    struct_p = _new_struct_p(ctype + " *", kwargs)
     struct = struct_p[0]
-    _refs_per_struct[struct] = tuple(kwargs.values())
+    refs = _struct_arena.refs
+    if refs is None:
+        _refs_per_struct[struct] = tuple(kwargs.values())
+    else:
+        refs.append(struct_p)
+        refs.append(kwargs)
     return struct
 
 
-def _new_struct_p(ctype, **kwargs):
+def _new_struct_p(ctype, kwargs):
     struct_p = ffi.new(ctype)
+    # Use the generated builder for this struct (see _builders.py)
+    builder = struct_builders.get(ctype, None)
+    if builder is not None:
+        builder(struct_p, **kwargs)
+        return struct_p
+    # Generic fallback
     for key, val in kwargs.items():
         if val is None:
             pass  # None means not-given / null in C
@@ -145,6 +194,11 @@ def new_array(ctype, elements):
         # The array is a contiguous copy of the element structs. We don't need
         # to keep a reference to the elements, but we do to sub-structs and
         # sub-arrays of these elements.
+        refs = _struct_arena.refs
+        if refs is not None:
+            refs.append(array)
+            refs.append(elements)
+            return array
         _refs_per_struct[array] = [
             _refs_per_struct.get(el, None)
             for el in elements
@@ -1366,17 +1420,64 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
     # they now exist in the header, but are still unimplemented: https://github.com/gfx-rs/wgpu-native/blob/f29ebee88362934f8f9fab530f3ccb7fde2d49a9/src/unimplemented.rs#L66-L82
     _CREATE_PIPELINE_ASYNC_IS_IMPLEMENTED = False
 
+    # A thread that polls the device, see extras.set_poll_thread()
+    _poll_thread = None
+
     def _poll(self):
         # Internal function
-        if self._internal:
+        self._evict_idle_staging_buffers()
+        if self._poll_thread is not None:
+            self._poll_thread.wake()
+        elif self._internal:
             # H: WGPUBool f(WGPUDevice device, WGPUBool wait, WGPUSubmissionIndex const * submissionIndex)
             libf.wgpuDevicePoll(self._internal, False, ffi.NULL)
 
     def _poll_wait(self):
-        if self._internal:
+        self._evict_idle_staging_buffers()
+        if self._poll_thread is not None:
+            self._poll_thread.wake()
+        elif self._internal:
             # H: WGPUBool f(WGPUDevice device, WGPUBool wait, WGPUSubmissionIndex const * submissionIndex)
             libf.wgpuDevicePoll(self._internal, True, ffi.NULL)
 
+    def _evict_idle_staging_buffers(self):
+        # Also evict when polling, so that an application that stops reading
+        # data does not keep the free staging buffers forever.
+        staging_pool = self._queue._staging_pool
+        if staging_pool is not None:
+            staging_pool.evict_idle()
+
+    def _wake_poll_thread(self):
+        # Called when a callback is registered, so that the poll thread (if
+        # any) processes it, also when nobody is calling the poller.
+        poll_thread = self._poll_thread
+        if poll_thread is not None:
+            poll_thread.wake()
+
+    def _set_poll_thread(self, enabled):
+        if enabled and self._poll_thread is None and self._internal:
+            internal = self._internal
+            queue_ref = weakref.ref(self._queue)
+
+            def poll():
+                # First wait for the submissions that are waited for, in order,
+                # so these resolve without waiting for work submitted later.
+                queue = queue_ref()
+                index = queue and queue._get_first_waited_index()
+                while index is not None:
+                    queue._wait_for_index(index)
+                    index = queue._get_first_waited_index()
+                del queue
+                # Blocks until the submitted work is done (the GIL is released)
+                # H: WGPUBool f(WGPUDevice device, WGPUBool wait, WGPUSubmissionIndex const * submissionIndex)
+                libf.wgpuDevicePoll(internal, True, ffi.NULL)
+
+            self._poll_thread = DevicePollThread(poll)
+            self._poll_thread.start()
+        elif not enabled and self._poll_thread is not None:
+            poll_thread, self._poll_thread = self._poll_thread, None
+            poll_thread.stop()
+
     def create_buffer(
         self,
         *,
@@ -1387,6 +1488,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
     ) -> GPUBuffer:
         return self._create_buffer(label, int(size), usage, bool(mapped_at_creation))
 
+    @with_struct_arena
     def _create_buffer(self, label, size, usage, mapped_at_creation):
         # Create a buffer object
         if isinstance(usage, str):
@@ -1412,6 +1514,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
         # Return wrapped buffer
         return GPUBuffer(label, id, self, size, usage, map_state)
 
+    @with_struct_arena
     def create_texture(
         self,
         *,
@@ -1486,6 +1589,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
         }
         return GPUTexture(label, id, self, tex_info)
 
+    @with_struct_arena
     def create_sampler(
         self,
         *,
@@ -1522,6 +1626,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
         id = libf.wgpuDeviceCreateSampler(self._internal, struct)
         return GPUSampler(label, id, self)
 
+    @with_struct_arena
     def create_bind_group_layout(
         self, *, label: str = "", entries: Sequence[structs.BindGroupLayoutEntryStruct]
     ) -> GPUBindGroupLayout:
@@ -1635,6 +1740,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
         id = libf.wgpuDeviceCreateBindGroupLayout(self._internal, struct)
         return GPUBindGroupLayout(label, id, self)
 
+    @with_struct_arena
     def create_bind_group(
         self,
         *,
@@ -1706,6 +1812,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
     ) -> GPUPipelineLayout:
         return self._create_pipeline_layout(label, bind_group_layouts, [])
 
+    @with_struct_arena
     def _create_pipeline_layout(
         self,
         label: str,
@@ -1755,6 +1862,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
         id = libf.wgpuDeviceCreatePipelineLayout(self._internal, struct)
         return GPUPipelineLayout(label, id, self)
 
+    @with_struct_arena
     def create_shader_module(
         self,
         *,
@@ -1854,6 +1962,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
             raise RuntimeError("Shader module creation failed")
         return GPUShaderModule(label, id, self)
 
+    @with_struct_arena
     def create_compute_pipeline(
         self,
         *,
@@ -1866,6 +1975,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
         id = libf.wgpuDeviceCreateComputePipeline(self._internal, descriptor)
         return GPUComputePipeline(label, id, self)
 
+    @with_struct_arena
     def create_compute_pipeline_async(
         self,
         *,
@@ -1964,6 +2074,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
         )
         return struct
 
+    @with_struct_arena
     def create_render_pipeline(
         self,
         *,
@@ -1984,6 +2095,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
         id = libf.wgpuDeviceCreateRenderPipeline(self._internal, descriptor)
         return GPURenderPipeline(label, id, self)
 
+    @with_struct_arena
     def create_render_pipeline_async(
         self,
         *,
@@ -2288,6 +2400,158 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
         )
         return c_depth_stencil_state
 
+    def _create_render_pass_descriptor(
+        self,
+        label,
+        color_attachments,
+        depth_stencil_attachment,
+        occlusion_query_set,
+        timestamp_writes,
+    ):
+        c_timestamp_writes_struct = ffi.NULL
+        if timestamp_writes is not None:
+            check_struct("RenderPassTimestampWrites", timestamp_writes)
+            # H: querySet: WGPUQuerySet, beginningOfPassWriteIndex: int, endOfPassWriteIndex: int
+            c_timestamp_writes_struct = new_struct_p(
+                "WGPURenderPassTimestampWrites *",
+                querySet=timestamp_writes["query_set"]._internal,
+                beginningOfPassWriteIndex=timestamp_writes.get(
+                    "beginning_of_pass_write_index", lib.WGPU_QUERY_SET_INDEX_UNDEFINED
+                ),
+                endOfPassWriteIndex=timestamp_writes.get(
+                    "end_of_pass_write_index", lib.WGPU_QUERY_SET_INDEX_UNDEFINED
+                ),
+            )
+
+        c_color_attachments_list = [
+            self._create_render_pass_color_attachment(color_attachment)
+            for color_attachment in color_attachments
+        ]
+        c_color_attachments_array = new_array(
+            "WGPURenderPassColorAttachment[]", c_color_attachments_list
+        )
+
+        c_depth_stencil_attachment = ffi.NULL
+        if depth_stencil_attachment is not None:
+            check_struct("RenderPassDepthStencilAttachment", depth_stencil_attachment)
+            c_depth_stencil_attachment = self._create_render_pass_stencil_attachment(
+                depth_stencil_attachment
+            )
+
+        c_occlusion_query_set = ffi.NULL
+        if occlusion_query_set is not None:
+            c_occlusion_query_set = occlusion_query_set._internal
+
+        # H: nextInChain: WGPUChainedStruct *, label: WGPUStringView, colorAttachmentCount: int, colorAttachments: WGPURenderPassColorAttachment *, depthStencilAttachment: WGPURenderPassDepthStencilAttachment *, occlusionQuerySet: WGPUQuerySet, timestampWrites: WGPURenderPassTimestampWrites *
+        struct = new_struct_p(
+            "WGPURenderPassDescriptor *",
+            # not used: nextInChain
+            label=to_c_string_view(label),
+            colorAttachments=c_color_attachments_array,
+            colorAttachmentCount=len(c_color_attachments_list),
+            depthStencilAttachment=c_depth_stencil_attachment,
+            timestampWrites=c_timestamp_writes_struct,
+            occlusionQuerySet=c_occlusion_query_set,
+        )
+        return struct
+
+    def _create_render_pass_color_attachment(self, color_attachment):
+        check_struct("RenderPassColorAttachment", color_attachment)
+        texture_view = color_attachment["view"]
+        if not isinstance(texture_view, GPUTextureView):
+            raise TypeError("Color attachment view must be a GPUTextureView.")
+        texture_view_id = texture_view._internal
+        c_resolve_target = (
+            ffi.NULL
+            if color_attachment.get("resolve_target", None) is None
+            else color_attachment["resolve_target"]._internal
+        )  # this is a TextureViewId or null
+        clear_value = color_attachment.get("clear_value", (0, 0, 0, 0))
+        if isinstance(clear_value, dict):
+            check_struct("Color", clear_value)
+            clear_value = _tuple_from_color(clear_value)
+        # H: r: float, g: float, b: float, a: float
+        c_clear_value = new_struct(
+            "WGPUColor",
+            r=clear_value[0],
+            g=clear_value[1],
+            b=clear_value[2],
+            a=clear_value[3],
+        )
+        # H: nextInChain: WGPUChainedStruct *, view: WGPUTextureView, depthSlice: int, resolveTarget: WGPUTextureView, loadOp: WGPULoadOp, storeOp: WGPUStoreOp, clearValue: WGPUColor
+        c_attachment = new_struct(
+            "WGPURenderPassColorAttachment",
+            # not used: nextInChain
+            view=texture_view_id,
+            resolveTarget=c_resolve_target,
+            loadOp=color_attachment["load_op"],
+            storeOp=color_attachment["store_op"],
+            clearValue=c_clear_value,
+            depthSlice=lib.WGPU_DEPTH_SLICE_UNDEFINED,  # not implemented yet
+            # not used: resolveTarget
+        )
+        return c_attachment
+
+    # Pulled out from _create_render_pass_descriptor because it was too large.
+    def _create_render_pass_stencil_attachment(self, ds_attachment):
+        view = ds_attachment["view"]
+        depth_read_only = stencil_read_only = False
+        depth_load_op = depth_store_op = stencil_load_op = stencil_store_op = 0
+        depth_clear_value = stencil_clear_value = 0
+        depth_keys_okay = stencil_keys_okay = False
+        # All depth texture formats have "depth" in their name.
+        if "depth" in view.texture.format:
+            depth_read_only = ds_attachment.get("depth_read_only", False)
+            if not depth_read_only:
+                depth_keys_okay = True
+                depth_load_op = ds_attachment["depth_load_op"]
+                depth_store_op = ds_attachment["depth_store_op"]
+                if depth_load_op == "clear":
+                    depth_clear_value = ds_attachment["depth_clear_value"]
+        # All stencil texture formats all have "stencil" in their name
+        if "stencil" in view.texture.format:
+            stencil_read_only = ds_attachment.get("stencil_read_only", False)
+            if not stencil_read_only:
+                stencil_keys_okay = True
+                stencil_load_op = ds_attachment["stencil_load_op"]
+                stencil_store_op = ds_attachment["stencil_store_op"]
+                # We only need this if load_op == "clear". It has a default value.
+                stencil_clear_value = ds_attachment.get("stencil_clear_value", 0)
+
+        # By the spec, we shouldn't allow "depth_load_op" or "depth_store_op"
+        # unless we have a non-read-only depth format. Likewise, "stencil_load_op"
+        # and "stencil_store_op" aren't allowed unless we have a non-read-only stencil
+        # format.
+        # But until now, they were required, even if not needed. So let's make it a
+        # warning for now, with the possibility of making it an error in the future.
+        unexpected_keys = [
+            *(("depth_load_op", "depth_store_op") if not depth_keys_okay else ()),
+            *(("stencil_load_op", "stencil_store_op") if not stencil_keys_okay else ()),
+        ]
+        for key in unexpected_keys:
+            if ds_attachment.get(key) is not None:
+                if not getattr(self, f"warned_about_{key}", False):
+                    from wgpu import logger
+
+                    logger.warning(f"Unexpected key {key} in depth_stencil_attachment")
+                    setattr(self, f"warned_about_{key}", True)
+
+        # H: view: WGPUTextureView, depthLoadOp: WGPULoadOp, depthStoreOp: WGPUStoreOp, depthClearValue: float, depthReadOnly: WGPUBool/int, stencilLoadOp: WGPULoadOp, stencilStoreOp: WGPUStoreOp, stencilClearValue: int, stencilReadOnly: WGPUBool/int
+        c_depth_stencil_attachment = new_struct_p(
+            "WGPURenderPassDepthStencilAttachment *",
+            view=view._internal,
+            depthLoadOp=depth_load_op,
+            depthStoreOp=depth_store_op,
+            depthClearValue=float(depth_clear_value),
+            depthReadOnly=depth_read_only,
+            stencilLoadOp=stencil_load_op,
+            stencilStoreOp=stencil_store_op,
+            stencilClearValue=int(stencil_clear_value),
+            stencilReadOnly=stencil_read_only,
+        )
+        return c_depth_stencil_attachment
+
+    @with_struct_arena
     def create_command_encoder(self, *, label: str = "") -> GPUCommandEncoder:
         # H: nextInChain: WGPUChainedStruct *, label: WGPUStringView
         struct = new_struct_p(
@@ -2300,6 +2564,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
         id = libf.wgpuDeviceCreateCommandEncoder(self._internal, struct)
         return GPUCommandEncoder(label, id, self)
 
+    @with_struct_arena
     def create_render_bundle_encoder(
         self,
         *,
@@ -2352,6 +2617,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
             label, lib.WGPUNativeQueryType_PipelineStatistics, count, values
         )
 
+    @with_struct_arena
     def _create_query_set(self, label, type, count, statistics):
         c_query_set_next_in_chain = ffi.NULL
         if statistics:
@@ -2398,6 +2664,7 @@ class GPUDevice(classes.GPUDevice, GPUObjectBase):
             libf.wgpuDeviceDestroy(internal)
 
     def _release(self):
+        self._set_poll_thread(False)
         if self._queue is not None:
             queue, self._queue = self._queue, None
             queue._release()
@@ -2454,6 +2721,20 @@ class GPUBuffer(classes.GPUBuffer, GPUObjectBase):
         offset: int = 0,
         size: int | None = None,
     ) -> GPUPromise[None]:
+        return self._map_async(mode, offset, size)
+
+    def _map_async(
+        self,
+        mode,
+        offset,
+        size,
+        title="buffer.map",
+        result_handler=None,
+        error_handler=None,
+    ) -> GPUPromise:
+        # The result_handler is called (without args) when the buffer is mapped,
+        # and its return value becomes the result of the promise. The
+        # error_handler is called (without args) when mapping fails.
         sync_on_read = True
 
         # Check mode
@@ -2469,7 +2750,7 @@ class GPUBuffer(classes.GPUBuffer, GPUObjectBase):
 
         # Can we even map?
         if self._map_state != enums.BufferMapState.unmapped:
-            promise = GPUPromise("buffer.map", None, loop=self._device._loop)
+            promise = GPUPromise(title, None, loop=self._device._loop)
             promise._wgpu_set_error(
                 RuntimeError(
                     f"Can only map a buffer if its currently unmapped, not {self._map_state!r}"
@@ -2491,6 +2772,9 @@ class GPUBuffer(classes.GPUBuffer, GPUObjectBase):
         def buffer_map_callback(status, c_message, _userdata1, _userdata2):
             if status != lib.WGPUMapAsyncStatus_Success:
                 msg = from_c_string_view(c_message)
+                self._map_state = enums.BufferMapState.unmapped
+                if error_handler is not None:
+                    error_handler()
                 promise._wgpu_set_error(
                     RuntimeError(f"Could not map buffer ({status} : {msg}).")
                 )
@@ -2511,9 +2795,11 @@ class GPUBuffer(classes.GPUBuffer, GPUObjectBase):
             self._map_state = enums.BufferMapState.mapped
             self._mapped_status = offset, offset + size, mode
             self._mapped_memoryviews = []
+            if result_handler is not None:
+                return result_handler()
 
         promise = GPUPromise(
-            "buffer.map",
+            title,
             handler,
             loop=self._device._loop,
             poller=self._device._poll,
@@ -2522,14 +2808,21 @@ class GPUBuffer(classes.GPUBuffer, GPUObjectBase):
 
         # Map it
         self._map_state = enums.BufferMapState.pending
-        # H: WGPUFuture f(WGPUBuffer buffer, WGPUMapMode mode, size_t offset, size_t size, WGPUBufferMapCallbackInfo callbackInfo)
-        libf.wgpuBufferMapAsync(
-            self._internal,
-            map_mode,
-            offset,
-            size,
-            buffer_map_callback_info,
-        )
+        try:
+            # H: WGPUFuture f(WGPUBuffer buffer, WGPUMapMode mode, size_t offset, size_t size, WGPUBufferMapCallbackInfo callbackInfo)
+            libf.wgpuBufferMapAsync(
+                self._internal,
+                map_mode,
+                offset,
+                size,
+                buffer_map_callback_info,
+            )
+        except Exception:
+            self._map_state = enums.BufferMapState.unmapped
+            if error_handler is not None:
+                error_handler()
+            raise
+        self._device._wake_poll_thread()
 
         return promise
 
@@ -2558,6 +2851,7 @@ class GPUBuffer(classes.GPUBuffer, GPUObjectBase):
         size: int | None = None,
         *,
         copy: bool = True,
+        out: ArrayLike | None = None,
     ) -> ArrayLike:
         # Can we even read?
         if self._map_state != enums.BufferMapState.mapped:
@@ -2574,10 +2868,21 @@ class GPUBuffer(classes.GPUBuffer, GPUObjectBase):
                 "The range for buffer reading is not contained in the currently mapped range."
             )
 
+        if out is not None:
+            if not copy:
+                raise ValueError("Cannot use out with copy=False.")
+            _, out_address = get_out_memoryview_and_address(out, size)
+
         # Get mapped memoryview.
         # H: void * f(WGPUBuffer buffer, size_t offset, size_t size)
         src_ptr = libf.wgpuBufferGetMappedRange(self._internal, offset, size)
         src_address = int(ffi.cast("intptr_t", src_ptr))
+
+        if out is not None:
+            # Copy the data straight into the given object
+            ffi.memmove(ffi.cast("uint8_t *", out_address), src_ptr, size)
+            return out
+
         src_m = get_memoryview_from_address(src_address, size)
 
         if copy:
@@ -2662,6 +2967,7 @@ class GPUTexture(classes.GPUTexture, GPUObjectBase):
     # GPUObjectBaseMixin
     _release_function = libf.wgpuTextureRelease
 
+    @with_struct_arena
     def create_view(
         self,
         *,
@@ -2854,14 +3160,17 @@ class GPUBindingCommandsMixin(classes.GPUBindingCommandsMixin):
                 + dynamic_offsets_data_length
             ]
 
-        offsets = list(dynamic_offsets_data)
-        c_offsets = ffi.new("uint32_t []", offsets)
+        if len(dynamic_offsets_data) == 0:
+            offset_count, c_offsets = 0, ffi.NULL
+        else:
+            offsets = list(dynamic_offsets_data)
+            offset_count, c_offsets = len(offsets), ffi.new("uint32_t []", offsets)
         self._maybe_keep_alive(bind_group)
         # H: void wgpuComputePassEncoderSetBindGroup(WGPUComputePassEncoder computePassEncoder, uint32_t groupIndex, WGPUBindGroup group, size_t dynamicOffsetCount, uint32_t const * dynamicOffsets)
         # H: void wgpuRenderPassEncoderSetBindGroup(WGPURenderPassEncoder renderPassEncoder, uint32_t groupIndex, WGPUBindGroup group, size_t dynamicOffsetCount, uint32_t const * dynamicOffsets)
         # H: void wgpuRenderBundleEncoderSetBindGroup(WGPURenderBundleEncoder renderBundleEncoder, uint32_t groupIndex, WGPUBindGroup group, size_t dynamicOffsetCount, uint32_t const * dynamicOffsets)
         function = type(self)._set_bind_group_function
-        function(self._internal, index, bind_group._internal, len(offsets), c_offsets)
+        function(self._internal, index, bind_group._internal, offset_count, c_offsets)
 
     ##
     # It is unfortunate that there is no common Mixin that includes just
@@ -3075,6 +3384,7 @@ class GPUCommandEncoder(
     # GPUObjectBaseMixin
     _release_function = libf.wgpuCommandEncoderRelease
 
+    @with_struct_arena
     def begin_compute_pass(
         self,
         *,
@@ -3107,6 +3417,7 @@ class GPUCommandEncoder(
         encoder = GPUComputePassEncoder(label, raw_encoder, self._device)
         return encoder
 
+    @with_struct_arena
     def begin_render_pass(
         self,
         *,
@@ -3118,50 +3429,12 @@ class GPUCommandEncoder(
         timestamp_writes: structs.RenderPassTimestampWritesStruct | None = None,
         max_draw_count: int = 50000000,
     ) -> GPURenderPassEncoder:
-        c_timestamp_writes_struct = ffi.NULL
-        if timestamp_writes is not None:
-            check_struct("RenderPassTimestampWrites", timestamp_writes)
-            # H: querySet: WGPUQuerySet, beginningOfPassWriteIndex: int, endOfPassWriteIndex: int
-            c_timestamp_writes_struct = new_struct_p(
-                "WGPURenderPassTimestampWrites *",
-                querySet=timestamp_writes["query_set"]._internal,
-                beginningOfPassWriteIndex=timestamp_writes.get(
-                    "beginning_of_pass_write_index", lib.WGPU_QUERY_SET_INDEX_UNDEFINED
-                ),
-                endOfPassWriteIndex=timestamp_writes.get(
-                    "end_of_pass_write_index", lib.WGPU_QUERY_SET_INDEX_UNDEFINED
-                ),
-            )
-
-        c_color_attachments_list = [
-            self._create_render_pass_color_attachment(color_attachment)
-            for color_attachment in color_attachments
-        ]
-        c_color_attachments_array = new_array(
-            "WGPURenderPassColorAttachment[]", c_color_attachments_list
-        )
-
-        c_depth_stencil_attachment = ffi.NULL
-        if depth_stencil_attachment is not None:
-            check_struct("RenderPassDepthStencilAttachment", depth_stencil_attachment)
-            c_depth_stencil_attachment = self._create_render_pass_stencil_attachment(
-                depth_stencil_attachment
-            )
-
-        c_occlusion_query_set = ffi.NULL
-        if occlusion_query_set is not None:
-            c_occlusion_query_set = occlusion_query_set._internal
-
-        # H: nextInChain: WGPUChainedStruct *, label: WGPUStringView, colorAttachmentCount: int, colorAttachments: WGPURenderPassColorAttachment *, depthStencilAttachment: WGPURenderPassDepthStencilAttachment *, occlusionQuerySet: WGPUQuerySet, timestampWrites: WGPURenderPassTimestampWrites *
-        struct = new_struct_p(
-            "WGPURenderPassDescriptor *",
-            # not used: nextInChain
-            label=to_c_string_view(label),
-            colorAttachments=c_color_attachments_array,
-            colorAttachmentCount=len(c_color_attachments_list),
-            depthStencilAttachment=c_depth_stencil_attachment,
-            timestampWrites=c_timestamp_writes_struct,
-            occlusionQuerySet=c_occlusion_query_set,
+        struct = self._device._create_render_pass_descriptor(
+            label,
+            color_attachments,
+            depth_stencil_attachment,
+            occlusion_query_set,
+            timestamp_writes,
         )
 
         # H: WGPURenderPassEncoder f(WGPUCommandEncoder commandEncoder, WGPURenderPassDescriptor const * descriptor)
@@ -3169,101 +3442,15 @@ class GPUCommandEncoder(
         encoder = GPURenderPassEncoder(label, raw_encoder, self._device)
         return encoder
 
-    def _create_render_pass_color_attachment(self, color_attachment):
-        check_struct("RenderPassColorAttachment", color_attachment)
-        texture_view = color_attachment["view"]
-        if not isinstance(texture_view, GPUTextureView):
-            raise TypeError("Color attachment view must be a GPUTextureView.")
-        texture_view_id = texture_view._internal
-        c_resolve_target = (
-            ffi.NULL
-            if color_attachment.get("resolve_target", None) is None
-            else color_attachment["resolve_target"]._internal
-        )  # this is a TextureViewId or null
-        clear_value = color_attachment.get("clear_value", (0, 0, 0, 0))
-        if isinstance(clear_value, dict):
-            check_struct("Color", clear_value)
-            clear_value = _tuple_from_color(clear_value)
-        # H: r: float, g: float, b: float, a: float
-        c_clear_value = new_struct(
-            "WGPUColor",
-            r=clear_value[0],
-            g=clear_value[1],
-            b=clear_value[2],
-            a=clear_value[3],
-        )
-        # H: nextInChain: WGPUChainedStruct *, view: WGPUTextureView, depthSlice: int, resolveTarget: WGPUTextureView, loadOp: WGPULoadOp, storeOp: WGPUStoreOp, clearValue: WGPUColor
-        c_attachment = new_struct(
-            "WGPURenderPassColorAttachment",
-            # not used: nextInChain
-            view=texture_view_id,
-            resolveTarget=c_resolve_target,
-            loadOp=color_attachment["load_op"],
-            storeOp=color_attachment["store_op"],
-            clearValue=c_clear_value,
-            depthSlice=lib.WGPU_DEPTH_SLICE_UNDEFINED,  # not implemented yet
-            # not used: resolveTarget
-        )
-        return c_attachment
-
-    # Pulled out from create_render_pass because it was too large.
-    def _create_render_pass_stencil_attachment(self, ds_attachment):
-        view = ds_attachment["view"]
-        depth_read_only = stencil_read_only = False
-        depth_load_op = depth_store_op = stencil_load_op = stencil_store_op = 0
-        depth_clear_value = stencil_clear_value = 0
-        depth_keys_okay = stencil_keys_okay = False
-        # All depth texture formats have "depth" in their name.
-        if "depth" in view.texture.format:
-            depth_read_only = ds_attachment.get("depth_read_only", False)
-            if not depth_read_only:
-                depth_keys_okay = True
-                depth_load_op = ds_attachment["depth_load_op"]
-                depth_store_op = ds_attachment["depth_store_op"]
-                if depth_load_op == "clear":
-                    depth_clear_value = ds_attachment["depth_clear_value"]
-        # All stencil texture formats all have "stencil" in their name
-        if "stencil" in view.texture.format:
-            stencil_read_only = ds_attachment.get("stencil_read_only", False)
-            if not stencil_read_only:
-                stencil_keys_okay = True
-                stencil_load_op = ds_attachment["stencil_load_op"]
-                stencil_store_op = ds_attachment["stencil_store_op"]
-                # We only need this if load_op == "clear". It has a default value.
-                stencil_clear_value = ds_attachment.get("stencil_clear_value", 0)
-
-        # By the spec, we shouldn't allow "depth_load_op" or "depth_store_op"
-        # unless we have a non-read-only depth format. Likewise, "stencil_load_op"
-        # and "stencil_store_op" aren't allowed unless we have a non-read-only stencil
-        # format.
-        # But until now, they were required, even if not needed. So let's make it a
-        # warning for now, with the possibility of making it an error in the future.
-        unexpected_keys = [
-            *(("depth_load_op", "depth_store_op") if not depth_keys_okay else ()),
-            *(("stencil_load_op", "stencil_store_op") if not stencil_keys_okay else ()),
-        ]
-        for key in unexpected_keys:
-            if ds_attachment.get(key) is not None:
-                if not getattr(self._device, f"warned_about_{key}", False):
-                    from wgpu import logger
-
-                    logger.warning(f"Unexpected key {key} in depth_stencil_attachment")
-                    setattr(self._device, f"warned_about_{key}", True)
-
-        # H: view: WGPUTextureView, depthLoadOp: WGPULoadOp, depthStoreOp: WGPUStoreOp, depthClearValue: float, depthReadOnly: WGPUBool/int, stencilLoadOp: WGPULoadOp, stencilStoreOp: WGPUStoreOp, stencilClearValue: int, stencilReadOnly: WGPUBool/int
-        c_depth_stencil_attachment = new_struct_p(
-            "WGPURenderPassDepthStencilAttachment *",
-            view=view._internal,
-            depthLoadOp=depth_load_op,
-            depthStoreOp=depth_store_op,
-            depthClearValue=float(depth_clear_value),
-            depthReadOnly=depth_read_only,
-            stencilLoadOp=stencil_load_op,
-            stencilStoreOp=stencil_store_op,
-            stencilClearValue=int(stencil_clear_value),
-            stencilReadOnly=stencil_read_only,
+    def _begin_prepared_render_pass(self, prepared):
+        if prepared._device is not self._device:
+            raise ValueError("The prepared render pass belongs to another device.")
+        # H: WGPURenderPassEncoder f(WGPUCommandEncoder commandEncoder, WGPURenderPassDescriptor const * descriptor)
+        raw_encoder = libf.wgpuCommandEncoderBeginRenderPass(
+            self._internal, prepared._struct
         )
-        return c_depth_stencil_attachment
+        encoder = GPURenderPassEncoder(prepared._label, raw_encoder, self._device)
+        return encoder
 
     def clear_buffer(
         self, buffer: GPUBuffer | None = None, offset: int = 0, size: int | None = None
@@ -3320,6 +3507,7 @@ class GPUCommandEncoder(
             int(size),
         )
 
+    @with_struct_arena
     def copy_buffer_to_texture(
         self,
         source: structs.TexelCopyBufferInfoStruct | None = None,
@@ -3386,6 +3574,7 @@ class GPUCommandEncoder(
             c_copy_size,
         )
 
+    @with_struct_arena
     def copy_texture_to_buffer(
         self,
         source: structs.TexelCopyTextureInfoStruct | None = None,
@@ -3452,6 +3641,7 @@ class GPUCommandEncoder(
             c_copy_size,
         )
 
+    @with_struct_arena
     def copy_texture_to_texture(
         self,
         source: structs.TexelCopyTextureInfoStruct | None = None,
@@ -3634,6 +3824,9 @@ class GPURenderPassEncoder(
     _draw_indexed_function = libf.wgpuRenderPassEncoderDrawIndexed
     _draw_indexed_indirect_function = libf.wgpuRenderPassEncoderDrawIndexedIndirect
 
+    # GPURenderPassEncoder
+    _set_scissor_rect_function = libf.wgpuRenderPassEncoderSetScissorRect
+
     # GPUObjectBaseMixin
     _release_function = libf.wgpuRenderPassEncoderRelease
 
@@ -3664,10 +3857,9 @@ class GPURenderPassEncoder(
         width: int | None = None,
         height: int | None = None,
     ) -> None:
-        # H: void f(WGPURenderPassEncoder renderPassEncoder, uint32_t x, uint32_t y, uint32_t width, uint32_t height)
-        libf.wgpuRenderPassEncoderSetScissorRect(
-            self._internal, int(x), int(y), int(width), int(height)
-        )
+        # H: void wgpuRenderPassEncoderSetScissorRect(WGPURenderPassEncoder renderPassEncoder, uint32_t x, uint32_t y, uint32_t width, uint32_t height)
+        function = type(self)._set_scissor_rect_function
+        function(self._internal, int(x), int(y), int(width), int(height))
 
     def set_blend_constant(
         self,
@@ -3804,15 +3996,98 @@ class GPURenderBundleEncoder(
         self._objects_to_keep_alive.add(object)
 
 
+# Queues by key, so the submission-done callback can find its queue
+_queues_by_key = WeakValueDictionary()
+_queue_keys = itertools.count(1)
+
+
+@ffi.callback("void(WGPUQueueWorkDoneStatus, void *, void *)")
+def _submission_done_callback(_status, userdata1, userdata2):
+    # Called when the work up to and including a submission is done (or will
+    # never be done, e.g. when the device is lost). Userdata1 is the key of
+    # the queue, and userdata2 the submission index.
+    queue = _queues_by_key.get(int(ffi.cast("uintptr_t", userdata1)), None)
+    if queue is not None:
+        queue._set_done_index(int(ffi.cast("uintptr_t", userdata2)))
+
+
 class GPUQueue(classes.GPUQueue, GPUObjectBase):
     # GPUObjectBaseMixin
     _release_function = libf.wgpuQueueRelease
 
-    def submit(self, command_buffers: Sequence[GPUCommandBuffer] | None = None) -> None:
+    _staging_pool = None
+
+    def __init__(self, label, internal, device):
+        super().__init__(label, internal, device)
+        # The highest submission index of which the work is known to be done,
+        # and the promises of GPUSubmission.wait_async() that wait for an index.
+        self._done_index = 0
+        self._submission_lock = threading.Lock()
+        self._submission_waiters = {}  # index -> list of promises
+        self._key = next(_queue_keys)
+        _queues_by_key[self._key] = self
+
+    def submit(
+        self, command_buffers: Sequence[GPUCommandBuffer] | None = None
+    ) -> GPUSubmission:
         command_buffer_ids = [cb._internal for cb in command_buffers]
         c_command_buffers = new_array("WGPUCommandBuffer[]", command_buffer_ids)
-        # H: void f(WGPUQueue queue, size_t commandCount, WGPUCommandBuffer const * commands)
-        libf.wgpuQueueSubmit(self._internal, len(command_buffer_ids), c_command_buffers)
+        # H: WGPUSubmissionIndex f(WGPUQueue queue, size_t commandCount, WGPUCommandBuffer const * commands)
+        index = libf.wgpuQueueSubmitForIndex(
+            self._internal, len(command_buffer_ids), c_command_buffers
+        )
+
+        # Get notified when the work of this submission is done. The callback
+        # is registered right after the submit, so it's called when this
+        # submission is done, regardless of the work that is submitted later.
+        # H: nextInChain: WGPUChainedStruct *, mode: WGPUCallbackMode, callback: WGPUQueueWorkDoneCallback, userdata1: void*, userdata2: void*
+        work_done_callback_info = new_struct(
+            "WGPUQueueWorkDoneCallbackInfo",
+            # not used: nextInChain
+            mode=lib.WGPUCallbackMode_AllowProcessEvents,
+            callback=_submission_done_callback,
+            userdata1=ffi.cast("void *", self._key),
+            userdata2=ffi.cast("void *", index),
+        )
+        # H: WGPUFuture f(WGPUQueue queue, WGPUQueueWorkDoneCallbackInfo callbackInfo)
+        libf.wgpuQueueOnSubmittedWorkDone(self._internal, work_done_callback_info)
+
+        return GPUSubmission(self, index)
+
+    def _set_done_index(self, index):
+        # The work of all submissions up to the given index is done
+        with self._submission_lock:
+            if index <= self._done_index:
+                return
+            self._done_index = index
+            done_indices = [i for i in self._submission_waiters if i <= index]
+            promises = []
+            for i in done_indices:
+                promises.extend(self._submission_waiters.pop(i))
+        for promise in promises:
+            promise._wgpu_set_input(None)
+
+    def _add_submission_waiter(self, index, promise):
+        # Resolve the promise when the given submission is done
+        with self._submission_lock:
+            if index > self._done_index:
+                self._submission_waiters.setdefault(index, []).append(promise)
+                return
+        promise._wgpu_set_input(None)
+
+    def _get_first_waited_index(self):
+        # Get the lowest submission index that a promise waits for, or None
+        with self._submission_lock:
+            return min(self._submission_waiters, default=None)
+
+    def _wait_for_index(self, index):
+        # Block until the work of the given submission is done
+        device = self._device
+        if index > self._done_index and device is not None and device._internal:
+            c_index = ffi.new("WGPUSubmissionIndex *", index)
+            # H: WGPUBool f(WGPUDevice device, WGPUBool wait, WGPUSubmissionIndex const * submissionIndex)
+            libf.wgpuDevicePoll(device._internal, True, c_index)
+        self._set_done_index(index)
 
     def write_buffer(
         self,
@@ -3854,11 +4129,26 @@ class GPUQueue(classes.GPUQueue, GPUObjectBase):
         )
 
     def read_buffer(
-        self, buffer: GPUBuffer, buffer_offset: int = 0, size: int | None = None
+        self,
+        buffer: GPUBuffer,
+        buffer_offset: int = 0,
+        size: int | None = None,
+        *,
+        out: ArrayLike | None = None,
     ) -> ArrayLike:
+        return self.read_buffer_async(buffer, buffer_offset, size, out=out).sync_wait()
+
+    def read_buffer_async(
+        self,
+        buffer: GPUBuffer,
+        buffer_offset: int = 0,
+        size: int | None = None,
+        *,
+        out: ArrayLike | None = None,
+    ) -> GPUPromise[ArrayLike]:
         # Note that write_buffer probably does a very similar thing
         # using a temporary buffer. But write_buffer is official API
-        # so it's a single call, while here we must create the temporary
+        # so it's a single call, while here we must use a staging
         # buffer and do the copying ourselves.
 
         if not size:
@@ -3869,27 +4159,62 @@ class GPUQueue(classes.GPUQueue, GPUObjectBase):
             raise ValueError("Invalid buffer_offset")
         if not (data_length <= buffer.size - buffer_offset):  # pragma: no cover
             raise ValueError("Invalid data_length")
+        if out is not None:
+            get_out_memoryview_and_address(out, data_length)  # check early
 
         device = buffer._device
+        staging_pool = self._get_staging_pool()
 
-        # Create temporary buffer
-        tmp_usage = flags.BufferUsage.COPY_DST | flags.BufferUsage.MAP_READ
-        tmp_buffer = device._create_buffer("", data_length, tmp_usage, False)
+        # Get a staging buffer, which may be larger than needed
+        tmp_buffer = staging_pool.acquire(data_length)
 
-        # Copy data to temp buffer
-        encoder = device.create_command_encoder()
-        encoder.copy_buffer_to_buffer(buffer, buffer_offset, tmp_buffer, 0, data_length)
-        command_buffer = encoder.finish()
-        self.submit([command_buffer])
+        def release():
+            if tmp_buffer.map_state == enums.BufferMapState.mapped:
+                tmp_buffer.unmap()
+            staging_pool.release(tmp_buffer)
 
-        # Download from mappable buffer
-        tmp_buffer.map_async("READ_NOSYNC").sync_wait()
-        data = tmp_buffer.read_mapped()
+        def discard():
+            # Mapping failed, so the buffer is not reused
+            staging_pool.discard(tmp_buffer)
 
-        # Explicit drop.
-        tmp_buffer.destroy()
+        # Copy data to the staging buffer
+        try:
+            encoder = device.create_command_encoder()
+            encoder.copy_buffer_to_buffer(
+                buffer, buffer_offset, tmp_buffer, 0, data_length
+            )
+            command_buffer = encoder.finish()
+            self.submit([command_buffer])
+        except Exception:
+            release()
+            raise
+
+        # Download from the mappable buffer, when it is mapped
+        def read_and_release():
+            try:
+                return tmp_buffer.read_mapped(0, data_length, out=out)
+            finally:
+                release()
+
+        return tmp_buffer._map_async(
+            "READ_NOSYNC",
+            0,
+            data_length,
+            "queue.read_buffer",
+            read_and_release,
+            discard,
+        )
 
-        return data
+    def _get_staging_pool(self):
+        if self._staging_pool is None:
+            usage = flags.BufferUsage.COPY_DST | flags.BufferUsage.MAP_READ
+            self._staging_pool = StagingBufferPool(
+                lambda size: self._device._create_buffer(
+                    "staging-buffer", size, usage, False
+                ),
+                self._device.limits["max-buffer-size"],
+            )
+        return self._staging_pool
 
     def write_texture(
         self,
@@ -3961,11 +4286,24 @@ class GPUQueue(classes.GPUQueue, GPUObjectBase):
             self._internal, c_destination, c_data, data_length, c_data_layout, c_size
         )
 
-    _shared_copy_buffer = None, 0
-
     def read_texture(
-        self, source: dict, data_layout: dict, size: tuple[int, int, int]
+        self,
+        source: dict,
+        data_layout: dict,
+        size: tuple[int, int, int],
+        *,
+        out: ArrayLike | None = None,
     ) -> ArrayLike:
+        return self.read_texture_async(source, data_layout, size, out=out).sync_wait()
+
+    def read_texture_async(
+        self,
+        source: dict,
+        data_layout: dict,
+        size: tuple[int, int, int],
+        *,
+        out: ArrayLike | None = None,
+    ) -> GPUPromise[ArrayLike]:
         # Note that the bytes_per_row restriction does not apply for
         # this function; we have to deal with it.
 
@@ -3980,29 +4318,28 @@ class GPUQueue(classes.GPUQueue, GPUObjectBase):
 
         size = _tuple_from_extent3d(size)
         data_length = full_stride * size[1] * size[2]
+        data_length2 = ori_stride * size[1] * size[2] + ori_offset
 
-        # Create temporary buffer
-        is_present_texture = source["texture"].label == "present"
-        copy_buffer = None
-        if is_present_texture:
-            copy_buffer, time_since_size_ok = self._shared_copy_buffer
-            if copy_buffer is None:
-                pass  # No buffer
-            elif copy_buffer.size < data_length:
-                copy_buffer = None  # Buffer too small
-            elif copy_buffer.size < data_length * 4:
-                self._shared_copy_buffer = copy_buffer, time.time()  # Bufer size ok
-            elif time.time() - time_since_size_ok > 5.0:
-                copy_buffer = None  # Too large too long
-        if copy_buffer is None:
-            buffer_size = data_length
-            buffer_size += (4096 - buffer_size % 4096) % 4096
-            buf_usage = flags.BufferUsage.COPY_DST | flags.BufferUsage.MAP_READ
-            copy_buffer = device._create_buffer(
-                "copy-buffer", buffer_size, buf_usage, False
-            )
-            if is_present_texture:
-                self._shared_copy_buffer = copy_buffer, time.time()
+        # Get the memory to copy the result into
+        if out is None:
+            data = memoryview(bytearray(data_length2)).cast("B")
+            out_address = get_memoryview_and_address(data)[1]
+        else:
+            data = out
+            out_address = get_out_memoryview_and_address(out, data_length2)[1]
+
+        # Get a staging buffer, which may be larger than needed
+        staging_pool = self._get_staging_pool()
+        copy_buffer = staging_pool.acquire(data_length)
+
+        def release():
+            if copy_buffer.map_state == enums.BufferMapState.mapped:
+                copy_buffer.unmap()
+            staging_pool.release(copy_buffer)
+
+        def discard():
+            # Mapping failed, so the buffer is not reused
+            staging_pool.discard(copy_buffer)
 
         destination = {
             "buffer": copy_buffer,
@@ -4012,52 +4349,65 @@ class GPUQueue(classes.GPUQueue, GPUObjectBase):
         }
 
         # Copy data to temp buffer
-        encoder = device.create_command_encoder()
-        encoder.copy_texture_to_buffer(source, destination, size)
-        command_buffer = encoder.finish()
-        self.submit([command_buffer])
-
-        promise = copy_buffer.map_async("READ_NOSYNC", 0, data_length)
+        try:
+            encoder = device.create_command_encoder()
+            encoder.copy_texture_to_buffer(source, destination, size)
+            command_buffer = encoder.finish()
+            self.submit([command_buffer])
+        except Exception:
+            release()
+            raise
+
+        # Download from the mappable buffer, when it is mapped
+        def read_and_release():
+            # Because we use `copy=False``, we *must* copy the data. We must
+            # also unmap it *after* we've copied the data, which release() does.
+            try:
+                mapped_data = copy_buffer.read_mapped(copy=False)
+                src_address = get_memoryview_and_address(mapped_data)[1]
+                dst_address = out_address + ori_offset
+
+                # Copy the data
+                if extra_stride:
+                    # Remove the extra stride from each row
+                    nrows = size[1] * size[2]
+                    copy_rows(
+                        dst_address,
+                        ori_stride,
+                        src_address,
+                        full_stride,
+                        ori_stride,
+                        nrows,
+                    )
+                else:
+                    # Copy as a whole
+                    ffi.memmove(
+                        ffi.cast("uint8_t *", dst_address),
+                        ffi.cast("uint8_t *", src_address),
+                        data_length2 - ori_offset,
+                    )
+            finally:
+                release()
+            return data
 
-        # Download from mappable buffer
-        # Because we use `copy=False``, we *must* copy the data.
-        if copy_buffer.map_state == "pending":
-            promise.sync_wait()
-        mapped_data = copy_buffer.read_mapped(copy=False)
+        return copy_buffer._map_async(
+            "READ_NOSYNC",
+            0,
+            data_length,
+            "queue.read_texture",
+            read_and_release,
+            discard,
+        )
 
-        data_length2 = ori_stride * size[1] * size[2] + ori_offset
+    def on_submitted_work_done_async(self) -> GPUPromise[None]:
+        def handler(_value):
+            return None
 
-        # Copy the data
-        if extra_stride or ori_offset:
-            # Copy per row
-            data = memoryview(bytearray(data_length2)).cast(mapped_data.format)
-            i_start = ori_offset
-            for i in range(size[1] * size[2]):
-                row = mapped_data[i * full_stride : i * full_stride + ori_stride]
-                data[i_start : i_start + ori_stride] = row
-                i_start += ori_stride
-        else:
-            # Copy as a whole
-            data = memoryview(bytearray(mapped_data)).cast(mapped_data.format)
-
-        # Alternative copy solution using Numpy.
-        # I expected this to be faster, but does not really seem to be. Seems not worth it
-        # since we technically don't depend on Numpy. Leaving here for reference.
-        # import numpy as np
-        # mapped_data = np.asarray(mapped_data)[:data_length]
-        # data = np.empty(data_length2, dtype=mapped_data.dtype)
-        # mapped_data.shape = -1, full_stride
-        # data.shape = -1, ori_stride
-        # data[:] = mapped_data[:, :ori_stride]
-        # data.shape = -1
-        # data = memoryview(data)
-
-        # Since we use read_mapped(copy=False), we must unmap it *after* we've copied the data.
-        copy_buffer.unmap()
-
-        return data
+        return self._on_submitted_work_done(
+            "on_submitted_work_done", handler, self._device._poll_wait
+        )
 
-    def on_submitted_work_done_async(self) -> GPUPromise[None]:
+    def _on_submitted_work_done(self, title, handler, poller):
         @ffi.callback("void(WGPUQueueWorkDoneStatus, void *, void *)")
         def work_done_callback(status, _userdata1, _userdata2):
             if status == lib.WGPUQueueWorkDoneStatus_Success:
@@ -4082,19 +4432,17 @@ class GPUQueue(classes.GPUQueue, GPUObjectBase):
             # not used: userdata2
         )
 
-        def handler(_value):
-            return None
-
         promise = GPUPromise(
-            "on_submitted_work_done",
+            title,
             handler,
             loop=self._device._loop,
-            poller=self._device._poll_wait,
+            poller=poller,
             keepalive=work_done_callback,
         )
 
         # H: WGPUFuture f(WGPUQueue queue, WGPUQueueWorkDoneCallbackInfo callbackInfo)
         libf.wgpuQueueOnSubmittedWorkDone(self._internal, work_done_callback_info)
+        self._device._wake_poll_thread()
 
         return promise
 
@@ -4104,6 +4452,35 @@ class GPURenderBundle(classes.GPURenderBundle, GPUObjectBase):
     _release_function = libf.wgpuRenderBundleRelease
 
 
+class GPUSubmission(classes.GPUSubmission):
+    def _wait(self):
+        # Block on the submission index, rather than polling with naps
+        if not self._done:
+            self._queue._wait_for_index(self._index)
+            self._done = True
+
+    def wait_async(self) -> GPUPromise[None]:
+        queue = self._queue
+        device = queue._device
+
+        def handler(_value):
+            self._done = True
+            return None
+
+        # The promise is resolved when the queue's done-index reaches this
+        # submission, which happens when the device is polled (by the loop,
+        # the poll thread, or the poller). The poller does not block.
+        promise = GPUPromise(
+            "submission.wait", handler, loop=device._loop, poller=device._poll
+        )
+        if self._done:
+            promise._wgpu_set_input(None)
+        else:
+            queue._add_submission_waiter(self._index, promise)
+            device._wake_poll_thread()
+        return promise
+
+
 class GPUQuerySet(classes.GPUQuerySet, GPUObjectBase):
     # GPUObjectBaseMixin
     _release_function = libf.wgpuQuerySetRelease
@@ -4189,3 +4566,10 @@ def _copy_docstrings():
 
 
 _copy_docstrings()
+
+# Let set_call_instrumentation() also swap the functions bound to the classes
+libf._find_class_functions(
+    ob
+    for ob in list(globals().values())
+    if isinstance(ob, type) and ob.__module__ == __name__
+)
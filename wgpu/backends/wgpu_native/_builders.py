@@ -0,0 +1,2153 @@
+"""Struct builders for the wgpu-native backend.
+
+Each builder sets the given fields on a freshly allocated struct. Fields
+that are None are left untouched (i.e. zero / null). Enum fields accept
+a str, which is resolved using a lookup table for that enum.
+"""
+
+# ruff: noqa: N802, N803, N816
+
+# THIS CODE IS AUTOGENERATED - DO NOT EDIT
+
+
+# There are 26 enum lookup tables
+
+enum_AddressMode = {
+    "clamp-to-edge": 1,
+    "repeat": 2,
+    "mirror-repeat": 3,
+}
+
+enum_BlendFactor = {
+    "zero": 1,
+    "one": 2,
+    "src": 3,
+    "one-minus-src": 4,
+    "src-alpha": 5,
+    "one-minus-src-alpha": 6,
+    "dst": 7,
+    "one-minus-dst": 8,
+    "dst-alpha": 9,
+    "one-minus-dst-alpha": 10,
+    "src-alpha-saturated": 11,
+    "constant": 12,
+    "one-minus-constant": 13,
+    "src1": 14,
+    "one-minus-src1": 15,
+    "src1-alpha": 16,
+    "one-minus-src1-alpha": 17,
+}
+
+enum_BlendOperation = {
+    "add": 1,
+    "subtract": 2,
+    "reverse-subtract": 3,
+    "min": 4,
+    "max": 5,
+}
+
+enum_BufferBindingType = {
+    "uniform": 2,
+    "storage": 3,
+    "read-only-storage": 4,
+}
+
+enum_CompareFunction = {
+    "never": 1,
+    "less": 2,
+    "equal": 3,
+    "less-equal": 4,
+    "greater": 5,
+    "not-equal": 6,
+    "greater-equal": 7,
+    "always": 8,
+}
+
+enum_CompilationMessageType = {
+    "error": 1,
+    "warning": 2,
+    "info": 3,
+}
+
+enum_CullMode = {
+    "none": 1,
+    "front": 2,
+    "back": 3,
+}
+
+enum_FilterMode = {
+    "nearest": 1,
+    "linear": 2,
+}
+
+enum_FrontFace = {
+    "ccw": 1,
+    "cw": 2,
+}
+
+enum_IndexFormat = {
+    "uint16": 1,
+    "uint32": 2,
+}
+
+enum_LoadOp = {
+    "load": 1,
+    "clear": 2,
+}
+
+enum_MipmapFilterMode = {
+    "nearest": 1,
+    "linear": 2,
+}
+
+enum_PowerPreference = {
+    "low-power": 1,
+    "high-performance": 2,
+}
+
+enum_PrimitiveTopology = {
+    "point-list": 1,
+    "line-list": 2,
+    "line-strip": 3,
+    "triangle-list": 4,
+    "triangle-strip": 5,
+}
+
+enum_QueryType = {
+    "occlusion": 1,
+    "timestamp": 2,
+}
+
+enum_SamplerBindingType = {
+    "filtering": 2,
+    "non-filtering": 3,
+    "comparison": 4,
+}
+
+enum_StencilOperation = {
+    "keep": 1,
+    "zero": 2,
+    "replace": 3,
+    "invert": 4,
+    "increment-clamp": 5,
+    "decrement-clamp": 6,
+    "increment-wrap": 7,
+    "decrement-wrap": 8,
+}
+
+enum_StorageTextureAccess = {
+    "write-only": 2,
+    "read-only": 3,
+    "read-write": 4,
+}
+
+enum_StoreOp = {
+    "store": 1,
+    "discard": 2,
+}
+
+enum_TextureAspect = {
+    "all": 1,
+    "stencil-only": 2,
+    "depth-only": 3,
+}
+
+enum_TextureDimension = {
+    "1d": 1,
+    "2d": 2,
+    "3d": 3,
+}
+
+enum_TextureFormat = {
+    "r8unorm": 1,
+    "r8snorm": 2,
+    "r8uint": 3,
+    "r8sint": 4,
+    "r16uint": 5,
+    "r16sint": 6,
+    "r16float": 7,
+    "rg8unorm": 8,
+    "rg8snorm": 9,
+    "rg8uint": 10,
+    "rg8sint": 11,
+    "r32uint": 13,
+    "r32sint": 14,
+    "r32float": 12,
+    "rg16uint": 15,
+    "rg16sint": 16,
+    "rg16float": 17,
+    "rgba8unorm": 18,
+    "rgba8unorm-srgb": 19,
+    "rgba8snorm": 20,
+    "rgba8uint": 21,
+    "rgba8sint": 22,
+    "bgra8unorm": 23,
+    "bgra8unorm-srgb": 24,
+    "rgb9e5ufloat": 28,
+    "rgb10a2uint": 25,
+    "rgb10a2unorm": 26,
+    "rg11b10ufloat": 27,
+    "rg32uint": 30,
+    "rg32sint": 31,
+    "rg32float": 29,
+    "rgba16uint": 32,
+    "rgba16sint": 33,
+    "rgba16float": 34,
+    "rgba32uint": 36,
+    "rgba32sint": 37,
+    "rgba32float": 35,
+    "stencil8": 38,
+    "depth16unorm": 39,
+    "depth24plus": 40,
+    "depth24plus-stencil8": 41,
+    "depth32float": 42,
+    "depth32float-stencil8": 43,
+    "bc1-rgba-unorm": 44,
+    "bc1-rgba-unorm-srgb": 45,
+    "bc2-rgba-unorm": 46,
+    "bc2-rgba-unorm-srgb": 47,
+    "bc3-rgba-unorm": 48,
+    "bc3-rgba-unorm-srgb": 49,
+    "bc4-r-unorm": 50,
+    "bc4-r-snorm": 51,
+    "bc5-rg-unorm": 52,
+    "bc5-rg-snorm": 53,
+    "bc6h-rgb-ufloat": 54,
+    "bc6h-rgb-float": 55,
+    "bc7-rgba-unorm": 56,
+    "bc7-rgba-unorm-srgb": 57,
+    "etc2-rgb8unorm": 58,
+    "etc2-rgb8unorm-srgb": 59,
+    "etc2-rgb8a1unorm": 60,
+    "etc2-rgb8a1unorm-srgb": 61,
+    "etc2-rgba8unorm": 62,
+    "etc2-rgba8unorm-srgb": 63,
+    "eac-r11unorm": 64,
+    "eac-r11snorm": 65,
+    "eac-rg11unorm": 66,
+    "eac-rg11snorm": 67,
+    "astc-4x4-unorm": 68,
+    "astc-4x4-unorm-srgb": 69,
+    "astc-5x4-unorm": 70,
+    "astc-5x4-unorm-srgb": 71,
+    "astc-5x5-unorm": 72,
+    "astc-5x5-unorm-srgb": 73,
+    "astc-6x5-unorm": 74,
+    "astc-6x5-unorm-srgb": 75,
+    "astc-6x6-unorm": 76,
+    "astc-6x6-unorm-srgb": 77,
+    "astc-8x5-unorm": 78,
+    "astc-8x5-unorm-srgb": 79,
+    "astc-8x6-unorm": 80,
+    "astc-8x6-unorm-srgb": 81,
+    "astc-8x8-unorm": 82,
+    "astc-8x8-unorm-srgb": 83,
+    "astc-10x5-unorm": 84,
+    "astc-10x5-unorm-srgb": 85,
+    "astc-10x6-unorm": 86,
+    "astc-10x6-unorm-srgb": 87,
+    "astc-10x8-unorm": 88,
+    "astc-10x8-unorm-srgb": 89,
+    "astc-10x10-unorm": 90,
+    "astc-10x10-unorm-srgb": 91,
+    "astc-12x10-unorm": 92,
+    "astc-12x10-unorm-srgb": 93,
+    "astc-12x12-unorm": 94,
+    "astc-12x12-unorm-srgb": 95,
+}
+
+enum_TextureSampleType = {
+    "float": 2,
+    "unfilterable-float": 3,
+    "depth": 4,
+    "sint": 5,
+    "uint": 6,
+}
+
+enum_TextureViewDimension = {
+    "1d": 1,
+    "2d": 2,
+    "2d-array": 3,
+    "cube": 4,
+    "cube-array": 5,
+    "3d": 6,
+}
+
+enum_VertexFormat = {
+    "uint8": 1,
+    "uint8x2": 2,
+    "uint8x4": 3,
+    "sint8": 4,
+    "sint8x2": 5,
+    "sint8x4": 6,
+    "unorm8": 7,
+    "unorm8x2": 8,
+    "unorm8x4": 9,
+    "snorm8": 10,
+    "snorm8x2": 11,
+    "snorm8x4": 12,
+    "uint16": 13,
+    "uint16x2": 14,
+    "uint16x4": 15,
+    "sint16": 16,
+    "sint16x2": 17,
+    "sint16x4": 18,
+    "unorm16": 19,
+    "unorm16x2": 20,
+    "unorm16x4": 21,
+    "snorm16": 22,
+    "snorm16x2": 23,
+    "snorm16x4": 24,
+    "float16": 25,
+    "float16x2": 26,
+    "float16x4": 27,
+    "float32": 28,
+    "float32x2": 29,
+    "float32x3": 30,
+    "float32x4": 31,
+    "uint32": 32,
+    "uint32x2": 33,
+    "uint32x3": 34,
+    "uint32x4": 35,
+    "sint32": 36,
+    "sint32x2": 37,
+    "sint32x3": 38,
+    "sint32x4": 39,
+    "unorm8x4-bgra": 41,
+}
+
+enum_VertexStepMode = {
+    "vertex": 2,
+    "instance": 3,
+}
+
+# There are 103 struct builders
+
+
+def build_WGPUAdapterInfo(
+    p,
+    nextInChain=None,
+    vendor=None,
+    architecture=None,
+    device=None,
+    description=None,
+    backendType=None,
+    adapterType=None,
+    vendorID=None,
+    deviceID=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if vendor is not None:
+        p.vendor = vendor
+    if architecture is not None:
+        p.architecture = architecture
+    if device is not None:
+        p.device = device
+    if description is not None:
+        p.description = description
+    if backendType is not None:
+        p.backendType = backendType
+    if adapterType is not None:
+        p.adapterType = adapterType
+    if vendorID is not None:
+        p.vendorID = vendorID
+    if deviceID is not None:
+        p.deviceID = deviceID
+
+
+def build_WGPUBindGroupDescriptor(
+    p, nextInChain=None, label=None, layout=None, entryCount=None, entries=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if layout is not None:
+        p.layout = layout
+    if entryCount is not None:
+        p.entryCount = entryCount
+    if entries is not None:
+        p.entries = entries
+
+
+def build_WGPUBindGroupEntry(
+    p,
+    nextInChain=None,
+    binding=None,
+    buffer=None,
+    offset=None,
+    size=None,
+    sampler=None,
+    textureView=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if binding is not None:
+        p.binding = binding
+    if buffer is not None:
+        p.buffer = buffer
+    if offset is not None:
+        p.offset = offset
+    if size is not None:
+        p.size = size
+    if sampler is not None:
+        p.sampler = sampler
+    if textureView is not None:
+        p.textureView = textureView
+
+
+def build_WGPUBindGroupEntryExtras(
+    p,
+    chain=None,
+    buffers=None,
+    bufferCount=None,
+    samplers=None,
+    samplerCount=None,
+    textureViews=None,
+    textureViewCount=None,
+):
+    if chain is not None:
+        p.chain = chain
+    if buffers is not None:
+        p.buffers = buffers
+    if bufferCount is not None:
+        p.bufferCount = bufferCount
+    if samplers is not None:
+        p.samplers = samplers
+    if samplerCount is not None:
+        p.samplerCount = samplerCount
+    if textureViews is not None:
+        p.textureViews = textureViews
+    if textureViewCount is not None:
+        p.textureViewCount = textureViewCount
+
+
+def build_WGPUBindGroupLayoutDescriptor(
+    p, nextInChain=None, label=None, entryCount=None, entries=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if entryCount is not None:
+        p.entryCount = entryCount
+    if entries is not None:
+        p.entries = entries
+
+
+def build_WGPUBindGroupLayoutEntry(
+    p,
+    nextInChain=None,
+    binding=None,
+    visibility=None,
+    buffer=None,
+    sampler=None,
+    texture=None,
+    storageTexture=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if binding is not None:
+        p.binding = binding
+    if visibility is not None:
+        p.visibility = visibility
+    if buffer is not None:
+        p.buffer = buffer
+    if sampler is not None:
+        p.sampler = sampler
+    if texture is not None:
+        p.texture = texture
+    if storageTexture is not None:
+        p.storageTexture = storageTexture
+
+
+def build_WGPUBindGroupLayoutEntryExtras(p, chain=None, count=None):
+    if chain is not None:
+        p.chain = chain
+    if count is not None:
+        p.count = count
+
+
+def build_WGPUBlendComponent(p, operation=None, srcFactor=None, dstFactor=None):
+    if operation is not None:
+        p.operation = (
+            enum_BlendOperation[operation] if isinstance(operation, str) else operation
+        )
+    if srcFactor is not None:
+        p.srcFactor = (
+            enum_BlendFactor[srcFactor] if isinstance(srcFactor, str) else srcFactor
+        )
+    if dstFactor is not None:
+        p.dstFactor = (
+            enum_BlendFactor[dstFactor] if isinstance(dstFactor, str) else dstFactor
+        )
+
+
+def build_WGPUBlendState(p, color=None, alpha=None):
+    if color is not None:
+        p.color = color
+    if alpha is not None:
+        p.alpha = alpha
+
+
+def build_WGPUBufferBindingLayout(
+    p, nextInChain=None, type=None, hasDynamicOffset=None, minBindingSize=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if type is not None:
+        p.type = enum_BufferBindingType[type] if isinstance(type, str) else type
+    if hasDynamicOffset is not None:
+        p.hasDynamicOffset = hasDynamicOffset
+    if minBindingSize is not None:
+        p.minBindingSize = minBindingSize
+
+
+def build_WGPUBufferDescriptor(
+    p, nextInChain=None, label=None, usage=None, size=None, mappedAtCreation=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if usage is not None:
+        p.usage = usage
+    if size is not None:
+        p.size = size
+    if mappedAtCreation is not None:
+        p.mappedAtCreation = mappedAtCreation
+
+
+def build_WGPUBufferMapCallbackInfo(
+    p, nextInChain=None, mode=None, callback=None, userdata1=None, userdata2=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if mode is not None:
+        p.mode = mode
+    if callback is not None:
+        p.callback = callback
+    if userdata1 is not None:
+        p.userdata1 = userdata1
+    if userdata2 is not None:
+        p.userdata2 = userdata2
+
+
+def build_WGPUChainedStruct(p, next=None, sType=None):
+    if next is not None:
+        p.next = next
+    if sType is not None:
+        p.sType = sType
+
+
+def build_WGPUChainedStructOut(p, next=None, sType=None):
+    if next is not None:
+        p.next = next
+    if sType is not None:
+        p.sType = sType
+
+
+def build_WGPUColor(p, r=None, g=None, b=None, a=None):
+    if r is not None:
+        p.r = r
+    if g is not None:
+        p.g = g
+    if b is not None:
+        p.b = b
+    if a is not None:
+        p.a = a
+
+
+def build_WGPUColorTargetState(
+    p, nextInChain=None, format=None, blend=None, writeMask=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if format is not None:
+        p.format = enum_TextureFormat[format] if isinstance(format, str) else format
+    if blend is not None:
+        p.blend = blend
+    if writeMask is not None:
+        p.writeMask = writeMask
+
+
+def build_WGPUCommandBufferDescriptor(p, nextInChain=None, label=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+
+
+def build_WGPUCommandEncoderDescriptor(p, nextInChain=None, label=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+
+
+def build_WGPUCompilationInfo(p, nextInChain=None, messageCount=None, messages=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if messageCount is not None:
+        p.messageCount = messageCount
+    if messages is not None:
+        p.messages = messages
+
+
+def build_WGPUCompilationInfoCallbackInfo(
+    p, nextInChain=None, mode=None, callback=None, userdata1=None, userdata2=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if mode is not None:
+        p.mode = mode
+    if callback is not None:
+        p.callback = callback
+    if userdata1 is not None:
+        p.userdata1 = userdata1
+    if userdata2 is not None:
+        p.userdata2 = userdata2
+
+
+def build_WGPUCompilationMessage(
+    p,
+    nextInChain=None,
+    message=None,
+    type=None,
+    lineNum=None,
+    linePos=None,
+    offset=None,
+    length=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if message is not None:
+        p.message = message
+    if type is not None:
+        p.type = enum_CompilationMessageType[type] if isinstance(type, str) else type
+    if lineNum is not None:
+        p.lineNum = lineNum
+    if linePos is not None:
+        p.linePos = linePos
+    if offset is not None:
+        p.offset = offset
+    if length is not None:
+        p.length = length
+
+
+def build_WGPUComputePassDescriptor(
+    p, nextInChain=None, label=None, timestampWrites=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if timestampWrites is not None:
+        p.timestampWrites = timestampWrites
+
+
+def build_WGPUComputePassTimestampWrites(
+    p, querySet=None, beginningOfPassWriteIndex=None, endOfPassWriteIndex=None
+):
+    if querySet is not None:
+        p.querySet = querySet
+    if beginningOfPassWriteIndex is not None:
+        p.beginningOfPassWriteIndex = beginningOfPassWriteIndex
+    if endOfPassWriteIndex is not None:
+        p.endOfPassWriteIndex = endOfPassWriteIndex
+
+
+def build_WGPUComputePipelineDescriptor(
+    p, nextInChain=None, label=None, layout=None, compute=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if layout is not None:
+        p.layout = layout
+    if compute is not None:
+        p.compute = compute
+
+
+def build_WGPUConstantEntry(p, nextInChain=None, key=None, value=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if key is not None:
+        p.key = key
+    if value is not None:
+        p.value = value
+
+
+def build_WGPUCreateComputePipelineAsyncCallbackInfo(
+    p, nextInChain=None, mode=None, callback=None, userdata1=None, userdata2=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if mode is not None:
+        p.mode = mode
+    if callback is not None:
+        p.callback = callback
+    if userdata1 is not None:
+        p.userdata1 = userdata1
+    if userdata2 is not None:
+        p.userdata2 = userdata2
+
+
+def build_WGPUCreateRenderPipelineAsyncCallbackInfo(
+    p, nextInChain=None, mode=None, callback=None, userdata1=None, userdata2=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if mode is not None:
+        p.mode = mode
+    if callback is not None:
+        p.callback = callback
+    if userdata1 is not None:
+        p.userdata1 = userdata1
+    if userdata2 is not None:
+        p.userdata2 = userdata2
+
+
+def build_WGPUDepthStencilState(
+    p,
+    nextInChain=None,
+    format=None,
+    depthWriteEnabled=None,
+    depthCompare=None,
+    stencilFront=None,
+    stencilBack=None,
+    stencilReadMask=None,
+    stencilWriteMask=None,
+    depthBias=None,
+    depthBiasSlopeScale=None,
+    depthBiasClamp=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if format is not None:
+        p.format = enum_TextureFormat[format] if isinstance(format, str) else format
+    if depthWriteEnabled is not None:
+        p.depthWriteEnabled = depthWriteEnabled
+    if depthCompare is not None:
+        p.depthCompare = (
+            enum_CompareFunction[depthCompare]
+            if isinstance(depthCompare, str)
+            else depthCompare
+        )
+    if stencilFront is not None:
+        p.stencilFront = stencilFront
+    if stencilBack is not None:
+        p.stencilBack = stencilBack
+    if stencilReadMask is not None:
+        p.stencilReadMask = stencilReadMask
+    if stencilWriteMask is not None:
+        p.stencilWriteMask = stencilWriteMask
+    if depthBias is not None:
+        p.depthBias = depthBias
+    if depthBiasSlopeScale is not None:
+        p.depthBiasSlopeScale = depthBiasSlopeScale
+    if depthBiasClamp is not None:
+        p.depthBiasClamp = depthBiasClamp
+
+
+def build_WGPUDeviceDescriptor(
+    p,
+    nextInChain=None,
+    label=None,
+    requiredFeatureCount=None,
+    requiredFeatures=None,
+    requiredLimits=None,
+    defaultQueue=None,
+    deviceLostCallbackInfo=None,
+    uncapturedErrorCallbackInfo=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if requiredFeatureCount is not None:
+        p.requiredFeatureCount = requiredFeatureCount
+    if requiredFeatures is not None:
+        p.requiredFeatures = requiredFeatures
+    if requiredLimits is not None:
+        p.requiredLimits = requiredLimits
+    if defaultQueue is not None:
+        p.defaultQueue = defaultQueue
+    if deviceLostCallbackInfo is not None:
+        p.deviceLostCallbackInfo = deviceLostCallbackInfo
+    if uncapturedErrorCallbackInfo is not None:
+        p.uncapturedErrorCallbackInfo = uncapturedErrorCallbackInfo
+
+
+def build_WGPUDeviceExtras(p, chain=None, tracePath=None):
+    if chain is not None:
+        p.chain = chain
+    if tracePath is not None:
+        p.tracePath = tracePath
+
+
+def build_WGPUDeviceLostCallbackInfo(
+    p, nextInChain=None, mode=None, callback=None, userdata1=None, userdata2=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if mode is not None:
+        p.mode = mode
+    if callback is not None:
+        p.callback = callback
+    if userdata1 is not None:
+        p.userdata1 = userdata1
+    if userdata2 is not None:
+        p.userdata2 = userdata2
+
+
+def build_WGPUExtent3D(p, width=None, height=None, depthOrArrayLayers=None):
+    if width is not None:
+        p.width = width
+    if height is not None:
+        p.height = height
+    if depthOrArrayLayers is not None:
+        p.depthOrArrayLayers = depthOrArrayLayers
+
+
+def build_WGPUFragmentState(
+    p,
+    nextInChain=None,
+    module=None,
+    entryPoint=None,
+    constantCount=None,
+    constants=None,
+    targetCount=None,
+    targets=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if module is not None:
+        p.module = module
+    if entryPoint is not None:
+        p.entryPoint = entryPoint
+    if constantCount is not None:
+        p.constantCount = constantCount
+    if constants is not None:
+        p.constants = constants
+    if targetCount is not None:
+        p.targetCount = targetCount
+    if targets is not None:
+        p.targets = targets
+
+
+def build_WGPUFuture(p, id=None):
+    if id is not None:
+        p.id = id
+
+
+def build_WGPUFutureWaitInfo(p, future=None, completed=None):
+    if future is not None:
+        p.future = future
+    if completed is not None:
+        p.completed = completed
+
+
+def build_WGPUGlobalReport(p, surfaces=None, hub=None):
+    if surfaces is not None:
+        p.surfaces = surfaces
+    if hub is not None:
+        p.hub = hub
+
+
+def build_WGPUHubReport(
+    p,
+    adapters=None,
+    devices=None,
+    queues=None,
+    pipelineLayouts=None,
+    shaderModules=None,
+    bindGroupLayouts=None,
+    bindGroups=None,
+    commandBuffers=None,
+    renderBundles=None,
+    renderPipelines=None,
+    computePipelines=None,
+    pipelineCaches=None,
+    querySets=None,
+    buffers=None,
+    textures=None,
+    textureViews=None,
+    samplers=None,
+):
+    if adapters is not None:
+        p.adapters = adapters
+    if devices is not None:
+        p.devices = devices
+    if queues is not None:
+        p.queues = queues
+    if pipelineLayouts is not None:
+        p.pipelineLayouts = pipelineLayouts
+    if shaderModules is not None:
+        p.shaderModules = shaderModules
+    if bindGroupLayouts is not None:
+        p.bindGroupLayouts = bindGroupLayouts
+    if bindGroups is not None:
+        p.bindGroups = bindGroups
+    if commandBuffers is not None:
+        p.commandBuffers = commandBuffers
+    if renderBundles is not None:
+        p.renderBundles = renderBundles
+    if renderPipelines is not None:
+        p.renderPipelines = renderPipelines
+    if computePipelines is not None:
+        p.computePipelines = computePipelines
+    if pipelineCaches is not None:
+        p.pipelineCaches = pipelineCaches
+    if querySets is not None:
+        p.querySets = querySets
+    if buffers is not None:
+        p.buffers = buffers
+    if textures is not None:
+        p.textures = textures
+    if textureViews is not None:
+        p.textureViews = textureViews
+    if samplers is not None:
+        p.samplers = samplers
+
+
+def build_WGPUInstanceCapabilities(
+    p, nextInChain=None, timedWaitAnyEnable=None, timedWaitAnyMaxCount=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if timedWaitAnyEnable is not None:
+        p.timedWaitAnyEnable = timedWaitAnyEnable
+    if timedWaitAnyMaxCount is not None:
+        p.timedWaitAnyMaxCount = timedWaitAnyMaxCount
+
+
+def build_WGPUInstanceDescriptor(p, nextInChain=None, features=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if features is not None:
+        p.features = features
+
+
+def build_WGPUInstanceEnumerateAdapterOptions(p, nextInChain=None, backends=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if backends is not None:
+        p.backends = backends
+
+
+def build_WGPUInstanceExtras(
+    p,
+    chain=None,
+    backends=None,
+    flags=None,
+    dx12ShaderCompiler=None,
+    gles3MinorVersion=None,
+    glFenceBehaviour=None,
+    dxcPath=None,
+    dxcMaxShaderModel=None,
+    budgetForDeviceCreation=None,
+    budgetForDeviceLoss=None,
+):
+    if chain is not None:
+        p.chain = chain
+    if backends is not None:
+        p.backends = backends
+    if flags is not None:
+        p.flags = flags
+    if dx12ShaderCompiler is not None:
+        p.dx12ShaderCompiler = dx12ShaderCompiler
+    if gles3MinorVersion is not None:
+        p.gles3MinorVersion = gles3MinorVersion
+    if glFenceBehaviour is not None:
+        p.glFenceBehaviour = glFenceBehaviour
+    if dxcPath is not None:
+        p.dxcPath = dxcPath
+    if dxcMaxShaderModel is not None:
+        p.dxcMaxShaderModel = dxcMaxShaderModel
+    if budgetForDeviceCreation is not None:
+        p.budgetForDeviceCreation = budgetForDeviceCreation
+    if budgetForDeviceLoss is not None:
+        p.budgetForDeviceLoss = budgetForDeviceLoss
+
+
+def build_WGPULimits(
+    p,
+    nextInChain=None,
+    maxTextureDimension1D=None,
+    maxTextureDimension2D=None,
+    maxTextureDimension3D=None,
+    maxTextureArrayLayers=None,
+    maxBindGroups=None,
+    maxBindGroupsPlusVertexBuffers=None,
+    maxBindingsPerBindGroup=None,
+    maxDynamicUniformBuffersPerPipelineLayout=None,
+    maxDynamicStorageBuffersPerPipelineLayout=None,
+    maxSampledTexturesPerShaderStage=None,
+    maxSamplersPerShaderStage=None,
+    maxStorageBuffersPerShaderStage=None,
+    maxStorageTexturesPerShaderStage=None,
+    maxUniformBuffersPerShaderStage=None,
+    maxUniformBufferBindingSize=None,
+    maxStorageBufferBindingSize=None,
+    minUniformBufferOffsetAlignment=None,
+    minStorageBufferOffsetAlignment=None,
+    maxVertexBuffers=None,
+    maxBufferSize=None,
+    maxVertexAttributes=None,
+    maxVertexBufferArrayStride=None,
+    maxInterStageShaderVariables=None,
+    maxColorAttachments=None,
+    maxColorAttachmentBytesPerSample=None,
+    maxComputeWorkgroupStorageSize=None,
+    maxComputeInvocationsPerWorkgroup=None,
+    maxComputeWorkgroupSizeX=None,
+    maxComputeWorkgroupSizeY=None,
+    maxComputeWorkgroupSizeZ=None,
+    maxComputeWorkgroupsPerDimension=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if maxTextureDimension1D is not None:
+        p.maxTextureDimension1D = maxTextureDimension1D
+    if maxTextureDimension2D is not None:
+        p.maxTextureDimension2D = maxTextureDimension2D
+    if maxTextureDimension3D is not None:
+        p.maxTextureDimension3D = maxTextureDimension3D
+    if maxTextureArrayLayers is not None:
+        p.maxTextureArrayLayers = maxTextureArrayLayers
+    if maxBindGroups is not None:
+        p.maxBindGroups = maxBindGroups
+    if maxBindGroupsPlusVertexBuffers is not None:
+        p.maxBindGroupsPlusVertexBuffers = maxBindGroupsPlusVertexBuffers
+    if maxBindingsPerBindGroup is not None:
+        p.maxBindingsPerBindGroup = maxBindingsPerBindGroup
+    if maxDynamicUniformBuffersPerPipelineLayout is not None:
+        p.maxDynamicUniformBuffersPerPipelineLayout = (
+            maxDynamicUniformBuffersPerPipelineLayout
+        )
+    if maxDynamicStorageBuffersPerPipelineLayout is not None:
+        p.maxDynamicStorageBuffersPerPipelineLayout = (
+            maxDynamicStorageBuffersPerPipelineLayout
+        )
+    if maxSampledTexturesPerShaderStage is not None:
+        p.maxSampledTexturesPerShaderStage = maxSampledTexturesPerShaderStage
+    if maxSamplersPerShaderStage is not None:
+        p.maxSamplersPerShaderStage = maxSamplersPerShaderStage
+    if maxStorageBuffersPerShaderStage is not None:
+        p.maxStorageBuffersPerShaderStage = maxStorageBuffersPerShaderStage
+    if maxStorageTexturesPerShaderStage is not None:
+        p.maxStorageTexturesPerShaderStage = maxStorageTexturesPerShaderStage
+    if maxUniformBuffersPerShaderStage is not None:
+        p.maxUniformBuffersPerShaderStage = maxUniformBuffersPerShaderStage
+    if maxUniformBufferBindingSize is not None:
+        p.maxUniformBufferBindingSize = maxUniformBufferBindingSize
+    if maxStorageBufferBindingSize is not None:
+        p.maxStorageBufferBindingSize = maxStorageBufferBindingSize
+    if minUniformBufferOffsetAlignment is not None:
+        p.minUniformBufferOffsetAlignment = minUniformBufferOffsetAlignment
+    if minStorageBufferOffsetAlignment is not None:
+        p.minStorageBufferOffsetAlignment = minStorageBufferOffsetAlignment
+    if maxVertexBuffers is not None:
+        p.maxVertexBuffers = maxVertexBuffers
+    if maxBufferSize is not None:
+        p.maxBufferSize = maxBufferSize
+    if maxVertexAttributes is not None:
+        p.maxVertexAttributes = maxVertexAttributes
+    if maxVertexBufferArrayStride is not None:
+        p.maxVertexBufferArrayStride = maxVertexBufferArrayStride
+    if maxInterStageShaderVariables is not None:
+        p.maxInterStageShaderVariables = maxInterStageShaderVariables
+    if maxColorAttachments is not None:
+        p.maxColorAttachments = maxColorAttachments
+    if maxColorAttachmentBytesPerSample is not None:
+        p.maxColorAttachmentBytesPerSample = maxColorAttachmentBytesPerSample
+    if maxComputeWorkgroupStorageSize is not None:
+        p.maxComputeWorkgroupStorageSize = maxComputeWorkgroupStorageSize
+    if maxComputeInvocationsPerWorkgroup is not None:
+        p.maxComputeInvocationsPerWorkgroup = maxComputeInvocationsPerWorkgroup
+    if maxComputeWorkgroupSizeX is not None:
+        p.maxComputeWorkgroupSizeX = maxComputeWorkgroupSizeX
+    if maxComputeWorkgroupSizeY is not None:
+        p.maxComputeWorkgroupSizeY = maxComputeWorkgroupSizeY
+    if maxComputeWorkgroupSizeZ is not None:
+        p.maxComputeWorkgroupSizeZ = maxComputeWorkgroupSizeZ
+    if maxComputeWorkgroupsPerDimension is not None:
+        p.maxComputeWorkgroupsPerDimension = maxComputeWorkgroupsPerDimension
+
+
+def build_WGPUMultisampleState(
+    p, nextInChain=None, count=None, mask=None, alphaToCoverageEnabled=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if count is not None:
+        p.count = count
+    if mask is not None:
+        p.mask = mask
+    if alphaToCoverageEnabled is not None:
+        p.alphaToCoverageEnabled = alphaToCoverageEnabled
+
+
+def build_WGPUNativeLimits(
+    p, chain=None, maxPushConstantSize=None, maxNonSamplerBindings=None
+):
+    if chain is not None:
+        p.chain = chain
+    if maxPushConstantSize is not None:
+        p.maxPushConstantSize = maxPushConstantSize
+    if maxNonSamplerBindings is not None:
+        p.maxNonSamplerBindings = maxNonSamplerBindings
+
+
+def build_WGPUOrigin3D(p, x=None, y=None, z=None):
+    if x is not None:
+        p.x = x
+    if y is not None:
+        p.y = y
+    if z is not None:
+        p.z = z
+
+
+def build_WGPUPipelineLayoutDescriptor(
+    p, nextInChain=None, label=None, bindGroupLayoutCount=None, bindGroupLayouts=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if bindGroupLayoutCount is not None:
+        p.bindGroupLayoutCount = bindGroupLayoutCount
+    if bindGroupLayouts is not None:
+        p.bindGroupLayouts = bindGroupLayouts
+
+
+def build_WGPUPipelineLayoutExtras(
+    p, chain=None, pushConstantRangeCount=None, pushConstantRanges=None
+):
+    if chain is not None:
+        p.chain = chain
+    if pushConstantRangeCount is not None:
+        p.pushConstantRangeCount = pushConstantRangeCount
+    if pushConstantRanges is not None:
+        p.pushConstantRanges = pushConstantRanges
+
+
+def build_WGPUPopErrorScopeCallbackInfo(
+    p, nextInChain=None, mode=None, callback=None, userdata1=None, userdata2=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if mode is not None:
+        p.mode = mode
+    if callback is not None:
+        p.callback = callback
+    if userdata1 is not None:
+        p.userdata1 = userdata1
+    if userdata2 is not None:
+        p.userdata2 = userdata2
+
+
+def build_WGPUPrimitiveState(
+    p,
+    nextInChain=None,
+    topology=None,
+    stripIndexFormat=None,
+    frontFace=None,
+    cullMode=None,
+    unclippedDepth=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if topology is not None:
+        p.topology = (
+            enum_PrimitiveTopology[topology] if isinstance(topology, str) else topology
+        )
+    if stripIndexFormat is not None:
+        p.stripIndexFormat = (
+            enum_IndexFormat[stripIndexFormat]
+            if isinstance(stripIndexFormat, str)
+            else stripIndexFormat
+        )
+    if frontFace is not None:
+        p.frontFace = (
+            enum_FrontFace[frontFace] if isinstance(frontFace, str) else frontFace
+        )
+    if cullMode is not None:
+        p.cullMode = enum_CullMode[cullMode] if isinstance(cullMode, str) else cullMode
+    if unclippedDepth is not None:
+        p.unclippedDepth = unclippedDepth
+
+
+def build_WGPUPrimitiveStateExtras(p, chain=None, polygonMode=None, conservative=None):
+    if chain is not None:
+        p.chain = chain
+    if polygonMode is not None:
+        p.polygonMode = polygonMode
+    if conservative is not None:
+        p.conservative = conservative
+
+
+def build_WGPUProgrammableStageDescriptor(
+    p,
+    nextInChain=None,
+    module=None,
+    entryPoint=None,
+    constantCount=None,
+    constants=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if module is not None:
+        p.module = module
+    if entryPoint is not None:
+        p.entryPoint = entryPoint
+    if constantCount is not None:
+        p.constantCount = constantCount
+    if constants is not None:
+        p.constants = constants
+
+
+def build_WGPUPushConstantRange(p, stages=None, start=None, end=None):
+    if stages is not None:
+        p.stages = stages
+    if start is not None:
+        p.start = start
+    if end is not None:
+        p.end = end
+
+
+def build_WGPUQuerySetDescriptor(
+    p, nextInChain=None, label=None, type=None, count=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if type is not None:
+        p.type = enum_QueryType[type] if isinstance(type, str) else type
+    if count is not None:
+        p.count = count
+
+
+def build_WGPUQuerySetDescriptorExtras(
+    p, chain=None, pipelineStatistics=None, pipelineStatisticCount=None
+):
+    if chain is not None:
+        p.chain = chain
+    if pipelineStatistics is not None:
+        p.pipelineStatistics = pipelineStatistics
+    if pipelineStatisticCount is not None:
+        p.pipelineStatisticCount = pipelineStatisticCount
+
+
+def build_WGPUQueueDescriptor(p, nextInChain=None, label=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+
+
+def build_WGPUQueueWorkDoneCallbackInfo(
+    p, nextInChain=None, mode=None, callback=None, userdata1=None, userdata2=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if mode is not None:
+        p.mode = mode
+    if callback is not None:
+        p.callback = callback
+    if userdata1 is not None:
+        p.userdata1 = userdata1
+    if userdata2 is not None:
+        p.userdata2 = userdata2
+
+
+def build_WGPURegistryReport(
+    p,
+    numAllocated=None,
+    numKeptFromUser=None,
+    numReleasedFromUser=None,
+    elementSize=None,
+):
+    if numAllocated is not None:
+        p.numAllocated = numAllocated
+    if numKeptFromUser is not None:
+        p.numKeptFromUser = numKeptFromUser
+    if numReleasedFromUser is not None:
+        p.numReleasedFromUser = numReleasedFromUser
+    if elementSize is not None:
+        p.elementSize = elementSize
+
+
+def build_WGPURenderBundleDescriptor(p, nextInChain=None, label=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+
+
+def build_WGPURenderBundleEncoderDescriptor(
+    p,
+    nextInChain=None,
+    label=None,
+    colorFormatCount=None,
+    colorFormats=None,
+    depthStencilFormat=None,
+    sampleCount=None,
+    depthReadOnly=None,
+    stencilReadOnly=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if colorFormatCount is not None:
+        p.colorFormatCount = colorFormatCount
+    if colorFormats is not None:
+        p.colorFormats = colorFormats
+    if depthStencilFormat is not None:
+        p.depthStencilFormat = (
+            enum_TextureFormat[depthStencilFormat]
+            if isinstance(depthStencilFormat, str)
+            else depthStencilFormat
+        )
+    if sampleCount is not None:
+        p.sampleCount = sampleCount
+    if depthReadOnly is not None:
+        p.depthReadOnly = depthReadOnly
+    if stencilReadOnly is not None:
+        p.stencilReadOnly = stencilReadOnly
+
+
+def build_WGPURenderPassColorAttachment(
+    p,
+    nextInChain=None,
+    view=None,
+    depthSlice=None,
+    resolveTarget=None,
+    loadOp=None,
+    storeOp=None,
+    clearValue=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if view is not None:
+        p.view = view
+    if depthSlice is not None:
+        p.depthSlice = depthSlice
+    if resolveTarget is not None:
+        p.resolveTarget = resolveTarget
+    if loadOp is not None:
+        p.loadOp = enum_LoadOp[loadOp] if isinstance(loadOp, str) else loadOp
+    if storeOp is not None:
+        p.storeOp = enum_StoreOp[storeOp] if isinstance(storeOp, str) else storeOp
+    if clearValue is not None:
+        p.clearValue = clearValue
+
+
+def build_WGPURenderPassDepthStencilAttachment(
+    p,
+    view=None,
+    depthLoadOp=None,
+    depthStoreOp=None,
+    depthClearValue=None,
+    depthReadOnly=None,
+    stencilLoadOp=None,
+    stencilStoreOp=None,
+    stencilClearValue=None,
+    stencilReadOnly=None,
+):
+    if view is not None:
+        p.view = view
+    if depthLoadOp is not None:
+        p.depthLoadOp = (
+            enum_LoadOp[depthLoadOp] if isinstance(depthLoadOp, str) else depthLoadOp
+        )
+    if depthStoreOp is not None:
+        p.depthStoreOp = (
+            enum_StoreOp[depthStoreOp]
+            if isinstance(depthStoreOp, str)
+            else depthStoreOp
+        )
+    if depthClearValue is not None:
+        p.depthClearValue = depthClearValue
+    if depthReadOnly is not None:
+        p.depthReadOnly = depthReadOnly
+    if stencilLoadOp is not None:
+        p.stencilLoadOp = (
+            enum_LoadOp[stencilLoadOp]
+            if isinstance(stencilLoadOp, str)
+            else stencilLoadOp
+        )
+    if stencilStoreOp is not None:
+        p.stencilStoreOp = (
+            enum_StoreOp[stencilStoreOp]
+            if isinstance(stencilStoreOp, str)
+            else stencilStoreOp
+        )
+    if stencilClearValue is not None:
+        p.stencilClearValue = stencilClearValue
+    if stencilReadOnly is not None:
+        p.stencilReadOnly = stencilReadOnly
+
+
+def build_WGPURenderPassDescriptor(
+    p,
+    nextInChain=None,
+    label=None,
+    colorAttachmentCount=None,
+    colorAttachments=None,
+    depthStencilAttachment=None,
+    occlusionQuerySet=None,
+    timestampWrites=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if colorAttachmentCount is not None:
+        p.colorAttachmentCount = colorAttachmentCount
+    if colorAttachments is not None:
+        p.colorAttachments = colorAttachments
+    if depthStencilAttachment is not None:
+        p.depthStencilAttachment = depthStencilAttachment
+    if occlusionQuerySet is not None:
+        p.occlusionQuerySet = occlusionQuerySet
+    if timestampWrites is not None:
+        p.timestampWrites = timestampWrites
+
+
+def build_WGPURenderPassMaxDrawCount(p, chain=None, maxDrawCount=None):
+    if chain is not None:
+        p.chain = chain
+    if maxDrawCount is not None:
+        p.maxDrawCount = maxDrawCount
+
+
+def build_WGPURenderPassTimestampWrites(
+    p, querySet=None, beginningOfPassWriteIndex=None, endOfPassWriteIndex=None
+):
+    if querySet is not None:
+        p.querySet = querySet
+    if beginningOfPassWriteIndex is not None:
+        p.beginningOfPassWriteIndex = beginningOfPassWriteIndex
+    if endOfPassWriteIndex is not None:
+        p.endOfPassWriteIndex = endOfPassWriteIndex
+
+
+def build_WGPURenderPipelineDescriptor(
+    p,
+    nextInChain=None,
+    label=None,
+    layout=None,
+    vertex=None,
+    primitive=None,
+    depthStencil=None,
+    multisample=None,
+    fragment=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if layout is not None:
+        p.layout = layout
+    if vertex is not None:
+        p.vertex = vertex
+    if primitive is not None:
+        p.primitive = primitive
+    if depthStencil is not None:
+        p.depthStencil = depthStencil
+    if multisample is not None:
+        p.multisample = multisample
+    if fragment is not None:
+        p.fragment = fragment
+
+
+def build_WGPURequestAdapterCallbackInfo(
+    p, nextInChain=None, mode=None, callback=None, userdata1=None, userdata2=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if mode is not None:
+        p.mode = mode
+    if callback is not None:
+        p.callback = callback
+    if userdata1 is not None:
+        p.userdata1 = userdata1
+    if userdata2 is not None:
+        p.userdata2 = userdata2
+
+
+def build_WGPURequestAdapterOptions(
+    p,
+    nextInChain=None,
+    featureLevel=None,
+    powerPreference=None,
+    forceFallbackAdapter=None,
+    backendType=None,
+    compatibleSurface=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if featureLevel is not None:
+        p.featureLevel = featureLevel
+    if powerPreference is not None:
+        p.powerPreference = (
+            enum_PowerPreference[powerPreference]
+            if isinstance(powerPreference, str)
+            else powerPreference
+        )
+    if forceFallbackAdapter is not None:
+        p.forceFallbackAdapter = forceFallbackAdapter
+    if backendType is not None:
+        p.backendType = backendType
+    if compatibleSurface is not None:
+        p.compatibleSurface = compatibleSurface
+
+
+def build_WGPURequestDeviceCallbackInfo(
+    p, nextInChain=None, mode=None, callback=None, userdata1=None, userdata2=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if mode is not None:
+        p.mode = mode
+    if callback is not None:
+        p.callback = callback
+    if userdata1 is not None:
+        p.userdata1 = userdata1
+    if userdata2 is not None:
+        p.userdata2 = userdata2
+
+
+def build_WGPUSamplerBindingLayout(p, nextInChain=None, type=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if type is not None:
+        p.type = enum_SamplerBindingType[type] if isinstance(type, str) else type
+
+
+def build_WGPUSamplerDescriptor(
+    p,
+    nextInChain=None,
+    label=None,
+    addressModeU=None,
+    addressModeV=None,
+    addressModeW=None,
+    magFilter=None,
+    minFilter=None,
+    mipmapFilter=None,
+    lodMinClamp=None,
+    lodMaxClamp=None,
+    compare=None,
+    maxAnisotropy=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if addressModeU is not None:
+        p.addressModeU = (
+            enum_AddressMode[addressModeU]
+            if isinstance(addressModeU, str)
+            else addressModeU
+        )
+    if addressModeV is not None:
+        p.addressModeV = (
+            enum_AddressMode[addressModeV]
+            if isinstance(addressModeV, str)
+            else addressModeV
+        )
+    if addressModeW is not None:
+        p.addressModeW = (
+            enum_AddressMode[addressModeW]
+            if isinstance(addressModeW, str)
+            else addressModeW
+        )
+    if magFilter is not None:
+        p.magFilter = (
+            enum_FilterMode[magFilter] if isinstance(magFilter, str) else magFilter
+        )
+    if minFilter is not None:
+        p.minFilter = (
+            enum_FilterMode[minFilter] if isinstance(minFilter, str) else minFilter
+        )
+    if mipmapFilter is not None:
+        p.mipmapFilter = (
+            enum_MipmapFilterMode[mipmapFilter]
+            if isinstance(mipmapFilter, str)
+            else mipmapFilter
+        )
+    if lodMinClamp is not None:
+        p.lodMinClamp = lodMinClamp
+    if lodMaxClamp is not None:
+        p.lodMaxClamp = lodMaxClamp
+    if compare is not None:
+        p.compare = (
+            enum_CompareFunction[compare] if isinstance(compare, str) else compare
+        )
+    if maxAnisotropy is not None:
+        p.maxAnisotropy = maxAnisotropy
+
+
+def build_WGPUShaderDefine(p, name=None, value=None):
+    if name is not None:
+        p.name = name
+    if value is not None:
+        p.value = value
+
+
+def build_WGPUShaderModuleDescriptor(p, nextInChain=None, label=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+
+
+def build_WGPUShaderModuleDescriptorSpirV(p, label=None, sourceSize=None, source=None):
+    if label is not None:
+        p.label = label
+    if sourceSize is not None:
+        p.sourceSize = sourceSize
+    if source is not None:
+        p.source = source
+
+
+def build_WGPUShaderSourceGLSL(
+    p, chain=None, stage=None, code=None, defineCount=None, defines=None
+):
+    if chain is not None:
+        p.chain = chain
+    if stage is not None:
+        p.stage = stage
+    if code is not None:
+        p.code = code
+    if defineCount is not None:
+        p.defineCount = defineCount
+    if defines is not None:
+        p.defines = defines
+
+
+def build_WGPUShaderSourceSPIRV(p, chain=None, codeSize=None, code=None):
+    if chain is not None:
+        p.chain = chain
+    if codeSize is not None:
+        p.codeSize = codeSize
+    if code is not None:
+        p.code = code
+
+
+def build_WGPUShaderSourceWGSL(p, chain=None, code=None):
+    if chain is not None:
+        p.chain = chain
+    if code is not None:
+        p.code = code
+
+
+def build_WGPUStencilFaceState(
+    p, compare=None, failOp=None, depthFailOp=None, passOp=None
+):
+    if compare is not None:
+        p.compare = (
+            enum_CompareFunction[compare] if isinstance(compare, str) else compare
+        )
+    if failOp is not None:
+        p.failOp = enum_StencilOperation[failOp] if isinstance(failOp, str) else failOp
+    if depthFailOp is not None:
+        p.depthFailOp = (
+            enum_StencilOperation[depthFailOp]
+            if isinstance(depthFailOp, str)
+            else depthFailOp
+        )
+    if passOp is not None:
+        p.passOp = enum_StencilOperation[passOp] if isinstance(passOp, str) else passOp
+
+
+def build_WGPUStorageTextureBindingLayout(
+    p, nextInChain=None, access=None, format=None, viewDimension=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if access is not None:
+        p.access = (
+            enum_StorageTextureAccess[access] if isinstance(access, str) else access
+        )
+    if format is not None:
+        p.format = enum_TextureFormat[format] if isinstance(format, str) else format
+    if viewDimension is not None:
+        p.viewDimension = (
+            enum_TextureViewDimension[viewDimension]
+            if isinstance(viewDimension, str)
+            else viewDimension
+        )
+
+
+def build_WGPUStringView(p, data=None, length=None):
+    if data is not None:
+        p.data = data
+    if length is not None:
+        p.length = length
+
+
+def build_WGPUSupportedFeatures(p, featureCount=None, features=None):
+    if featureCount is not None:
+        p.featureCount = featureCount
+    if features is not None:
+        p.features = features
+
+
+def build_WGPUSupportedWGSLLanguageFeatures(p, featureCount=None, features=None):
+    if featureCount is not None:
+        p.featureCount = featureCount
+    if features is not None:
+        p.features = features
+
+
+def build_WGPUSurfaceCapabilities(
+    p,
+    nextInChain=None,
+    usages=None,
+    formatCount=None,
+    formats=None,
+    presentModeCount=None,
+    presentModes=None,
+    alphaModeCount=None,
+    alphaModes=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if usages is not None:
+        p.usages = usages
+    if formatCount is not None:
+        p.formatCount = formatCount
+    if formats is not None:
+        p.formats = formats
+    if presentModeCount is not None:
+        p.presentModeCount = presentModeCount
+    if presentModes is not None:
+        p.presentModes = presentModes
+    if alphaModeCount is not None:
+        p.alphaModeCount = alphaModeCount
+    if alphaModes is not None:
+        p.alphaModes = alphaModes
+
+
+def build_WGPUSurfaceConfiguration(
+    p,
+    nextInChain=None,
+    device=None,
+    format=None,
+    usage=None,
+    width=None,
+    height=None,
+    viewFormatCount=None,
+    viewFormats=None,
+    alphaMode=None,
+    presentMode=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if device is not None:
+        p.device = device
+    if format is not None:
+        p.format = enum_TextureFormat[format] if isinstance(format, str) else format
+    if usage is not None:
+        p.usage = usage
+    if width is not None:
+        p.width = width
+    if height is not None:
+        p.height = height
+    if viewFormatCount is not None:
+        p.viewFormatCount = viewFormatCount
+    if viewFormats is not None:
+        p.viewFormats = viewFormats
+    if alphaMode is not None:
+        p.alphaMode = alphaMode
+    if presentMode is not None:
+        p.presentMode = presentMode
+
+
+def build_WGPUSurfaceConfigurationExtras(
+    p, chain=None, desiredMaximumFrameLatency=None
+):
+    if chain is not None:
+        p.chain = chain
+    if desiredMaximumFrameLatency is not None:
+        p.desiredMaximumFrameLatency = desiredMaximumFrameLatency
+
+
+def build_WGPUSurfaceDescriptor(p, nextInChain=None, label=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+
+
+def build_WGPUSurfaceSourceAndroidNativeWindow(p, chain=None, window=None):
+    if chain is not None:
+        p.chain = chain
+    if window is not None:
+        p.window = window
+
+
+def build_WGPUSurfaceSourceMetalLayer(p, chain=None, layer=None):
+    if chain is not None:
+        p.chain = chain
+    if layer is not None:
+        p.layer = layer
+
+
+def build_WGPUSurfaceSourceSwapChainPanel(p, chain=None, panelNative=None):
+    if chain is not None:
+        p.chain = chain
+    if panelNative is not None:
+        p.panelNative = panelNative
+
+
+def build_WGPUSurfaceSourceWaylandSurface(p, chain=None, display=None, surface=None):
+    if chain is not None:
+        p.chain = chain
+    if display is not None:
+        p.display = display
+    if surface is not None:
+        p.surface = surface
+
+
+def build_WGPUSurfaceSourceWindowsHWND(p, chain=None, hinstance=None, hwnd=None):
+    if chain is not None:
+        p.chain = chain
+    if hinstance is not None:
+        p.hinstance = hinstance
+    if hwnd is not None:
+        p.hwnd = hwnd
+
+
+def build_WGPUSurfaceSourceXCBWindow(p, chain=None, connection=None, window=None):
+    if chain is not None:
+        p.chain = chain
+    if connection is not None:
+        p.connection = connection
+    if window is not None:
+        p.window = window
+
+
+def build_WGPUSurfaceSourceXlibWindow(p, chain=None, display=None, window=None):
+    if chain is not None:
+        p.chain = chain
+    if display is not None:
+        p.display = display
+    if window is not None:
+        p.window = window
+
+
+def build_WGPUSurfaceTexture(p, nextInChain=None, texture=None, status=None):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if texture is not None:
+        p.texture = texture
+    if status is not None:
+        p.status = status
+
+
+def build_WGPUTexelCopyBufferInfo(p, layout=None, buffer=None):
+    if layout is not None:
+        p.layout = layout
+    if buffer is not None:
+        p.buffer = buffer
+
+
+def build_WGPUTexelCopyBufferLayout(
+    p, offset=None, bytesPerRow=None, rowsPerImage=None
+):
+    if offset is not None:
+        p.offset = offset
+    if bytesPerRow is not None:
+        p.bytesPerRow = bytesPerRow
+    if rowsPerImage is not None:
+        p.rowsPerImage = rowsPerImage
+
+
+def build_WGPUTexelCopyTextureInfo(
+    p, texture=None, mipLevel=None, origin=None, aspect=None
+):
+    if texture is not None:
+        p.texture = texture
+    if mipLevel is not None:
+        p.mipLevel = mipLevel
+    if origin is not None:
+        p.origin = origin
+    if aspect is not None:
+        p.aspect = enum_TextureAspect[aspect] if isinstance(aspect, str) else aspect
+
+
+def build_WGPUTextureBindingLayout(
+    p, nextInChain=None, sampleType=None, viewDimension=None, multisampled=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if sampleType is not None:
+        p.sampleType = (
+            enum_TextureSampleType[sampleType]
+            if isinstance(sampleType, str)
+            else sampleType
+        )
+    if viewDimension is not None:
+        p.viewDimension = (
+            enum_TextureViewDimension[viewDimension]
+            if isinstance(viewDimension, str)
+            else viewDimension
+        )
+    if multisampled is not None:
+        p.multisampled = multisampled
+
+
+def build_WGPUTextureDescriptor(
+    p,
+    nextInChain=None,
+    label=None,
+    usage=None,
+    dimension=None,
+    size=None,
+    format=None,
+    mipLevelCount=None,
+    sampleCount=None,
+    viewFormatCount=None,
+    viewFormats=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if usage is not None:
+        p.usage = usage
+    if dimension is not None:
+        p.dimension = (
+            enum_TextureDimension[dimension]
+            if isinstance(dimension, str)
+            else dimension
+        )
+    if size is not None:
+        p.size = size
+    if format is not None:
+        p.format = enum_TextureFormat[format] if isinstance(format, str) else format
+    if mipLevelCount is not None:
+        p.mipLevelCount = mipLevelCount
+    if sampleCount is not None:
+        p.sampleCount = sampleCount
+    if viewFormatCount is not None:
+        p.viewFormatCount = viewFormatCount
+    if viewFormats is not None:
+        p.viewFormats = viewFormats
+
+
+def build_WGPUTextureViewDescriptor(
+    p,
+    nextInChain=None,
+    label=None,
+    format=None,
+    dimension=None,
+    baseMipLevel=None,
+    mipLevelCount=None,
+    baseArrayLayer=None,
+    arrayLayerCount=None,
+    aspect=None,
+    usage=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if label is not None:
+        p.label = label
+    if format is not None:
+        p.format = enum_TextureFormat[format] if isinstance(format, str) else format
+    if dimension is not None:
+        p.dimension = (
+            enum_TextureViewDimension[dimension]
+            if isinstance(dimension, str)
+            else dimension
+        )
+    if baseMipLevel is not None:
+        p.baseMipLevel = baseMipLevel
+    if mipLevelCount is not None:
+        p.mipLevelCount = mipLevelCount
+    if baseArrayLayer is not None:
+        p.baseArrayLayer = baseArrayLayer
+    if arrayLayerCount is not None:
+        p.arrayLayerCount = arrayLayerCount
+    if aspect is not None:
+        p.aspect = enum_TextureAspect[aspect] if isinstance(aspect, str) else aspect
+    if usage is not None:
+        p.usage = usage
+
+
+def build_WGPUUncapturedErrorCallbackInfo(
+    p, nextInChain=None, callback=None, userdata1=None, userdata2=None
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if callback is not None:
+        p.callback = callback
+    if userdata1 is not None:
+        p.userdata1 = userdata1
+    if userdata2 is not None:
+        p.userdata2 = userdata2
+
+
+def build_WGPUVertexAttribute(p, format=None, offset=None, shaderLocation=None):
+    if format is not None:
+        p.format = enum_VertexFormat[format] if isinstance(format, str) else format
+    if offset is not None:
+        p.offset = offset
+    if shaderLocation is not None:
+        p.shaderLocation = shaderLocation
+
+
+def build_WGPUVertexBufferLayout(
+    p, stepMode=None, arrayStride=None, attributeCount=None, attributes=None
+):
+    if stepMode is not None:
+        p.stepMode = (
+            enum_VertexStepMode[stepMode] if isinstance(stepMode, str) else stepMode
+        )
+    if arrayStride is not None:
+        p.arrayStride = arrayStride
+    if attributeCount is not None:
+        p.attributeCount = attributeCount
+    if attributes is not None:
+        p.attributes = attributes
+
+
+def build_WGPUVertexState(
+    p,
+    nextInChain=None,
+    module=None,
+    entryPoint=None,
+    constantCount=None,
+    constants=None,
+    bufferCount=None,
+    buffers=None,
+):
+    if nextInChain is not None:
+        p.nextInChain = nextInChain
+    if module is not None:
+        p.module = module
+    if entryPoint is not None:
+        p.entryPoint = entryPoint
+    if constantCount is not None:
+        p.constantCount = constantCount
+    if constants is not None:
+        p.constants = constants
+    if bufferCount is not None:
+        p.bufferCount = bufferCount
+    if buffers is not None:
+        p.buffers = buffers
+
+
+struct_builders = {
+    "WGPUAdapterInfo *": build_WGPUAdapterInfo,
+    "WGPUBindGroupDescriptor *": build_WGPUBindGroupDescriptor,
+    "WGPUBindGroupEntry *": build_WGPUBindGroupEntry,
+    "WGPUBindGroupEntryExtras *": build_WGPUBindGroupEntryExtras,
+    "WGPUBindGroupLayoutDescriptor *": build_WGPUBindGroupLayoutDescriptor,
+    "WGPUBindGroupLayoutEntry *": build_WGPUBindGroupLayoutEntry,
+    "WGPUBindGroupLayoutEntryExtras *": build_WGPUBindGroupLayoutEntryExtras,
+    "WGPUBlendComponent *": build_WGPUBlendComponent,
+    "WGPUBlendState *": build_WGPUBlendState,
+    "WGPUBufferBindingLayout *": build_WGPUBufferBindingLayout,
+    "WGPUBufferDescriptor *": build_WGPUBufferDescriptor,
+    "WGPUBufferMapCallbackInfo *": build_WGPUBufferMapCallbackInfo,
+    "WGPUChainedStruct *": build_WGPUChainedStruct,
+    "WGPUChainedStructOut *": build_WGPUChainedStructOut,
+    "WGPUColor *": build_WGPUColor,
+    "WGPUColorTargetState *": build_WGPUColorTargetState,
+    "WGPUCommandBufferDescriptor *": build_WGPUCommandBufferDescriptor,
+    "WGPUCommandEncoderDescriptor *": build_WGPUCommandEncoderDescriptor,
+    "WGPUCompilationInfo *": build_WGPUCompilationInfo,
+    "WGPUCompilationInfoCallbackInfo *": build_WGPUCompilationInfoCallbackInfo,
+    "WGPUCompilationMessage *": build_WGPUCompilationMessage,
+    "WGPUComputePassDescriptor *": build_WGPUComputePassDescriptor,
+    "WGPUComputePassTimestampWrites *": build_WGPUComputePassTimestampWrites,
+    "WGPUComputePipelineDescriptor *": build_WGPUComputePipelineDescriptor,
+    "WGPUConstantEntry *": build_WGPUConstantEntry,
+    "WGPUCreateComputePipelineAsyncCallbackInfo *": build_WGPUCreateComputePipelineAsyncCallbackInfo,
+    "WGPUCreateRenderPipelineAsyncCallbackInfo *": build_WGPUCreateRenderPipelineAsyncCallbackInfo,
+    "WGPUDepthStencilState *": build_WGPUDepthStencilState,
+    "WGPUDeviceDescriptor *": build_WGPUDeviceDescriptor,
+    "WGPUDeviceExtras *": build_WGPUDeviceExtras,
+    "WGPUDeviceLostCallbackInfo *": build_WGPUDeviceLostCallbackInfo,
+    "WGPUExtent3D *": build_WGPUExtent3D,
+    "WGPUFragmentState *": build_WGPUFragmentState,
+    "WGPUFuture *": build_WGPUFuture,
+    "WGPUFutureWaitInfo *": build_WGPUFutureWaitInfo,
+    "WGPUGlobalReport *": build_WGPUGlobalReport,
+    "WGPUHubReport *": build_WGPUHubReport,
+    "WGPUInstanceCapabilities *": build_WGPUInstanceCapabilities,
+    "WGPUInstanceDescriptor *": build_WGPUInstanceDescriptor,
+    "WGPUInstanceEnumerateAdapterOptions *": build_WGPUInstanceEnumerateAdapterOptions,
+    "WGPUInstanceExtras *": build_WGPUInstanceExtras,
+    "WGPULimits *": build_WGPULimits,
+    "WGPUMultisampleState *": build_WGPUMultisampleState,
+    "WGPUNativeLimits *": build_WGPUNativeLimits,
+    "WGPUOrigin3D *": build_WGPUOrigin3D,
+    "WGPUPipelineLayoutDescriptor *": build_WGPUPipelineLayoutDescriptor,
+    "WGPUPipelineLayoutExtras *": build_WGPUPipelineLayoutExtras,
+    "WGPUPopErrorScopeCallbackInfo *": build_WGPUPopErrorScopeCallbackInfo,
+    "WGPUPrimitiveState *": build_WGPUPrimitiveState,
+    "WGPUPrimitiveStateExtras *": build_WGPUPrimitiveStateExtras,
+    "WGPUProgrammableStageDescriptor *": build_WGPUProgrammableStageDescriptor,
+    "WGPUPushConstantRange *": build_WGPUPushConstantRange,
+    "WGPUQuerySetDescriptor *": build_WGPUQuerySetDescriptor,
+    "WGPUQuerySetDescriptorExtras *": build_WGPUQuerySetDescriptorExtras,
+    "WGPUQueueDescriptor *": build_WGPUQueueDescriptor,
+    "WGPUQueueWorkDoneCallbackInfo *": build_WGPUQueueWorkDoneCallbackInfo,
+    "WGPURegistryReport *": build_WGPURegistryReport,
+    "WGPURenderBundleDescriptor *": build_WGPURenderBundleDescriptor,
+    "WGPURenderBundleEncoderDescriptor *": build_WGPURenderBundleEncoderDescriptor,
+    "WGPURenderPassColorAttachment *": build_WGPURenderPassColorAttachment,
+    "WGPURenderPassDepthStencilAttachment *": build_WGPURenderPassDepthStencilAttachment,
+    "WGPURenderPassDescriptor *": build_WGPURenderPassDescriptor,
+    "WGPURenderPassMaxDrawCount *": build_WGPURenderPassMaxDrawCount,
+    "WGPURenderPassTimestampWrites *": build_WGPURenderPassTimestampWrites,
+    "WGPURenderPipelineDescriptor *": build_WGPURenderPipelineDescriptor,
+    "WGPURequestAdapterCallbackInfo *": build_WGPURequestAdapterCallbackInfo,
+    "WGPURequestAdapterOptions *": build_WGPURequestAdapterOptions,
+    "WGPURequestDeviceCallbackInfo *": build_WGPURequestDeviceCallbackInfo,
+    "WGPUSamplerBindingLayout *": build_WGPUSamplerBindingLayout,
+    "WGPUSamplerDescriptor *": build_WGPUSamplerDescriptor,
+    "WGPUShaderDefine *": build_WGPUShaderDefine,
+    "WGPUShaderModuleDescriptor *": build_WGPUShaderModuleDescriptor,
+    "WGPUShaderModuleDescriptorSpirV *": build_WGPUShaderModuleDescriptorSpirV,
+    "WGPUShaderSourceGLSL *": build_WGPUShaderSourceGLSL,
+    "WGPUShaderSourceSPIRV *": build_WGPUShaderSourceSPIRV,
+    "WGPUShaderSourceWGSL *": build_WGPUShaderSourceWGSL,
+    "WGPUStencilFaceState *": build_WGPUStencilFaceState,
+    "WGPUStorageTextureBindingLayout *": build_WGPUStorageTextureBindingLayout,
+    "WGPUStringView *": build_WGPUStringView,
+    "WGPUSupportedFeatures *": build_WGPUSupportedFeatures,
+    "WGPUSupportedWGSLLanguageFeatures *": build_WGPUSupportedWGSLLanguageFeatures,
+    "WGPUSurfaceCapabilities *": build_WGPUSurfaceCapabilities,
+    "WGPUSurfaceConfiguration *": build_WGPUSurfaceConfiguration,
+    "WGPUSurfaceConfigurationExtras *": build_WGPUSurfaceConfigurationExtras,
+    "WGPUSurfaceDescriptor *": build_WGPUSurfaceDescriptor,
+    "WGPUSurfaceSourceAndroidNativeWindow *": build_WGPUSurfaceSourceAndroidNativeWindow,
+    "WGPUSurfaceSourceMetalLayer *": build_WGPUSurfaceSourceMetalLayer,
+    "WGPUSurfaceSourceSwapChainPanel *": build_WGPUSurfaceSourceSwapChainPanel,
+    "WGPUSurfaceSourceWaylandSurface *": build_WGPUSurfaceSourceWaylandSurface,
+    "WGPUSurfaceSourceWindowsHWND *": build_WGPUSurfaceSourceWindowsHWND,
+    "WGPUSurfaceSourceXCBWindow *": build_WGPUSurfaceSourceXCBWindow,
+    "WGPUSurfaceSourceXlibWindow *": build_WGPUSurfaceSourceXlibWindow,
+    "WGPUSurfaceTexture *": build_WGPUSurfaceTexture,
+    "WGPUTexelCopyBufferInfo *": build_WGPUTexelCopyBufferInfo,
+    "WGPUTexelCopyBufferLayout *": build_WGPUTexelCopyBufferLayout,
+    "WGPUTexelCopyTextureInfo *": build_WGPUTexelCopyTextureInfo,
+    "WGPUTextureBindingLayout *": build_WGPUTextureBindingLayout,
+    "WGPUTextureDescriptor *": build_WGPUTextureDescriptor,
+    "WGPUTextureViewDescriptor *": build_WGPUTextureViewDescriptor,
+    "WGPUUncapturedErrorCallbackInfo *": build_WGPUUncapturedErrorCallbackInfo,
+    "WGPUVertexAttribute *": build_WGPUVertexAttribute,
+    "WGPUVertexBufferLayout *": build_WGPUVertexBufferLayout,
+    "WGPUVertexState *": build_WGPUVertexState,
+}
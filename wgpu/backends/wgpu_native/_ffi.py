@@ -12,6 +12,8 @@ from ..._coreutils import (
 
 from cffi import FFI, __version_info__ as cffi_version_info
 
+from ._ffi_build import _get_wgpu_header, get_header_hash
+
 
 logger = logging.getLogger("wgpu")
 
@@ -22,60 +24,31 @@ if cffi_version_info < (1, 10):  # no-cover
 
 def get_wgpu_header():
     """Read header file and strip some stuff that cffi would stumble on."""
-    return _get_wgpu_header(
-        get_header_filename("webgpu.h"),
-        get_header_filename("wgpu.h"),
-    )
+    return _get_wgpu_header(*_get_header_filenames())
 
 
-def _get_wgpu_header(*filenames):
-    """Func written so we can use this in both wgpu_native/_ffi.py and codegen/hparser.py"""
-    # Read files
-    lines1 = []
-    for filename in filenames:
-        with open(filename, "rb") as f:
-            lines1.extend(
-                f.read()
-                .decode()
-                .replace("\r\n", "\n")
-                .replace("\\\n", "")
-                .splitlines(True)
-            )
-    # Deal with pre-processor commands, because cffi cannot handle them.
-    # Just removing them, plus a few extra lines, seems to do the trick.
-    lines2 = []
-    for line in lines1:
-        if (
-            line.startswith("#define ")
-            and len(line.split()) > 2
-            and ("0x" in line or "_MAX" in line)
-        ):
-            # pattern to find: #define WGPU_CONSTANT (0x1234)
-            # we use ffi.sizeof() to hopefully get the correct max sizes per platform
-            max_size = hex((1 << ffi.sizeof("size_t") * 8) - 1)
-            max_32 = hex((1 << ffi.sizeof("uint32_t") * 8) - 1)
-            max_64 = hex((1 << ffi.sizeof("uint64_t") * 8) - 1)
-            line = (
-                line.replace("SIZE_MAX", max_size)
-                .replace("UINT32_MAX", max_32)
-                .replace("UINT64_MAX", max_64)
-            )
-            line = line.replace("(", "").replace(")", "")
-        elif line.startswith("#"):
-            continue
-        elif 'extern "C"' in line:
-            continue
-        for define_to_drop in [
-            "WGPU_EXPORT ",
-            "WGPU_NULLABLE ",
-            " WGPU_OBJECT_ATTRIBUTE",
-            " WGPU_ENUM_ATTRIBUTE",
-            " WGPU_FUNCTION_ATTRIBUTE",
-            " WGPU_STRUCTURE_ATTRIBUTE",
-        ]:
-            line = line.replace(define_to_drop, "")
-        lines2.append(line)
-    return "\n".join(lines2)
+def _get_header_filenames():
+    return get_header_filename("webgpu.h"), get_header_filename("wgpu.h")
+
+
+def get_wgpu_ffi():
+    """Get the FFI object for the wgpu-native header.
+
+    Uses the precompiled ``_wgpu_ffi`` module if it is available and
+    matches the current header files. Otherwise the header is parsed.
+    """
+    try:
+        from ._wgpu_ffi import ffi, header_hash
+    except ImportError:
+        pass
+    else:
+        if header_hash == get_header_hash(*_get_header_filenames()):
+            return ffi
+        logger.info("Precompiled wgpu ffi module is stale, parsing the header.")
+    ffi = FFI()
+    ffi.cdef(get_wgpu_header())
+    ffi.set_source("wgpu.h", None)
+    return ffi
 
 
 def get_wgpu_lib_path():
@@ -179,9 +152,7 @@ def get_lib_version_info():
 # Configure cffi and load the dynamic library
 # NOTE: `import wgpu.backends.wgpu_native` is used in pyinstaller tests to verify
 # that we can load the DLL after freezing
-ffi = FFI()
-ffi.cdef(get_wgpu_header())
-ffi.set_source("wgpu.h", None)
+ffi = get_wgpu_ffi()
 lib_path = get_wgpu_lib_path()  # store path on this module so it can be checked
 lib = ffi.dlopen(lib_path)
 lib_version_info = get_lib_version_info()
@@ -0,0 +1,106 @@
+"""Preparing the header for cffi, and building the precompiled ffi module.
+
+Parsing the header with ``ffi.cdef()`` takes a significant part of the
+import time. Therefore, at build time, we produce an out-of-line ABI-mode
+module (``_wgpu_ffi.py``) that contains the pre-parsed type information.
+At import time, ``_ffi.py`` uses it when it matches the current headers,
+and falls back to parsing the headers otherwise.
+
+This module must not import anything from wgpu (and only uses the stdlib
+and cffi), so it can be loaded by the build tools without loading the lib.
+"""
+
+import os
+import hashlib
+
+import cffi
+from cffi import FFI
+
+
+FFI_MODULE_NAME = "wgpu.backends.wgpu_native._wgpu_ffi"
+
+_sizes_ffi = FFI()
+
+
+def _get_wgpu_header(*filenames):
+    """Func written so we can use this in both wgpu_native/_ffi.py and codegen/hparser.py"""
+    # Read files
+    lines1 = []
+    for filename in filenames:
+        with open(filename, "rb") as f:
+            lines1.extend(
+                f.read()
+                .decode()
+                .replace("\r\n", "\n")
+                .replace("\\\n", "")
+                .splitlines(True)
+            )
+    # Deal with pre-processor commands, because cffi cannot handle them.
+    # Just removing them, plus a few extra lines, seems to do the trick.
+    lines2 = []
+    for line in lines1:
+        if (
+            line.startswith("#define ")
+            and len(line.split()) > 2
+            and ("0x" in line or "_MAX" in line)
+        ):
+            # pattern to find: #define WGPU_CONSTANT (0x1234)
+            # we use ffi.sizeof() to hopefully get the correct max sizes per platform
+            max_size = hex((1 << _sizes_ffi.sizeof("size_t") * 8) - 1)
+            max_32 = hex((1 << _sizes_ffi.sizeof("uint32_t") * 8) - 1)
+            max_64 = hex((1 << _sizes_ffi.sizeof("uint64_t") * 8) - 1)
+            line = (
+                line.replace("SIZE_MAX", max_size)
+                .replace("UINT32_MAX", max_32)
+                .replace("UINT64_MAX", max_64)
+            )
+            line = line.replace("(", "").replace(")", "")
+        elif line.startswith("#"):
+            continue
+        elif 'extern "C"' in line:
+            continue
+        for define_to_drop in [
+            "WGPU_EXPORT ",
+            "WGPU_NULLABLE ",
+            " WGPU_OBJECT_ATTRIBUTE",
+            " WGPU_ENUM_ATTRIBUTE",
+            " WGPU_FUNCTION_ATTRIBUTE",
+            " WGPU_STRUCTURE_ATTRIBUTE",
+        ]:
+            line = line.replace(define_to_drop, "")
+        lines2.append(line)
+    return "\n".join(lines2)
+
+
+def get_header_hash(*filenames):
+    """Get a hash that identifies the cdef produced from the given header files.
+
+    Besides the header contents, this includes the cffi version and the
+    size of size_t, because these affect the generated module.
+    """
+    h = hashlib.sha1()
+    h.update(cffi.__version__.encode())
+    h.update(str(_sizes_ffi.sizeof("size_t")).encode())
+    for filename in filenames:
+        with open(filename, "rb") as f:
+            h.update(f.read().replace(b"\r\n", b"\n"))
+    return h.hexdigest()
+
+
+def build_ffi_module(header_filenames, target_dir):
+    """Write the precompiled ``_wgpu_ffi.py`` module into the given directory.
+
+    Returns the filename of the written module.
+    """
+    ffibuilder = FFI()
+    ffibuilder.cdef(_get_wgpu_header(*header_filenames))
+    ffibuilder.set_source(FFI_MODULE_NAME, None)
+
+    filename = os.path.join(target_dir, FFI_MODULE_NAME.rpartition(".")[2] + ".py")
+    ffibuilder.emit_python_code(filename)
+
+    # Append the hash, so _ffi.py can detect that the module is stale
+    header_hash = get_header_hash(*header_filenames)
+    with open(filename, "ab") as f:
+        f.write(f"\nheader_hash = {header_hash!r}\n".encode())
+    return filename
@@ -1,13 +1,17 @@
 """Utilities used in the wgpu-native backend."""
 
 import sys
+import time
 import types
 import ctypes
 import inspect
+import logging
+import weakref
 import threading
 from queue import deque
 
 from ._ffi import ffi, lib, lib_path
+from ..._coreutils import get_numpy
 from ..._diagnostics import DiagnosticsBase
 from ...classes import (
     GPUError,
@@ -17,6 +21,8 @@ from ...classes import (
     GPUValidationError,
 )
 
+logger = logging.getLogger("wgpu")
+
 ERROR_TYPES = {
     "": GPUError,
     "OutOfMemory": GPUOutOfMemoryError,
@@ -71,6 +77,47 @@ def get_memoryview_and_address(data):
     return m, address
 
 
+def get_out_memoryview_and_address(out, nbytes):
+    """Get a memoryview and memory-address for an object to read data into.
+    The object must support the buffer protocol, be contiguous and writable,
+    and be at least nbytes large.
+    """
+    m, address = get_memoryview_and_address(out)
+    if m.readonly:
+        raise ValueError("The given out object is readonly.")
+    if m.nbytes < nbytes:
+        raise ValueError(
+            f"The given out object is too small: {m.nbytes} < {nbytes} bytes."
+        )
+    return m, address
+
+
+def copy_rows(dst_address, dst_stride, src_address, src_stride, row_size, nrows):
+    """Copy nrows rows of row_size bytes between two memory addresses,
+    where the rows are dst_stride and src_stride bytes apart.
+    """
+    if nrows <= 0:
+        return
+    np = get_numpy()
+    if np is None or nrows < 4:
+        # A loop of memmoves, with as little work per iteration as possible
+        memmove = ffi.memmove
+        dst_ptr = ffi.cast("uint8_t *", dst_address)
+        src_ptr = ffi.cast("uint8_t *", src_address)
+        for i in range(nrows):
+            memmove(dst_ptr + i * dst_stride, src_ptr + i * src_stride, row_size)
+    else:
+        # A single strided copy
+        shape = nrows, row_size
+        dst_nbytes = dst_stride * (nrows - 1) + row_size
+        src_nbytes = src_stride * (nrows - 1) + row_size
+        dst_m = get_memoryview_from_address(dst_address, dst_nbytes)
+        src_m = get_memoryview_from_address(src_address, src_nbytes)
+        dst = np.ndarray(shape, np.uint8, dst_m, strides=(dst_stride, 1))
+        src = np.ndarray(shape, np.uint8, src_m, strides=(src_stride, 1))
+        dst[:] = src
+
+
 def get_memoryview_from_address(address, nbytes, format="B"):
     """Get a memoryview from an int memory address and a byte count,"""
     # The default format is "<B", which seems to confuse some memoryview
@@ -239,6 +286,234 @@ def to_camel_case(name):
     return name2
 
 
+class StructArenaState(threading.local):
+    """Thread-local state for the struct arena in _api.py.
+
+    While a method decorated with ``with_struct_arena()`` runs (in this
+    thread), ``refs`` is a list that owns the created structs and the
+    objects that they refer to.
+    """
+
+    refs = None
+
+
+class StagingBufferPool:
+    """A pool of mappable buffers, used by the queue to read data back.
+
+    The buffer sizes are rounded up to a size class, so that a buffer can be
+    reused for reads of similar size. Small sizes are rounded up to a power of
+    two. Sizes above ``max_pow2_size`` are rounded up to a multiple of it, so
+    that large reads do not waste up to half of the buffer. Size classes never
+    exceed ``max_size`` (the device's max-buffer-size).
+
+    The pool holds a limited number of free buffers per size class, and at
+    most ``max_free_bytes`` in total. Free buffers that have not been used
+    for ``max_idle_time`` seconds are destroyed. This is checked when a
+    buffer is acquired or released, and when the device is polled (via
+    ``evict_idle()``). An application that stops reading data, and does not
+    wait for promises either, keeps its free buffers until ``clear()`` is
+    called. The create_buffer function is called with the size to create a
+    new buffer.
+    """
+
+    min_size = 4096
+    max_pow2_size = 2**20
+    max_free_per_size = 4
+    max_free_bytes = 2**26
+    max_idle_time = 5.0
+
+    _pools = weakref.WeakSet()
+
+    def __init__(self, create_buffer, max_size=None):
+        self._create_buffer = create_buffer
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._free = {}  # size -> list of (release_time, buffer)
+        self._free_bytes = 0
+        self._next_eviction_time = float("inf")
+        self._stats = {}  # size -> dict with counters
+        self._pools.add(self)
+
+    def get_size_class(self, size):
+        """Get the size of the buffer to use for the given number of bytes."""
+        size = int(size)
+        if size <= self.max_pow2_size:
+            size_class = max(self.min_size, 1 << (size - 1).bit_length())
+        else:
+            size_class = -(-size // self.max_pow2_size) * self.max_pow2_size
+        if self._max_size is not None:
+            size_class = max(size, min(size_class, self._max_size))
+        return size_class
+
+    def _count(self, size, key):
+        stats = self._stats.get(size, None)
+        if stats is None:
+            stats = self._stats[size] = {"hits": 0, "misses": 0, "evicted": 0}
+        stats[key] += 1
+
+    def _pop_idle_buffers(self, now):
+        # Must be called with the lock held. The free lists are ordered by
+        # release time, so idle buffers are at the start.
+        idle_buffers = []
+        next_eviction_time = float("inf")
+        for size, free_buffers in self._free.items():
+            while free_buffers and now - free_buffers[0][0] > self.max_idle_time:
+                idle_buffers.append(free_buffers.pop(0)[1])
+                self._free_bytes -= size
+                self._count(size, "evicted")
+            if free_buffers:
+                eviction_time = free_buffers[0][0] + self.max_idle_time
+                next_eviction_time = min(next_eviction_time, eviction_time)
+        self._next_eviction_time = next_eviction_time
+        return idle_buffers
+
+    def evict_idle(self):
+        """Destroy the free buffers that have not been used for a while.
+
+        This is cheap when there is nothing to evict, so it can be called often.
+        """
+        now = time.perf_counter()
+        if now <= self._next_eviction_time:
+            return
+        with self._lock:
+            idle_buffers = self._pop_idle_buffers(now)
+        for idle_buffer in idle_buffers:
+            idle_buffer.destroy()
+
+    def acquire(self, size):
+        """Get a buffer of at least the given size."""
+        size = self.get_size_class(size)
+        buffer = None
+        with self._lock:
+            idle_buffers = self._pop_idle_buffers(time.perf_counter())
+            free_buffers = self._free.get(size, None)
+            if free_buffers:
+                buffer = free_buffers.pop()[1]
+                self._free_bytes -= size
+                self._count(size, "hits")
+            else:
+                self._count(size, "misses")
+        for idle_buffer in idle_buffers:
+            idle_buffer.destroy()
+        if buffer is None:
+            buffer = self._create_buffer(size)
+        return buffer
+
+    def release(self, buffer):
+        """Give a buffer back to the pool. It must be unmapped."""
+        with self._lock:
+            now = time.perf_counter()
+            idle_buffers = self._pop_idle_buffers(now)
+            free_buffers = self._free.setdefault(buffer.size, [])
+            if (
+                len(free_buffers) < self.max_free_per_size
+                and self._free_bytes + buffer.size <= self.max_free_bytes
+            ):
+                free_buffers.append((now, buffer))
+                self._free_bytes += buffer.size
+                self._next_eviction_time = min(
+                    self._next_eviction_time, now + self.max_idle_time
+                )
+            else:
+                idle_buffers.append(buffer)
+        for idle_buffer in idle_buffers:
+            idle_buffer.destroy()
+
+    def discard(self, buffer):
+        """Destroy a buffer from this pool that should not be reused, e.g.
+        because mapping it failed.
+        """
+        buffer.destroy()
+
+    def clear(self):
+        """Destroy all free buffers."""
+        with self._lock:
+            free_buffers = [b for buffers in self._free.values() for _, b in buffers]
+            self._free.clear()
+            self._free_bytes = 0
+            self._next_eviction_time = float("inf")
+        for buffer in free_buffers:
+            buffer.destroy()
+
+    def get_stats(self):
+        """Get a dict that maps size class to a dict with the number of free
+        buffers, and the number of hits, misses, and evicted buffers.
+        """
+        with self._lock:
+            stats = {}
+            for size in sorted(self._stats):
+                free_buffers = self._free.get(size, ())
+                stats[size] = {"free": len(free_buffers), **self._stats[size]}
+            return stats
+
+
+class DevicePollThread(threading.Thread):
+    """A thread that polls a device, so that promises resolve without the
+    main thread having to poll.
+
+    The given poll function should block until the submitted work is done,
+    and process the callbacks. When there is nothing to wait for, the thread
+    sleeps until wake() is called, which is done when a callback is registered.
+    """
+
+    def __init__(self, poll_function):
+        super().__init__(name="wgpu-device-poll", daemon=True)
+        self._poll_function = poll_function
+        self._condition = threading.Condition()
+        self._wake_count = 0
+        self._stopped = False
+
+    def wake(self):
+        """Let the thread poll (again)."""
+        with self._condition:
+            self._wake_count += 1
+            self._condition.notify()
+
+    def stop(self):
+        """Stop the thread, after it finished its current poll."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self is not threading.current_thread():
+            self.join()
+
+    def run(self):
+        while True:
+            with self._condition:
+                while not (self._wake_count or self._stopped):
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                self._wake_count = 0
+            try:
+                self._poll_function()
+            except Exception as err:  # no-cover
+                logger.error(f"Error in device poll thread: {err}")
+
+
+class StagingBuffersDiagnostics(DiagnosticsBase):
+    def get_subscript(self):
+        text = ""
+        text += "    * Staging buffers are used to read buffers and textures.\n"
+        text += "    * A miss means a new buffer was created.\n"
+        return text
+
+    def get_dict(self):
+        result = {}
+        for pool in list(StagingBufferPool._pools):
+            for size, stats in pool.get_stats().items():
+                d = result.setdefault(size, dict.fromkeys(stats, 0))
+                for key, value in stats.items():
+                    d[key] += value
+        result = {f"{size // 1024} KiB": result[size] for size in sorted(result)}
+        if result:
+            totals = {}
+            for key in ("free", "hits", "misses", "evicted"):
+                totals[key] = sum(d[key] for d in result.values())
+            result["total"] = totals
+        return result
+
+
 class ErrorSlot:
     __slot__ = ["name", "type", "message"]
 
@@ -257,6 +532,12 @@ class ErrorHandler:
         self._logger = logger
         # threadlocal -> deque -> ErrorSlot
         self._per_thread_data = threading.local()
+        # When deferred, errors that occur outside of a capture are collected
+        # (per thread), and raised by the next checkpoint call.
+        self.deferred = False
+        # thread -> list of deferred errors, so they can be flushed from any thread
+        self._deferred_errors_per_thread = {}
+        self._deferred_errors_lock = threading.Lock()
 
     def _get_proxy_stack(self):
         try:
@@ -265,6 +546,12 @@ class ErrorHandler:
             stack = deque()
             self._per_thread_data.stack = stack
             self._per_thread_data.error_message_counts = {}
+            deferred_errors = []
+            self._per_thread_data.deferred_errors = deferred_errors
+            with self._deferred_errors_lock:
+                self._prune_deferred_errors()
+                thread = threading.current_thread()
+                self._deferred_errors_per_thread[thread] = deferred_errors
             return stack
 
     def capture(self, name):
@@ -307,9 +594,42 @@ class ErrorHandler:
                 self.log_error(error_slot.message)
             error_slot.type = error_type
             error_slot.message = message
+        elif self.deferred:
+            self._per_thread_data.deferred_errors.append((error_type, message))
         else:
             self.log_error(message)
 
+    def release_deferred(self):
+        """Return the first error that was collected in deferred mode, or None.
+        Any other collected errors are logged.
+        """
+        self._get_proxy_stack()  # make sure the deferred_errors attribute exists
+        deferred_errors = self._per_thread_data.deferred_errors
+        if not deferred_errors:
+            return None
+        error_type_msg = deferred_errors.pop(0)
+        for _, message in deferred_errors:
+            self.log_error(message)
+        deferred_errors.clear()
+        return error_type_msg
+
+    def log_all_deferred(self):
+        """Log the errors that were collected in deferred mode, in all threads."""
+        with self._deferred_errors_lock:
+            deferred_error_lists = list(self._deferred_errors_per_thread.values())
+        for deferred_errors in deferred_error_lists:
+            while deferred_errors:
+                _, message = deferred_errors.pop(0)
+                self.log_error(message)
+        with self._deferred_errors_lock:
+            self._prune_deferred_errors()
+
+    def _prune_deferred_errors(self):
+        # Forget threads that have ended, unless they left errors behind
+        for thread, deferred_errors in list(self._deferred_errors_per_thread.items()):
+            if not deferred_errors and not thread.is_alive():
+                self._deferred_errors_per_thread.pop(thread)
+
     def log_error(self, message):
         """Handle an error message by logging it, bypassing any capturing."""
         # Get count for this message. Use a hash that does not use the
@@ -330,13 +650,39 @@ class ErrorHandler:
             self._logger.error(message.splitlines()[0] + " (hiding from now)")
 
 
+# The functions that raise the collected errors when errors are deferred
+CHECKPOINT_FUNCTIONS = {
+    "wgpuCommandEncoderFinish",
+    "wgpuComputePassEncoderEnd",
+    "wgpuQueueSubmit",
+    "wgpuQueueSubmitForIndex",
+    "wgpuRenderBundleEncoderFinish",
+    "wgpuRenderPassEncoderEnd",
+}
+
+
+# The index of the argument that holds the number of bytes transferred
+NBYTES_ARG_INDICES = {"wgpuQueueWriteBuffer": 4, "wgpuQueueWriteTexture": 3}
+
+# Function name -> [count, total time, bytes], when libf is instrumented
+native_call_stats = {}
+
+
 class SafeLibCalls:
     """Object that copies all library functions, but wrapped in such
     a way that errors occurring in that call are raised as exceptions.
+
+    When the error handler is in deferred mode, only the checkpoint functions
+    capture errors. They also raise errors that occurred in earlier calls. The
+    other functions are then swapped for the library functions themselves.
     """
 
     def __init__(self, lib, error_handler):
         self._error_handler = error_handler
+        self._instrumented = False
+        self._lib_funcs = {}
+        self._proxy_funcs = {}
+        self._class_funcs = []  # (cls, attr, name) tuples
         self._make_function_copies(lib)
 
     def _make_function_copies(self, lib):
@@ -344,18 +690,80 @@ class SafeLibCalls:
             if name.startswith("wgpu"):
                 ob = getattr(lib, name)
                 if callable(ob):
-                    setattr(self, name, self._make_proxy_func(name, ob))
+                    func = self._make_proxy_func(name, ob)
+                    self._lib_funcs[name] = ob
+                    self._proxy_funcs[name] = func
+                    setattr(self, name, func)
+
+    def _find_class_functions(self, classes):
+        # Find class attributes that hold a library function (e.g.
+        # _release_function), so that _update_functions() can swap these too.
+        names = {id(func): name for name, func in self._proxy_funcs.items()}
+        for cls in classes:
+            for attr, value in cls.__dict__.items():
+                name = names.get(id(value), None)
+                if name is not None:
+                    self._class_funcs.append((cls, attr, name))
+
+    def _set_deferred(self, enabled):
+        self._error_handler.deferred = bool(enabled)
+        self._update_functions()
+
+    def _set_instrumented(self, enabled):
+        self._instrumented = bool(enabled)
+        self._update_functions()
+
+    def _update_functions(self):
+        # Swap the functions, so there's no overhead for features not in use
+        funcs = {}
+        for name, func in self._proxy_funcs.items():
+            if self._error_handler.deferred and name not in CHECKPOINT_FUNCTIONS:
+                func = self._lib_funcs[name]  # the proxy would not capture anyway
+            if self._instrumented:
+                func = self._make_instrumented_func(name, func)
+            funcs[name] = func
+            setattr(self, name, func)
+        for cls, attr, name in self._class_funcs:
+            setattr(cls, attr, funcs[name])
+
+    def _make_instrumented_func(self, name, func):
+        stats = native_call_stats
+        perf_counter = time.perf_counter
+        nbytes_index = NBYTES_ARG_INDICES.get(name, None)
+
+        def instrumented_func(*args):
+            t0 = perf_counter()
+            try:
+                return func(*args)
+            finally:
+                t = perf_counter() - t0
+                s = stats.get(name)
+                if s is None:
+                    s = stats[name] = [0, 0.0, 0]
+                s[0] += 1
+                s[1] += t
+                if nbytes_index is not None:
+                    s[2] += int(args[nbytes_index])
+
+        instrumented_func.__name__ = name
+        return instrumented_func
 
     def _make_proxy_func(self, name, ob):
         error_handler = self._error_handler
+        is_checkpoint = name in CHECKPOINT_FUNCTIONS
 
         def proxy_func(*args):
+            if error_handler.deferred and not is_checkpoint:
+                return ob(*args)
+
             # Make the call, with error capturing on
             error_handler.capture(name)
             try:
                 result = ob(*args)
             finally:
                 error_type_msg = error_handler.release(name)
+            if error_type_msg is None and is_checkpoint and error_handler.deferred:
+                error_type_msg = error_handler.release_deferred()
 
             # Handle the error.
             if error_type_msg is not None:
@@ -494,4 +902,40 @@ class WgpuNativeCountsDiagnostics(DiagnosticsBase):
         return result
 
 
+class NativeCallsDiagnostics(DiagnosticsBase):
+    def get_subscript(self):
+        text = ""
+        text += (
+            "    * Enable with wgpu.backends.wgpu_native.set_call_instrumentation().\n"
+        )
+        text += "    * Times are cumulative wall times since the last reset().\n"
+        return text
+
+    def get_dict(self):
+        result = {}
+        items = sorted(native_call_stats.items(), key=lambda item: -item[1][1])
+        for name, (count, total_time, nbytes) in items:
+            result[name] = {
+                "count": count,
+                "time_ms": round(total_time * 1000, 3),
+                "mean_us": round(total_time * 1e6 / max(count, 1), 3),
+            }
+            if name in NBYTES_ARG_INDICES:
+                result[name]["bytes"] = nbytes
+        if result:
+            result["total"] = {
+                "count": sum(d["count"] for d in result.values()),
+                "time_ms": round(
+                    sum(s[1] for s in native_call_stats.values()) * 1000, 3
+                ),
+            }
+        return result
+
+    def reset(self):
+        """Reset the call counts and times, e.g. at the start of each frame."""
+        native_call_stats.clear()
+
+
 diagnostics = WgpuNativeCountsDiagnostics("wgpu_native_counts")
+staging_buffers_diagnostics = StagingBuffersDiagnostics("staging_buffers")
+native_calls_diagnostics = NativeCallsDiagnostics("native_calls")
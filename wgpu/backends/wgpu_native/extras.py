@@ -3,6 +3,7 @@ from typing import Sequence, Union
 
 from . import (
     GPUAdapter,
+    GPUCanvasContext,
     GPUDevice,
     GPUBuffer,
     GPUCommandEncoder,
@@ -10,9 +11,12 @@ from . import (
     GPURenderPassEncoder,
     GPUPipelineLayout,
     GPUQuerySet,
+    GPUTextureView,
 )
 from ._api import (
     GPUBindGroupLayout,
+    check_struct,
+    _tuple_from_color,
     enums,
     logger,
     structs,
@@ -20,6 +24,8 @@ from ._api import (
     new_struct_p,
     to_c_string_view,
     enum_str2int,
+    error_handler,
+    libf,
 )
 from ...enums import Enum
 from ._helpers import get_wgpu_instance
@@ -189,6 +195,136 @@ def multi_draw_indexed_indirect_count(
     )
 
 
+class PreparedRenderPass:
+    """A render pass descriptor that is converted to C structs only once.
+
+    Use ``prepare_render_pass()`` to create it, and
+    ``begin_prepared_render_pass()`` to begin a render pass with it. In
+    between, the views and clear values of the attachments can be changed,
+    e.g. to render to the next texture of a canvas.
+    """
+
+    def __init__(
+        self,
+        device,
+        label,
+        color_attachments,
+        depth_stencil_attachment,
+        occlusion_query_set,
+        timestamp_writes,
+    ):
+        self._device = device
+        self._label = label
+        self._struct = device._create_render_pass_descriptor(
+            label,
+            color_attachments,
+            depth_stencil_attachment,
+            occlusion_query_set,
+            timestamp_writes,
+        )
+        # The structs only hold the ids, so keep the objects alive
+        self._color_objects = [
+            [a["view"], a.get("resolve_target", None)] for a in color_attachments
+        ]
+        self._depth_stencil_view = None
+        if depth_stencil_attachment is not None:
+            self._depth_stencil_view = depth_stencil_attachment["view"]
+        self._other_objects = occlusion_query_set, timestamp_writes
+
+    def set_color_attachment(
+        self,
+        index: int,
+        *,
+        view: GPUTextureView | None = None,
+        resolve_target: GPUTextureView | None = None,
+        clear_value: Sequence[float] | structs.ColorStruct | None = None,
+    ) -> None:
+        """Update the color attachment at the given index. Arguments that are
+        None are left unchanged.
+        """
+        index = int(index)
+        if not 0 <= index < len(self._color_objects):
+            raise IndexError(f"Color attachment index {index} out of range.")
+        c_attachment = self._struct.colorAttachments[index]
+        if view is not None:
+            if not isinstance(view, GPUTextureView):
+                raise TypeError("Color attachment view must be a GPUTextureView.")
+            c_attachment.view = view._internal
+            self._color_objects[index][0] = view
+        if resolve_target is not None:
+            if not isinstance(resolve_target, GPUTextureView):
+                raise TypeError("Resolve target must be a GPUTextureView.")
+            c_attachment.resolveTarget = resolve_target._internal
+            self._color_objects[index][1] = resolve_target
+        if clear_value is not None:
+            if isinstance(clear_value, dict):
+                check_struct("Color", clear_value)
+                clear_value = _tuple_from_color(clear_value)
+            c_clear_value = c_attachment.clearValue
+            c_clear_value.r = clear_value[0]
+            c_clear_value.g = clear_value[1]
+            c_clear_value.b = clear_value[2]
+            c_clear_value.a = clear_value[3]
+
+    def set_depth_stencil_attachment(
+        self,
+        *,
+        view: GPUTextureView | None = None,
+        depth_clear_value: float | None = None,
+        stencil_clear_value: int | None = None,
+    ) -> None:
+        """Update the depth-stencil attachment. Arguments that are None are
+        left unchanged.
+        """
+        if self._depth_stencil_view is None:
+            raise ValueError("This render pass has no depth-stencil attachment.")
+        c_attachment = self._struct.depthStencilAttachment
+        if view is not None:
+            if not isinstance(view, GPUTextureView):
+                raise TypeError("Depth-stencil view must be a GPUTextureView.")
+            c_attachment.view = view._internal
+            self._depth_stencil_view = view
+        if depth_clear_value is not None:
+            c_attachment.depthClearValue = float(depth_clear_value)
+        if stencil_clear_value is not None:
+            c_attachment.stencilClearValue = int(stencil_clear_value)
+
+
+def prepare_render_pass(
+    device: GPUDevice,
+    *,
+    label: str = "",
+    color_attachments: Sequence[structs.RenderPassColorAttachmentStruct],
+    depth_stencil_attachment: structs.RenderPassDepthStencilAttachmentStruct
+    | None = None,
+    occlusion_query_set: GPUQuerySet | None = None,
+    timestamp_writes: structs.RenderPassTimestampWritesStruct | None = None,
+) -> PreparedRenderPass:
+    """
+    Create a render pass descriptor that can be used to begin many render
+    passes, with the same arguments as ``GPUCommandEncoder.begin_render_pass()``.
+    This avoids converting the descriptor to C structs for every pass.
+    """
+    return PreparedRenderPass(
+        device,
+        label,
+        color_attachments,
+        depth_stencil_attachment,
+        occlusion_query_set,
+        timestamp_writes,
+    )
+
+
+def begin_prepared_render_pass(
+    command_encoder: GPUCommandEncoder,
+    prepared_render_pass: PreparedRenderPass,
+) -> GPURenderPassEncoder:
+    """
+    Begin a render pass using a descriptor created with ``prepare_render_pass()``.
+    """
+    return command_encoder._begin_prepared_render_pass(prepared_render_pass)
+
+
 def create_statistics_query_set(device, *, label="", count: int, statistics):
     """
     Create a query set that can collect the specified pipeline statistics.
@@ -203,7 +339,6 @@ def begin_pipeline_statistics_query(
     query_set: GPUQuerySet,
     query_index: int,
 ):
-    print(encoder, type(encoder))
     assert isinstance(encoder, (GPURenderPassEncoder, GPUComputePassEncoder))
     encoder._begin_pipeline_statistics_query(query_set, query_index)
 
@@ -226,6 +361,64 @@ def write_timestamp(
     encoder._write_timestamp(query_set, query_index)
 
 
+def set_deferred_error_checking(enabled: bool = True):
+    """
+    Enable or disable deferred error checking. When enabled, errors are not
+    captured for each call into wgpu-native, but collected and raised at
+    the next call to ``queue.submit()``, ``encoder.finish()`` or ``pass.end()``.
+    This reduces the overhead of each call, at the cost of less precise
+    tracebacks. The error message still names the function that failed.
+    This setting applies to all devices. When disabled, the errors that
+    were collected (in any thread) but not yet raised are logged.
+    """
+    libf._set_deferred(bool(enabled))
+    if not enabled:
+        # Don't hold on to errors that no checkpoint will raise anymore
+        error_handler.log_all_deferred()
+
+
+def set_call_instrumentation(enabled: bool = True):
+    """
+    Enable or disable counting and timing the calls into wgpu-native. The
+    results are shown in the ``wgpu.diagnostics.native_calls`` topic, which
+    can be reset with ``wgpu.diagnostics.native_calls.reset()``. When
+    disabled, this has no overhead.
+    """
+    libf._set_instrumented(bool(enabled))
+
+
+def set_poll_thread(device, enabled: bool = True):
+    """
+    Enable or disable a background thread that polls the given device. The
+    thread waits for submitted work to finish, and resolves the promises
+    of e.g. ``buffer.map_async()`` and ``queue.read_buffer_async()`` as soon as
+    their results are available. This way, ``promise.sync_wait()`` wakes up
+    right away, instead of polling at an interval, and awaiting a promise
+    with a loop works without anyone polling the device.
+    """
+    if not isinstance(device, GPUDevice):
+        raise TypeError("set_poll_thread() needs a GPUDevice.")
+    device._set_poll_thread(bool(enabled))
+
+
+def set_bitmap_present_depth(canvas_context, depth: int = 2):
+    """
+    Set the number of frames that can be read back at the same time, when
+    the canvas context presents via a bitmap (e.g. offscreen canvases). With a
+    depth of N, the readback of a frame happens while the next N - 1 frames
+    are being rendered, so the presented bitmaps lag N - 1 frames behind,
+    and the first N - 1 presents are skipped. The default depth of a canvas
+    context is 1.
+    """
+    if not isinstance(canvas_context, GPUCanvasContext):
+        raise TypeError("set_bitmap_present_depth() needs a GPUCanvasContext.")
+    depth = int(depth)
+    if depth < 1:
+        raise ValueError("The bitmap present depth must be at least 1.")
+    canvas_context._bitmap_readback_depth = depth
+    canvas_context._bitmap_readbacks.clear()
+
+
 def set_instance_extras(
     backends: Sequence[str] = ("All",),
     flags: Sequence[str] = ("Default",),
@@ -0,0 +1,216 @@
+"""
+Find the fastest workgroup size for a compute shader, and remember it.
+"""
+
+import os
+import json
+import time
+import hashlib
+
+import wgpu.utils
+from .compute import ComputeKernel, _get_dispatch_counts
+
+
+def get_autotune_cache_file():
+    """Get the path of the file where autotune results are stored.
+
+    This is ``~/.cache/wgpu/autotune.json``, unless the ``WGPU_AUTOTUNE_CACHE``
+    environment variable is set.
+    """
+    filename = os.getenv("WGPU_AUTOTUNE_CACHE", "").strip()
+    if not filename:
+        filename = os.path.join(
+            os.path.expanduser("~"), ".cache", "wgpu", "autotune.json"
+        )
+    return filename
+
+
+def autotune_workgroup_size(
+    shader,
+    input_arrays,
+    output_arrays,
+    *,
+    constant="workgroup_size",
+    candidates=(32, 64, 128, 256),
+    constants=None,
+    n=None,
+    repeats=5,
+    device=None,
+    cache_file=None,
+):
+    """Benchmark a compute shader for a series of workgroup sizes, and return the fastest.
+
+    The shader must declare its workgroup size using an override constant, e.g.
+    ``override workgroup_size: u32 = 64;`` and ``@workgroup_size(workgroup_size)``.
+    For each candidate, the shader is run with the given arrays (see
+    ``compute_with_buffers()``). If the device has the "timestamp-query"
+    feature, the duration of the compute pass is measured on the GPU.
+    Otherwise the wall clock time to run the dispatch is used.
+
+    The result is stored in a cache file, keyed by the adapter summary and
+    a hash of the shader, so that subsequent calls (also in other processes)
+    return the result right away.
+
+    Arguments:
+        shader (str or bytes): The shader as a string of WGSL code or SpirV bytes.
+        input_arrays (dict): A dict mapping int bindings to arrays.
+        output_arrays (dict): A dict mapping int bindings to output shapes.
+        constant (str): The name of the override constant. Default "workgroup_size".
+        candidates (tuple): The workgroup sizes to try. Sizes that exceed the
+            device limits are skipped.
+        constants (dict, optional): Other override constants.
+        n (callable, optional): A function that gets the workgroup size, and
+            returns the dispatch counts (an int or 3-tuple). By default, the
+            length of the first output array is divided by the workgroup size.
+        repeats (int): The number of runs per candidate. The fastest run counts.
+        device (GPUDevice, optional): The device to use. Default
+            ``get_default_device()``.
+        cache_file (str, optional): The file to store results in. Default
+            ``get_autotune_cache_file()``. Set to ``False`` to not use a cache.
+
+    Returns:
+        workgroup_size (int): The fastest of the candidates.
+    """
+    device = device or wgpu.utils.get_default_device()
+
+    # Select candidates that the device supports
+    max_size = min(
+        device.limits["max-compute-invocations-per-workgroup"],
+        device.limits["max-compute-workgroup-size-x"],
+    )
+    candidates = [int(c) for c in candidates if 0 < int(c) <= max_size]
+    if not candidates:
+        raise ValueError("None of the workgroup size candidates is supported.")
+
+    # Check the cache
+    if cache_file is None:
+        cache_file = get_autotune_cache_file()
+    key = _get_cache_key(device, shader, constant, constants)
+    if cache_file:
+        entry = _read_cache(cache_file).get(key, None)
+        if entry and entry.get("workgroup_size") in candidates:
+            return entry["workgroup_size"]
+
+    # Benchmark each candidate
+    use_timestamps = "timestamp-query" in device.features
+    timings = {}
+    for workgroup_size in candidates:
+        kernel = ComputeKernel(
+            shader,
+            input_arrays.keys(),
+            output_arrays,
+            {**(constants or {}), constant: workgroup_size},
+            device=device,
+        )
+        if n is None:
+            length = next(iter(kernel._output_infos.values()))["length"]
+            dispatch = -(-length // workgroup_size)
+        else:
+            dispatch = n(workgroup_size)
+        dispatch = _get_dispatch_counts(dispatch, kernel._output_infos)
+        if use_timestamps:
+            timings[workgroup_size] = _time_with_timestamps(
+                kernel, input_arrays, dispatch, repeats
+            )
+        else:
+            timings[workgroup_size] = _time_with_clock(
+                kernel, input_arrays, dispatch, repeats
+            )
+    best = min(timings, key=timings.get)
+
+    # Store the result
+    if cache_file:
+        entry = {
+            "workgroup_size": best,
+            "timings": {str(c): t for c, t in timings.items()},
+            "method": "timestamps" if use_timestamps else "clock",
+        }
+        _write_cache(cache_file, key, entry)
+
+    return best
+
+
+def _time_with_timestamps(kernel, input_arrays, dispatch, repeats):
+    device = kernel.device
+    bind_group = kernel._upload(input_arrays)
+    query_set = device.create_query_set(type="timestamp", count=2 * repeats)
+    query_buffer = device.create_buffer(
+        size=8 * 2 * repeats,
+        usage=wgpu.BufferUsage.QUERY_RESOLVE | wgpu.BufferUsage.COPY_SRC,
+    )
+    command_encoder = device.create_command_encoder()
+    for i in range(-1, repeats):
+        timestamp_writes = None
+        if i >= 0:  # the first pass is a warmup
+            timestamp_writes = {
+                "query_set": query_set,
+                "beginning_of_pass_write_index": 2 * i,
+                "end_of_pass_write_index": 2 * i + 1,
+            }
+        compute_pass = command_encoder.begin_compute_pass(
+            timestamp_writes=timestamp_writes
+        )
+        compute_pass.set_pipeline(kernel._pipeline)
+        compute_pass.set_bind_group(0, bind_group)
+        compute_pass.dispatch_workgroups(*dispatch)
+        compute_pass.end()
+    command_encoder.resolve_query_set(query_set, 0, 2 * repeats, query_buffer, 0)
+    device.queue.submit([command_encoder.finish()])
+    timestamps = device.queue.read_buffer(query_buffer).cast("Q").tolist()
+    durations = [timestamps[2 * i + 1] - timestamps[2 * i] for i in range(repeats)]
+    return min(durations) / 1e9
+
+
+def _time_with_clock(kernel, input_arrays, dispatch, repeats):
+    device = kernel.device
+    bind_group = kernel._upload(input_arrays)
+    durations = []
+    for i in range(-1, repeats):
+        command_encoder = device.create_command_encoder()
+        compute_pass = command_encoder.begin_compute_pass()
+        compute_pass.set_pipeline(kernel._pipeline)
+        compute_pass.set_bind_group(0, bind_group)
+        compute_pass.dispatch_workgroups(*dispatch)
+        compute_pass.end()
+        command_buffer = command_encoder.finish()
+        t0 = time.perf_counter()
+        device.queue.submit([command_buffer])
+        # Block until the work is done, rather than polling with naps, which
+        # would round the durations up to the nap times.
+        device.queue.on_submitted_work_done_sync()
+        if i >= 0:  # the first run is a warmup
+            durations.append(time.perf_counter() - t0)
+    return min(durations)
+
+
+def _get_cache_key(device, shader, constant, constants):
+    if isinstance(shader, str):
+        shader = shader.encode()
+    shader_hash = hashlib.sha256(bytes(shader))
+    shader_hash.update(constant.encode())
+    for name, value in sorted((constants or {}).items(), key=str):
+        shader_hash.update(f"{name}={value}".encode())
+    return f"{device.adapter.summary} | {shader_hash.hexdigest()}"
+
+
+def _read_cache(filename):
+    try:
+        with open(filename, "rb") as f:
+            cache = json.loads(f.read().decode())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _write_cache(filename, key, entry):
+    cache = _read_cache(filename)
+    cache[key] = entry
+    # Write to a temporary file first, so the cache is never half-written
+    tmp_filename = f"{filename}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+        with open(tmp_filename, "wb") as f:
+            f.write(json.dumps(cache, indent=2).encode())
+        os.replace(tmp_filename, filename)
+    except OSError:
+        pass  # the cache is an optimization, not being able to write it is fine
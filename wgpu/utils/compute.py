@@ -3,8 +3,10 @@ Simple high-level utilities for doing compute on the GPU.
 """
 
 import ctypes
+import threading
 
 import wgpu.utils
+from .._coreutils import get_numpy
 
 
 def compute_with_buffers(input_arrays, output_arrays, shader, constants=None, n=None):
@@ -24,9 +26,11 @@ def compute_with_buffers(input_arrays, output_arrays, shader, constants=None, n=
             the buffer. If the value is a tuple, its last element
             specifies the format (see below), and the preceding elements
             specify the shape. These are used to ``cast()`` the
-            memoryview object before it is returned. If the value is a
-            ctypes array type, the result will be cast to that instead
-            of a memoryview. Note that any buffer that is NOT in the
+            memoryview object before it is returned. If the format is a
+            numpy dtype (e.g. ``(100, 4, numpy.float32)``), the result is
+            a numpy array that wraps the memory, without a copy. If the
+            value is a ctypes array type, the result will be cast to that
+            instead of a memoryview. Note that any buffer that is NOT in the
             output arrays dict will be considered readonly in the shader.
         shader (str or bytes): The shader as a string of WGSL code or SpirV bytes.
         constants (dict, optional): provide override constants
@@ -35,7 +39,8 @@ def compute_with_buffers(input_arrays, output_arrays, shader, constants=None, n=
             the length of the first output array type is used.
 
     Returns:
-        output (dict): A dict mapping int bindings to memoryviews.
+        output (dict): A dict mapping int bindings to memoryviews (or numpy
+        or ctypes arrays).
 
     The format characters to cast a ``memoryview`` are hard to remember, so
     here's a refresher:
@@ -44,18 +49,595 @@ def compute_with_buffers(input_arrays, output_arrays, shader, constants=None, n=
     * "h" and "H" are signed and unsigned 16-bit ints.
     * "i" and "I" are signed and unsigned 32-bit ints.
     * "e" and "f" are 16-bit and 32-bit floats.
+
+    This function is a thin wrapper around a ``ComputeKernel``. The shader
+    modules and pipelines of the most recently used kernels are cached, so that
+    calling this function repeatedly with the same shader and bindings does not
+    compile the shader again. The buffers are created for each call, and
+    released afterwards. Use ``clear_kernel_cache()`` to release the cached
+    pipelines. This function is thread-safe: a kernel is never used by two
+    threads at the same time. Use a ``ComputeKernel`` directly for more control,
+    e.g. to reuse the buffers.
     """
 
     # Check input arrays
     if not isinstance(input_arrays, dict):  # empty is ok
         raise TypeError("input_arrays must be a dict.")
-    for key, array in input_arrays.items():
-        if not isinstance(key, int):
-            raise TypeError("keys of input_arrays must be int.")
-        # Simply wrapping in a memoryview ensures that it supports the buffer protocol
-        memoryview(array)
 
-    # Check output arrays
+    # Get a kernel, reusing it if this function was called with the same
+    # shader and bindings before. The kernel is taken out of the cache while
+    # it runs, so that other threads do not use the same buffers. The buffers
+    # are released afterwards, so the cache does not hold on to them.
+    key = _get_kernel_key(shader, input_arrays, output_arrays, constants)
+    kernel = None
+    if key is not None:
+        with _kernel_cache_lock:
+            kernel = _kernel_cache.pop(key, None)
+    if kernel is None:
+        kernel = ComputeKernel(shader, input_arrays.keys(), output_arrays, constants)
+
+    try:
+        result = kernel.run(input_arrays, n)
+    finally:
+        kernel._release_buffers()
+
+    if key is not None:
+        with _kernel_cache_lock:
+            _kernel_cache[key] = kernel  # (re)insert as most recently used
+            while len(_kernel_cache) > _kernel_cache_size:
+                _kernel_cache.pop(next(iter(_kernel_cache)))
+    return result
+
+
+def clear_kernel_cache():
+    """Clear the kernels cached by ``compute_with_buffers()``.
+
+    This releases the shader modules and pipelines of these kernels (once they
+    are no longer in use).
+    """
+    with _kernel_cache_lock:
+        _kernel_cache.clear()
+
+
+class ComputeKernel:
+    """A compute shader, compiled and ready to be run many times.
+
+    Creating the shader module, the layouts and the pipeline is done once,
+    when the kernel is created. The storage buffers are created on the first
+    run, and reused in subsequent runs, as long as the sizes of the input
+    arrays do not change.
+
+    Arguments:
+        shader (str or bytes): The shader as a string of WGSL code or SpirV bytes.
+        input_bindings (iterable): The int bindings of the input arrays.
+        output_arrays (dict): A dict mapping int bindings to output shapes.
+            See ``compute_with_buffers()`` for details. Any binding that is
+            not in the output arrays will be considered readonly in the shader.
+        constants (dict, optional): provide override constants
+        entry_point (str): The name of the shader's entry point. Default "main".
+        device (GPUDevice, optional): The device to use. Default
+            ``get_default_device()``.
+    """
+
+    def __init__(
+        self,
+        shader,
+        input_bindings,
+        output_arrays,
+        constants=None,
+        *,
+        entry_point="main",
+        device=None,
+    ):
+        input_bindings = tuple(input_bindings)
+        for key in input_bindings:
+            if not isinstance(key, int):
+                raise TypeError("keys of input_arrays must be int.")
+        self._input_bindings = input_bindings
+        self._output_infos = _get_output_infos(output_arrays)
+        self._device = device or wgpu.utils.get_default_device()
+        device = self._device
+
+        # Compile the shader
+        self._compute = {
+            "module": device.create_shader_module(code=shader),
+            "entry_point": entry_point,
+        }
+        if constants:
+            self._compute["constants"] = constants
+
+        # Create the layouts and the pipeline
+        self._bind_group_layout, self._pipeline = self._create_pipeline(False)
+        self._batch_pipeline = None
+
+        # The buffers and bind group are created on demand
+        self._buffers = {}
+        self._bind_group = None
+
+    @property
+    def device(self):
+        """The device that this kernel runs on."""
+        return self._device
+
+    def run(self, input_arrays, n=None):
+        """Upload the given input arrays, run the shader, and return the output arrays.
+
+        Arguments:
+            input_arrays (dict): A dict mapping int bindings to arrays. The
+                keys must match the kernel's input bindings. The sizes of the
+                arrays may differ between runs, but the buffers can only be
+                reused when they don't.
+            n (int, tuple, optional): The dispatch counts. Can be an int
+                or a 3-tuple of ints to specify (x, y, z). If not given or None,
+                the length of the first output array type is used.
+
+        Returns:
+            output (dict): A dict mapping int bindings to memoryviews (or numpy or ctypes arrays).
+        """
+        device = self._device
+        nx, ny, nz = _get_dispatch_counts(n, self._output_infos)
+
+        bind_group = self._upload(input_arrays)
+
+        command_encoder = device.create_command_encoder()
+        # Buffers that are only output start out zeroed, like new buffers would
+        for index in self._output_infos:
+            if index not in self._input_bindings:
+                command_encoder.clear_buffer(self._buffers[index])
+        compute_pass = command_encoder.begin_compute_pass()
+        compute_pass.set_pipeline(self._pipeline)
+        compute_pass.set_bind_group(0, bind_group)
+        compute_pass.dispatch_workgroups(nx, ny, nz)
+        compute_pass.end()
+        device.queue.submit([command_encoder.finish()])
+
+        return self._read_outputs()
+
+    def run_chunked(self, input_arrays, out, *, chunk_size=None, n=None, depth=2):
+        """Stream (large) arrays through the kernel in chunks.
+
+        Each array is split along its first dimension in chunks of
+        ``chunk_size`` rows, and the kernel is run once per chunk. All input
+        and output arrays must have the same number of rows. The bound
+        buffers hold a single chunk, so the shader can use ``arrayLength()``
+        to know how many elements to process. The kernel's output shapes are
+        not used in this mode; only its bindings matter.
+
+        Uploads and readbacks are pipelined: ``depth`` sets of buffers are
+        used, so that a chunk can be uploaded and computed while the
+        result of the previous chunk is being read back. This way arrays
+        that are much larger than the device's
+        ``max-storage-buffer-binding-size``, e.g. ``numpy.memmap`` files,
+        can be processed with bounded host and device memory.
+
+        Arguments:
+            input_arrays (dict): A dict mapping int bindings to C-contiguous arrays.
+            out (dict): A dict mapping the kernel's output bindings to
+                writable C-contiguous arrays that receive the result.
+            chunk_size (int, optional): The number of rows per chunk. By default
+                the largest number of rows that fits in a buffer of
+                ``max-storage-buffer-binding-size``, capped at 64 MiB.
+            n (int, tuple, callable, optional): The dispatch counts. If a
+                callable, it is called with the number of rows in the chunk,
+                and must return an int or 3-tuple. If not given or None, the
+                number of rows in the chunk is used.
+            depth (int): The number of chunks in flight. Default 2.
+
+        Returns:
+            out (dict): The given ``out`` dict.
+        """
+        device = self._device
+        queue = device.queue
+
+        self._check_input_arrays(input_arrays)
+        if not isinstance(out, dict):
+            raise TypeError("out must be a dict.")
+        if set(out) != set(self._output_infos):
+            raise ValueError(
+                f"out keys {sorted(out)} do not match "
+                f"the kernel's output bindings {sorted(self._output_infos)}."
+            )
+        depth = max(1, int(depth))
+
+        # Get byte views and the size of a row for each array. A binding can
+        # be both input and output, so these are tracked separately.
+        input_views, output_views = {}, {}
+        row_sizes, nrows_per_array = {}, set()
+        for views, arrays in [(input_views, input_arrays), (output_views, out)]:
+            for index, array in arrays.items():
+                m = memoryview(array)
+                if m.ndim == 0 or m.shape[0] == 0:
+                    raise ValueError(f"Array for binding {index} must have rows.")
+                nrows_per_array.add(m.shape[0])
+                row_size = m.nbytes // m.shape[0]
+                if row_sizes.setdefault(index, row_size) != row_size:
+                    raise ValueError(
+                        f"The input and output arrays for binding {index} "
+                        "must have the same row size."
+                    )
+                views[index] = m.cast("B")  # fails if not contiguous
+        for index, view in output_views.items():
+            if view.readonly:
+                raise ValueError(f"Array in out for binding {index} is readonly.")
+        if len(nrows_per_array) != 1:
+            raise ValueError("All arrays must have the same number of rows.")
+        nrows = nrows_per_array.pop()
+
+        # Determine chunk size
+        if chunk_size is None:
+            max_size = min(device.limits["max-storage-buffer-binding-size"], 2**26)
+            chunk_size = max(1, max_size // max(row_sizes.values()))
+        chunk_size = min(int(chunk_size), nrows)
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1.")
+        last_chunk_size = nrows - (nrows - 1) // chunk_size * chunk_size
+        for index, row_size in row_sizes.items():
+            for size in (chunk_size, last_chunk_size):
+                if (size * row_size) % 4:
+                    raise ValueError(
+                        f"The chunks for binding {index} must be a multiple of 4 bytes."
+                    )
+
+        # Create the buffers, one set for each chunk in flight
+        slots = []
+        for _ in range(min(depth, -(-nrows // chunk_size))):
+            buffers = {}
+            for index in (*self._input_bindings, *self._output_infos):
+                if index not in buffers:
+                    buffers[index] = device.create_buffer(
+                        size=chunk_size * row_sizes[index],
+                        usage=self._get_buffer_usage(index),
+                    )
+            slots.append({"buffers": buffers, "bind_groups": {}, "promises": []})
+
+        for chunk_index, row0 in enumerate(range(0, nrows, chunk_size)):
+            rows = min(chunk_size, nrows - row0)
+            slot = slots[chunk_index % len(slots)]
+            buffers = slot["buffers"]
+
+            # Wait for the readback of the chunk that last used these buffers
+            for promise in slot["promises"]:
+                promise.sync_wait()
+
+            # Upload
+            for index in self._input_bindings:
+                row_size = row_sizes[index]
+                data = input_views[index][row0 * row_size : (row0 + rows) * row_size]
+                queue.write_buffer(buffers[index], 0, data)
+
+            # Get the bind group for this number of rows (the last chunk can be smaller)
+            bind_group = slot["bind_groups"].get(rows)
+            if bind_group is None:
+                bindings = []
+                for index, buffer in buffers.items():
+                    resource = {
+                        "buffer": buffer,
+                        "offset": 0,
+                        "size": rows * row_sizes[index],
+                    }
+                    bindings.append({"binding": index, "resource": resource})
+                bind_group = device.create_bind_group(
+                    layout=self._bind_group_layout, entries=bindings
+                )
+                slot["bind_groups"][rows] = bind_group
+
+            # Compute
+            nx, ny, nz = _get_dispatch_counts(
+                n(rows) if callable(n) else (rows if n is None else n),
+                self._output_infos,
+            )
+            command_encoder = device.create_command_encoder()
+            for index in self._output_infos:
+                if index not in self._input_bindings:
+                    command_encoder.clear_buffer(buffers[index])
+            compute_pass = command_encoder.begin_compute_pass()
+            compute_pass.set_pipeline(self._pipeline)
+            compute_pass.set_bind_group(0, bind_group)
+            compute_pass.dispatch_workgroups(nx, ny, nz)
+            compute_pass.end()
+            queue.submit([command_encoder.finish()])
+
+            # Start the readback, directly into the output arrays
+            slot["promises"] = []
+            for index in self._output_infos:
+                row_size = row_sizes[index]
+                target = output_views[index][row0 * row_size : (row0 + rows) * row_size]
+                promise = queue.read_buffer_async(
+                    buffers[index], 0, rows * row_size, out=target
+                )
+                slot["promises"].append(promise)
+
+        for slot in slots:
+            for promise in slot["promises"]:
+                promise.sync_wait()
+
+        return out
+
+    def run_batch(self, input_sets, n=None):
+        """Run the kernel for many independent sets of input arrays at once.
+
+        All sets are packed into one input buffer and one output buffer, at
+        aligned offsets. The kernel is dispatched once per set, using
+        dynamic offsets, all in a single submit. The outputs of all sets
+        are read back with a single transfer.
+
+        This is much faster than calling ``run()`` for each set when there
+        are many small problems. The arrays for a given binding must have
+        the same size in all sets. The number of bindings is limited by the
+        device's ``max-dynamic-storage-buffers-per-pipeline-layout``.
+
+        Arguments:
+            input_sets (list): A list of dicts mapping int bindings to arrays,
+                like the ``input_arrays`` of ``run()``.
+            n (int, tuple, optional): The dispatch counts for each set. See ``run()``.
+
+        Returns:
+            outputs (list): A list of dicts mapping int bindings to
+            memoryviews (or numpy or ctypes arrays), one for each input set.
+        """
+        device = self._device
+        input_sets = list(input_sets)
+        if not input_sets:
+            return []
+        nx, ny, nz = _get_dispatch_counts(n, self._output_infos)
+
+        # Check inputs and get the size of each binding
+        item_sizes = {
+            index: info["nbytes"] for index, info in self._output_infos.items()
+        }
+        views = []
+        for input_arrays in input_sets:
+            self._check_input_arrays(input_arrays)
+            views.append(
+                {
+                    i: _as_contiguous_memoryview(a).cast("B")
+                    for i, a in input_arrays.items()
+                }
+            )
+        for index in self._input_bindings:
+            sizes = {m[index].nbytes for m in views}
+            if len(sizes) != 1:
+                raise ValueError(
+                    f"The arrays for binding {index} must have the same size in each set."
+                )
+            item_sizes[index] = sizes.pop()
+            info = self._output_infos.get(index)
+            if info is not None and info["nbytes"] != item_sizes[index]:
+                raise ValueError(
+                    f"The arrays for binding {index} must match the output size."
+                )
+
+        # Layout of the buffers. The output buffer also holds the input arrays
+        # that are used as output. Each binding gets a region, where each set
+        # has an aligned slot.
+        alignment = device.limits["min-storage-buffer-offset-alignment"]
+        nsets = len(input_sets)
+        strides, offsets = {}, {}
+        buffer_sizes = {"in": 0, "out": 0}
+        for index in sorted(item_sizes):
+            key = "out" if index in self._output_infos else "in"
+            strides[index] = -(-max(item_sizes[index], 4) // alignment) * alignment
+            offsets[index] = buffer_sizes[key]
+            buffer_sizes[key] += nsets * strides[index]
+        max_buffer_size = device.limits["max-buffer-size"]
+        if max(buffer_sizes.values()) > max_buffer_size:
+            raise ValueError(
+                f"The batch is too large ({max(buffer_sizes.values())} bytes), use smaller batches."
+            )
+
+        # Pack the data of all sets, and upload with a single write per buffer
+        datas = {key: bytearray(size) for key, size in buffer_sizes.items() if size}
+        for index in self._input_bindings:
+            key = "out" if index in self._output_infos else "in"
+            data, size = datas[key], item_sizes[index]
+            for i, m in enumerate(views):
+                offset = offsets[index] + i * strides[index]
+                data[offset : offset + size] = m[index]
+        buffers = {}
+        for key, data in datas.items():
+            usage = wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.COPY_DST
+            if key == "out":
+                usage |= wgpu.BufferUsage.COPY_SRC
+            buffers[key] = device.create_buffer_with_data(data=data, usage=usage)
+
+        # Create the bind group
+        if self._batch_pipeline is None:
+            self._batch_pipeline = self._create_pipeline(True)
+        bind_group_layout, pipeline = self._batch_pipeline
+        bindings = []
+        for index in sorted(item_sizes):
+            key = "out" if index in self._output_infos else "in"
+            resource = {
+                "buffer": buffers[key],
+                "offset": offsets[index],
+                "size": -(-item_sizes[index] // 4) * 4,
+            }
+            bindings.append({"binding": index, "resource": resource})
+        bind_group = device.create_bind_group(
+            layout=bind_group_layout, entries=bindings
+        )
+
+        # Dispatch for each set
+        command_encoder = device.create_command_encoder()
+        compute_pass = command_encoder.begin_compute_pass()
+        compute_pass.set_pipeline(pipeline)
+        for i in range(nsets):
+            dynamic_offsets = [i * strides[index] for index in sorted(item_sizes)]
+            compute_pass.set_bind_group(0, bind_group, dynamic_offsets)
+            compute_pass.dispatch_workgroups(nx, ny, nz)
+        compute_pass.end()
+        device.queue.submit([command_encoder.finish()])
+
+        # Read all outputs at once
+        m = device.queue.read_buffer(buffers["out"])
+        outputs = []
+        for i in range(nsets):
+            output = {}
+            for index, info in self._output_infos.items():
+                offset = offsets[index] + i * strides[index]
+                output[index] = _cast_output(m[offset : offset + info["nbytes"]], info)
+            outputs.append(output)
+        return outputs
+
+    def _create_pipeline(self, has_dynamic_offset):
+        """Create the bind group layout, with a binding for each buffer,
+        and the pipeline.
+        """
+        device = self._device
+        binding_layouts = []
+        storage_types = (
+            wgpu.BufferBindingType.read_only_storage,
+            wgpu.BufferBindingType.storage,
+        )
+        bindings = list(self._input_bindings)
+        bindings += [i for i in self._output_infos if i not in bindings]
+        for index in sorted(bindings):
+            binding_layouts.append(
+                {
+                    "binding": index,
+                    "visibility": wgpu.ShaderStage.COMPUTE,
+                    "buffer": {
+                        "type": storage_types[index in self._output_infos],
+                        "has_dynamic_offset": has_dynamic_offset,
+                    },
+                }
+            )
+        bind_group_layout = device.create_bind_group_layout(entries=binding_layouts)
+        pipeline_layout = device.create_pipeline_layout(
+            bind_group_layouts=[bind_group_layout]
+        )
+        pipeline = device.create_compute_pipeline(
+            layout=pipeline_layout,
+            compute=self._compute,
+        )
+        return bind_group_layout, pipeline
+
+    def _check_input_arrays(self, input_arrays):
+        if not isinstance(input_arrays, dict):
+            raise TypeError("input_arrays must be a dict.")
+        if set(input_arrays) != set(self._input_bindings):
+            raise ValueError(
+                f"input_arrays keys {sorted(input_arrays)} do not match "
+                f"the kernel's input bindings {sorted(self._input_bindings)}."
+            )
+
+    def _get_buffer_usage(self, index):
+        # Inputs are written to, outputs are read from, and output-only
+        # buffers are cleared.
+        usage = wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.COPY_DST
+        if index in self._output_infos:
+            usage |= wgpu.BufferUsage.COPY_SRC
+        return usage
+
+    def _upload(self, input_arrays):
+        """Write the input arrays to the buffers, creating buffers as needed.
+        Returns the bind group.
+        """
+        self._check_input_arrays(input_arrays)
+
+        device = self._device
+        buffers = self._buffers
+        for index in self._input_bindings:
+            m = _as_contiguous_memoryview(input_arrays[index])
+            buffer = buffers.get(index)
+            if buffer is None or buffer.size != m.nbytes:
+                usage = self._get_buffer_usage(index)
+                buffers[index] = device.create_buffer_with_data(data=m, usage=usage)
+                self._bind_group = None
+            else:
+                device.queue.write_buffer(buffer, 0, m)
+        for index, info in self._output_infos.items():
+            if index not in buffers:
+                usage = self._get_buffer_usage(index)
+                buffers[index] = device.create_buffer(size=info["nbytes"], usage=usage)
+                self._bind_group = None
+
+        if self._bind_group is None:
+            bindings = []
+            for index, buffer in buffers.items():
+                bindings.append(
+                    {
+                        "binding": index,
+                        "resource": {
+                            "buffer": buffer,
+                            "offset": 0,
+                            "size": buffer.size,
+                        },
+                    }
+                )
+            self._bind_group = device.create_bind_group(
+                layout=self._bind_group_layout, entries=bindings
+            )
+        return self._bind_group
+
+    def _release_buffers(self):
+        """Release the buffers and bind group, keeping the pipeline."""
+        self._buffers = {}
+        self._bind_group = None
+
+    def _read_outputs(self):
+        """Read the current data of the output buffers."""
+        output = {}
+        for index, info in self._output_infos.items():
+            buffer = self._buffers[index]
+            m = self._device.queue.read_buffer(buffer)  # slow, can also be done async
+            output[index] = _cast_output(m, info)
+        return output
+
+
+def _cast_output(m, info):
+    """Cast the memoryview of an output buffer according to its info dict."""
+    if "ctypes_array_type" in info:
+        return info["ctypes_array_type"].from_buffer(m)
+    elif "dtype" in info:
+        # Wrap the memory, without copying
+        np = get_numpy()
+        return np.frombuffer(m, info["dtype"]).reshape(info["shape"])
+    else:
+        return m.cast(info["format"], shape=info["shape"])
+
+
+def _get_numpy_dtype(format):
+    """Get a numpy dtype from a dtype or numpy scalar type, or None."""
+    np = get_numpy()
+    if np is None:
+        return None
+    if isinstance(format, np.dtype):
+        return format
+    elif isinstance(format, type) and issubclass(format, np.generic):
+        return np.dtype(format)
+    return None
+
+
+def _as_contiguous_memoryview(array):
+    """Get a C-contiguous memoryview of the array, copying only if necessary."""
+    # Simply wrapping in a memoryview ensures that it supports the buffer protocol
+    m = memoryview(array)
+    if not m.c_contiguous:
+        m = memoryview(m.tobytes())  # e.g. a strided numpy array
+    return m
+
+
+def _get_kernel_key(shader, input_arrays, output_arrays, constants):
+    """Get the key to cache a kernel for compute_with_buffers(), or None."""
+    if not isinstance(output_arrays, dict):
+        return None
+    try:
+        key = (
+            wgpu.utils.get_default_device(),
+            shader,
+            tuple(input_arrays),
+            tuple(output_arrays.items()),
+            frozenset(constants.items()) if constants else None,
+        )
+        hash(key)
+    except TypeError:
+        return None  # not hashable, the kernel will raise a proper error
+    return key
+
+
+def _get_output_infos(output_arrays):
+    """Check the output arrays, and turn them into a dict of info dicts."""
     output_infos = {}
     if not isinstance(output_arrays, dict) or not output_arrays:
         raise TypeError("output_arrays must be a nonempty dict.")
@@ -73,12 +655,14 @@ def compute_with_buffers(input_arrays, output_arrays, shader, constants=None, n=
             }
         elif isinstance(array_descr, tuple):
             format = array_descr[-1]
-            try:
-                format_size = FORMAT_SIZES[format]
-            except KeyError:
-                raise ValueError(
-                    f"Invalid format for output array {key}: {format}"
-                ) from None
+            dtype = None
+            if isinstance(format, str):
+                format_size = FORMAT_SIZES.get(format, None)
+            else:
+                dtype = _get_numpy_dtype(format)
+                format_size = None if dtype is None else dtype.itemsize
+            if not format_size:
+                raise ValueError(f"Invalid format for output array {key}: {format}")
             shape = tuple(int(i) for i in array_descr[:-1])
             if not (shape and all(i > 0 for i in shape)):
                 raise ValueError(f"Invalid shape for output array {key}: {shape}")
@@ -91,6 +675,8 @@ def compute_with_buffers(input_arrays, output_arrays, shader, constants=None, n=
                 "format": format,
                 "shape": shape,
             }
+            if dtype is not None:
+                output_infos[key]["dtype"] = dtype
         elif isinstance(array_descr, type) and issubclass(array_descr, ctypes.Array):
             output_infos[key] = {
                 "length": array_descr._length_,
@@ -101,8 +687,11 @@ def compute_with_buffers(input_arrays, output_arrays, shader, constants=None, n=
             raise TypeError(
                 f"Invalid value for output array description: {array_descr}"
             )
+    return output_infos
 
-    # Get nx, ny, nz from n
+
+def _get_dispatch_counts(n, output_infos):
+    """Get nx, ny, nz from n."""
     if n is None:
         output_info = next(iter(output_infos.values()))
         nx, ny, nz = output_info["length"], 1, 1
@@ -114,90 +703,14 @@ def compute_with_buffers(input_arrays, output_arrays, shader, constants=None, n=
         raise TypeError("compute_with_buffers: n must be None, an int, or 3-int tuple.")
     if not (nx >= 1 and ny >= 1 and nz >= 1):
         raise ValueError("compute_with_buffers: n value(s) must be >= 1.")
+    return nx, ny, nz
 
-    # Create a device and compile the shader
-    device = wgpu.utils.get_default_device()
-    cshader = device.create_shader_module(code=shader)
-
-    # Create buffers for input and output arrays
-    buffers = {}
-    for index, array in input_arrays.items():
-        usage = wgpu.BufferUsage.STORAGE
-        if index in output_arrays:
-            usage |= wgpu.BufferUsage.COPY_SRC
-        buffer = device.create_buffer_with_data(data=array, usage=usage)
-        buffers[index] = buffer
-    for index, info in output_infos.items():
-        if index in input_arrays:
-            continue  # We already have this buffer
-        usage = wgpu.BufferUsage.STORAGE | wgpu.BufferUsage.COPY_SRC
-        buffers[index] = device.create_buffer(size=info["nbytes"], usage=usage)
-
-    # Create bindings and binding layouts
-    bindings = []
-    binding_layouts = []
-    for index, buffer in buffers.items():
-        bindings.append(
-            {
-                "binding": index,
-                "resource": {"buffer": buffer, "offset": 0, "size": buffer.size},
-            }
-        )
-        storage_types = (
-            wgpu.BufferBindingType.read_only_storage,
-            wgpu.BufferBindingType.storage,
-        )
-        binding_layouts.append(
-            {
-                "binding": index,
-                "visibility": wgpu.ShaderStage.COMPUTE,
-                "buffer": {
-                    "type": storage_types[index in output_infos],
-                    "has_dynamic_offset": False,
-                },
-            }
-        )
-
-    # Put buffers together
-    bind_group_layout = device.create_bind_group_layout(entries=binding_layouts)
-    pipeline_layout = device.create_pipeline_layout(
-        bind_group_layouts=[bind_group_layout]
-    )
-    bind_group = device.create_bind_group(layout=bind_group_layout, entries=bindings)
-
-    compute = {
-        "module": cshader,
-        "entry_point": "main",
-    }
-
-    if constants:
-        compute["constants"] = constants
-
-    # Create a pipeline and "run it"
-    compute_pipeline = device.create_compute_pipeline(
-        layout=pipeline_layout,
-        compute=compute,
-    )
-    command_encoder = device.create_command_encoder()
-    compute_pass = command_encoder.begin_compute_pass()
-    compute_pass.set_pipeline(compute_pipeline)
-    compute_pass.set_bind_group(0, bind_group)
-    compute_pass.dispatch_workgroups(nx, ny, nz)
-    compute_pass.end()
-    device.queue.submit([command_encoder.finish()])
-
-    # Read the current data of the output buffers
-    output = {}
-    for index, info in output_infos.items():
-        buffer = buffers[index]
-        # m = buffer.read_data()  # old API
-        m = device.queue.read_buffer(buffer)  # slow, can also be done async
-        if "ctypes_array_type" in info:
-            output[index] = info["ctypes_array_type"].from_buffer(m)
-        else:
-            output[index] = m.cast(info["format"], shape=info["shape"])
 
-    return output
+# Kernels used by compute_with_buffers(), most recently used last. These
+# are kept without buffers.
+_kernel_cache = {}
+_kernel_cache_size = 8
+_kernel_cache_lock = threading.Lock()
 
 
 FORMAT_SIZES = {"b": 1, "B": 1, "h": 2, "H": 2, "i": 4, "I": 4, "e": 2, "f": 4}
@@ -0,0 +1,284 @@
+"""
+Lazy evaluation of chained compute kernels, keeping intermediate results on the GPU.
+"""
+
+import weakref
+
+import wgpu.utils
+from .._coreutils import get_numpy
+from .compute import (
+    FORMAT_SIZES,
+    _as_contiguous_memoryview,
+    _cast_output,
+    _get_dispatch_counts,
+)
+
+
+class LazyArray:
+    """A handle to an array on the GPU, which may not have been computed yet.
+
+    Lazy arrays are created with ``ComputeGraph.array()`` and ``ComputeGraph.call()``.
+    They can be used as input to other calls, and their data can be obtained
+    with ``ComputeGraph.evaluate()``.
+    """
+
+    def __init__(self, graph, info, node=None):
+        self._graph = graph
+        self._info = info
+        self._node = node  # the node that computes this array, if pending
+        self._buffer = None
+        self._released = False
+
+    def __repr__(self):
+        state = "pending" if self._node is not None else "resident"
+        if self._released:
+            state = "released"
+        return f"<LazyArray {self.nbytes} bytes ({state}) at {hex(id(self))}>"
+
+    @property
+    def nbytes(self):
+        """The size of the array in bytes."""
+        return self._info["nbytes"]
+
+    @property
+    def pending(self):
+        """Whether this array is yet to be computed."""
+        return self._node is not None
+
+    def _set_buffer(self, buffer):
+        self._buffer = buffer
+        # Give the buffer back to the pool when the handle is deleted
+        self._finalizer = weakref.finalize(self, self._graph._release, buffer)
+
+    def _release(self):
+        # Called when this array was an intermediate result
+        self._finalizer()
+        self._buffer = None
+        self._released = True
+
+
+class ComputeGraph:
+    """A small lazy-evaluation layer for running ``ComputeKernel`` objects.
+
+    Calling a kernel via ``call()`` does not run it, but records it in the
+    graph, and returns ``LazyArray`` handles for its outputs. These can be
+    used as input for other calls, so that kernels can be chained without
+    reading intermediate results back to the CPU. A call to ``evaluate()``
+    encodes all needed dispatches in a single command buffer, and reads back
+    only the requested arrays.
+
+    Arrays that are computed during ``evaluate()`` but that are not passed to
+    it are considered intermediate: their buffers are given back to the
+    graph's pool as soon as they're no longer needed, so that they can be
+    reused by later calls, and the handles cannot be used anymore. The
+    buffers of the evaluated arrays stay on the GPU, and are returned to the
+    pool when their handle is deleted.
+
+    Arguments:
+        device (GPUDevice, optional): The device to use. Default
+            ``get_default_device()``.
+    """
+
+    def __init__(self, device=None):
+        self._device = device or wgpu.utils.get_default_device()
+        self._nodes = []  # pending calls, in order
+        self._pool = {}  # size -> list of free buffers
+
+    @property
+    def device(self):
+        """The device that this graph runs on."""
+        return self._device
+
+    def array(self, data):
+        """Upload the given data, and return a ``LazyArray`` for it.
+
+        The data can be anything that supports the buffer protocol. If it is
+        a numpy array, the evaluated result of this array will be one too.
+        """
+        m = _as_contiguous_memoryview(data)
+        info = {"nbytes": m.nbytes, "length": len(m) if m.ndim else 1}
+        np = get_numpy()
+        if np is not None and isinstance(data, np.ndarray):
+            info["dtype"] = data.dtype
+            info["shape"] = data.shape
+        elif m.format in FORMAT_SIZES and m.ndim:
+            info["format"] = m.format
+            info["shape"] = m.shape
+        else:
+            info["format"] = "B"
+            info["shape"] = (m.nbytes,)
+        array = LazyArray(self, info)
+        array._set_buffer(self._acquire(m.nbytes))
+        self._device.queue.write_buffer(array._buffer, 0, m.cast("B"))
+        return array
+
+    def call(self, kernel, input_arrays, n=None):
+        """Record a call to the given kernel.
+
+        Arguments:
+            kernel (ComputeKernel): The kernel to run. Its output descriptions
+                define the sizes of the output arrays.
+            input_arrays (dict): A dict mapping int bindings to ``LazyArray``
+                objects. Other arrays are uploaded with ``array()``.
+            n (int, tuple, optional): The dispatch counts. See ``ComputeKernel.run()``.
+
+        Returns:
+            output (dict): A dict mapping int bindings to ``LazyArray`` objects.
+        """
+        if kernel.device is not self._device:
+            raise ValueError("The kernel must use the same device as the graph.")
+        kernel._check_input_arrays(input_arrays)
+        inputs = {}
+        for index, array in input_arrays.items():
+            if not isinstance(array, LazyArray):
+                array = self.array(array)
+            elif array._graph is not self:
+                raise ValueError("Cannot use a LazyArray from another graph.")
+            elif array._released:
+                raise RuntimeError("Cannot use a LazyArray that was released.")
+            inputs[index] = array
+
+        node = {
+            "kernel": kernel,
+            "dispatch": _get_dispatch_counts(n, kernel._output_infos),
+            "inputs": inputs,
+            "outputs": {},
+        }
+        for index, info in kernel._output_infos.items():
+            if index in inputs:
+                # The input is copied, so that the input array is not affected
+                info = dict(info, nbytes=inputs[index].nbytes)
+            node["outputs"][index] = LazyArray(self, info, node)
+        self._nodes.append(node)
+        return dict(node["outputs"])
+
+    def evaluate(self, *arrays, keep=()):
+        """Compute the given arrays and read them back.
+
+        All pending calls needed to compute the given arrays are encoded in a
+        single command buffer and submitted at once. Pending calls that are
+        not needed remain in the graph.
+
+        Arguments:
+            arrays (LazyArray): The arrays to read.
+            keep (iterable): Arrays to compute and keep on the GPU, without
+                reading them back, e.g. to use as input later.
+
+        Returns:
+            result (list): The data for each of the given arrays, as
+            memoryviews (or numpy or ctypes arrays).
+        """
+        device = self._device
+        keep = tuple(keep)
+        targets = set()
+        for array in (*arrays, *keep):
+            if not isinstance(array, LazyArray) or array._graph is not self:
+                raise TypeError("evaluate() expects LazyArray objects of this graph.")
+            if array._released:
+                raise RuntimeError("Cannot evaluate a LazyArray that was released.")
+            targets.add(id(array))
+
+        # Select the nodes that are needed, walking back from the targets
+        needed = set()
+        stack = [a._node for a in (*arrays, *keep) if a._node is not None]
+        while stack:
+            node = stack.pop()
+            if id(node) not in needed:
+                needed.add(id(node))
+                for array in node["inputs"].values():
+                    if array._node is not None:
+                        stack.append(array._node)
+        nodes = [node for node in self._nodes if id(node) in needed]
+        self._nodes = [node for node in self._nodes if id(node) not in needed]
+
+        # Arrays that remain in use by pending nodes must not be released
+        in_use = set(targets)
+        for node in self._nodes:
+            in_use.update(id(a) for a in node["inputs"].values())
+
+        # Determine the last use of each array produced in this evaluation
+        produced = {id(a) for node in nodes for a in node["outputs"].values()}
+        last_use = {}
+        for i, node in enumerate(nodes):
+            for array in node["inputs"].values():
+                last_use[id(array)] = i
+
+        command_encoder = device.create_command_encoder()
+        for i, node in enumerate(nodes):
+            kernel = node["kernel"]
+            outputs = node["outputs"]
+            for index, array in outputs.items():
+                array._set_buffer(self._acquire(array.nbytes))
+                if index in node["inputs"]:
+                    src = node["inputs"][index]
+                    command_encoder.copy_buffer_to_buffer(
+                        src._buffer, 0, array._buffer, 0, src._buffer.size
+                    )
+                else:
+                    # Buffers from the pool can contain old data
+                    command_encoder.clear_buffer(array._buffer)
+
+            entries = []
+            for index, array in {**node["inputs"], **outputs}.items():
+                resource = {
+                    "buffer": array._buffer,
+                    "offset": 0,
+                    "size": array._buffer.size,
+                }
+                entries.append({"binding": index, "resource": resource})
+            bind_group = device.create_bind_group(
+                layout=kernel._bind_group_layout, entries=entries
+            )
+            compute_pass = command_encoder.begin_compute_pass()
+            compute_pass.set_pipeline(kernel._pipeline)
+            compute_pass.set_bind_group(0, bind_group)
+            compute_pass.dispatch_workgroups(*node["dispatch"])
+            compute_pass.end()
+
+            for array in outputs.values():
+                array._node = None
+
+            # Release intermediate arrays after their last use, so that the
+            # buffers can be reused by the next nodes.
+            for array in (*node["inputs"].values(), *outputs.values()):
+                if (
+                    id(array) in produced
+                    and id(array) not in in_use
+                    and last_use.get(id(array), -1) <= i
+                    and not array._released
+                ):
+                    array._release()
+
+        device.queue.submit([command_encoder.finish()])
+
+        # Read back the requested arrays
+        promises = [device.queue.read_buffer_async(a._buffer) for a in arrays]
+        result = []
+        for promise, array in zip(promises, arrays, strict=True):
+            m = promise.sync_wait()[: array.nbytes]
+            result.append(_cast_output(m, array._info))
+        return result
+
+    def _acquire(self, nbytes):
+        # Storage bindings must be a multiple of 4 bytes
+        size = max(4, -(-nbytes // 4) * 4)
+        free = self._pool.get(size)
+        if free:
+            return free.pop()
+        usage = (
+            wgpu.BufferUsage.STORAGE
+            | wgpu.BufferUsage.COPY_SRC
+            | wgpu.BufferUsage.COPY_DST
+        )
+        return self._device.create_buffer(size=size, usage=usage)
+
+    def _release(self, buffer):
+        self._pool.setdefault(buffer.size, []).append(buffer)
+
+    def clear(self):
+        """Drop pending calls, and release the buffers in the pool."""
+        self._nodes.clear()
+        for buffers in self._pool.values():
+            for buffer in buffers:
+                buffer.destroy()
+        self._pool.clear()
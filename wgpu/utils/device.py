@@ -1,4 +1,8 @@
+import threading
+
+
 _default_device = None
+_default_device_lock = threading.Lock()
 
 
 def get_default_device():
@@ -10,8 +14,12 @@ def get_default_device():
     global _default_device
 
     if _default_device is None:
-        import wgpu.backends.auto
+        with _default_device_lock:
+            if _default_device is None:
+                import wgpu.backends.auto
 
-        adapter = wgpu.gpu.request_adapter_sync(power_preference="high-performance")
-        _default_device = adapter.request_device_sync()
+                adapter = wgpu.gpu.request_adapter_sync(
+                    power_preference="high-performance"
+                )
+                _default_device = adapter.request_device_sync()
     return _default_device
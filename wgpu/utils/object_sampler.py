@@ -0,0 +1,165 @@
+"""
+Sample object counts over time, to detect leaks in long-running applications.
+"""
+
+import time
+import weakref
+import threading
+from collections import deque
+from itertools import pairwise
+
+import wgpu
+from .._coreutils import logger
+from .._diagnostics import DiagnosticsBase
+
+
+class ObjectCountSampler:
+    """Record object counts and memory at regular intervals, and detect growth.
+
+    Each sample contains the counts and resource memory of the wgpu objects
+    (the ``object_counts`` diagnostics), and, if available, the counts and
+    memory of the objects in wgpu-native (the ``wgpu_native_counts``
+    diagnostics, keys prefixed with "native."). Samples are stored in a ring
+    of ``history`` samples.
+
+    Samples can be taken by calling ``sample()``, e.g. once per frame, or by
+    calling ``start()``, which samples every ``interval`` seconds from a
+    background thread.
+
+    A value that did not decrease once in the samples in the ring, and that
+    is higher at the end than at the start, is considered a leak. A warning
+    is logged when a value starts to look like a leak. Leaks are available
+    via ``get_leaks()``, and via the ``wgpu.diagnostics.object_growth`` topic.
+
+    Arguments:
+        interval (float): The time between samples in seconds, when sampling
+            from a thread. Default 1.0.
+        history (int): The number of samples to keep. Default 600.
+        min_samples (int): The number of samples needed before leaks are
+            reported. Default 10.
+        native (bool): Whether to include the counts from wgpu-native. Default True.
+    """
+
+    _samplers = weakref.WeakSet()
+
+    def __init__(self, *, interval=1.0, history=600, min_samples=10, native=True):
+        self._interval = float(interval)
+        self._min_samples = max(2, int(min_samples))
+        self._native = bool(native)
+        self._samples = deque(maxlen=max(self._min_samples, int(history)))
+        self._leaks = set()  # the keys that were reported as leaking
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+        ObjectCountSampler._samplers.add(self)
+
+    def __repr__(self):
+        return (
+            f"<ObjectCountSampler with {len(self._samples)} samples at {hex(id(self))}>"
+        )
+
+    @property
+    def running(self):
+        """Whether the sampler is sampling from a background thread."""
+        return self._thread is not None
+
+    def sample(self):
+        """Take a sample now."""
+        counts = {}
+        for name, d in wgpu.diagnostics.object_counts.get_dict().items():
+            for key, value in d.items():
+                counts[f"{name}.{key}"] = value
+        native_topic = getattr(wgpu.diagnostics, "wgpu_native_counts", None)
+        if self._native and native_topic is not None:
+            for name, d in native_topic.get_dict().items():
+                counts[f"native.{name}.count"] = d["count"]
+                counts[f"native.{name}.mem"] = d["mem"]
+        with self._lock:
+            self._samples.append({"time": time.time(), "counts": counts})
+        self._check_leaks()
+
+    def start(self):
+        """Start sampling every ``interval`` seconds from a background thread."""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._sample_loop, name="wgpu-object-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background sampling."""
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop_event.set()
+            thread.join()
+
+    def _sample_loop(self):
+        while not self._stop_event.is_set():
+            self.sample()
+            self._stop_event.wait(self._interval)
+
+    def get_samples(self):
+        """Get the samples in the ring.
+
+        Returns a list of dicts with fields "time" (as from ``time.time()``),
+        and "counts", a flat dict mapping names like "Buffer.count" and
+        "native.Buffer.mem" to values.
+        """
+        with self._lock:
+            return list(self._samples)
+
+    def get_leaks(self):
+        """Get the values that grew monotonically over the samples in the ring.
+
+        Returns a dict mapping names to dicts with the fields "first", "last"
+        and "growth". Returns an empty dict if there are less than
+        ``min_samples`` samples.
+        """
+        samples = self.get_samples()
+        if len(samples) < self._min_samples:
+            return {}
+        result = {}
+        for key in samples[-1]["counts"]:
+            values = [sample["counts"].get(key, 0) for sample in samples]
+            if values[-1] > values[0] and all(b >= a for a, b in pairwise(values)):
+                result[key] = {
+                    "first": values[0],
+                    "last": values[-1],
+                    "growth": values[-1] - values[0],
+                }
+        return result
+
+    def _check_leaks(self):
+        leaks = self.get_leaks()
+        for key in leaks.keys() - self._leaks:
+            d = leaks[key]
+            logger.warning(
+                f"Possible leak: {key} grew from {d['first']} to {d['last']} "
+                f"over the last {len(self._samples)} samples."
+            )
+        self._leaks = set(leaks)
+
+    def clear(self):
+        """Clear the samples."""
+        with self._lock:
+            self._samples.clear()
+        self._leaks.clear()
+
+
+class ObjectGrowthDiagnostics(DiagnosticsBase):
+    def get_subscript(self):
+        text = ""
+        text += "    * Values that grew monotonically, as detected by an ObjectCountSampler.\n"
+        return text
+
+    def get_dict(self):
+        result = {}
+        for sampler in list(ObjectCountSampler._samplers):
+            for key, d in sampler.get_leaks().items():
+                result[key] = d
+        return result
+
+
+object_growth_diagnostics = ObjectGrowthDiagnostics("object_growth")
@@ -0,0 +1,191 @@
+"""
+Collect pipeline statistics (shader invocations, primitives) of render and compute passes.
+"""
+
+import weakref
+from collections import deque
+
+from .._diagnostics import DiagnosticsBase
+from .profiler import _QueryRing
+from ..backends.wgpu_native.extras import (
+    PipelineStatisticName,
+    create_statistics_query_set,
+    begin_pipeline_statistics_query,
+    end_pipeline_statistics_query,
+)
+
+
+# The statistics, in the order in which they are written to the query set
+ALL_STATISTICS = tuple(PipelineStatisticName)
+
+
+class PipelineStatisticsProfiler(_QueryRing):
+    """Collect rolling pipeline statistics for labelled passes.
+
+    For each pass to collect statistics for, call ``begin(pass_encoder, label)``
+    after beginning the pass, and ``end(pass_encoder)`` before ending it. After
+    submitting the work of a frame, call ``end_frame()``. This resolves the
+    queries of the frame, and starts reading them back asynchronously.
+
+    Like the ``GpuProfiler``, this uses a ring of query sets, one for each frame
+    in flight, so that collecting the statistics does not stall the pipeline.
+    Only ``flush()`` waits for the GPU.
+    The statistics can be used to detect overdraw (many fragment shader
+    invocations) or over-dispatch (more compute invocations than expected).
+
+    This uses the pipeline statistics queries of the wgpu-native backend. The
+    device must have the "pipeline-statistics-query" feature. If it does not,
+    the profiler is disabled: ``begin()`` and ``end()`` do nothing.
+
+    The statistics are available via ``get_stats()``, and via the
+    ``wgpu.diagnostics.pipeline_statistics`` topic.
+
+    Arguments:
+        device (GPUDevice, optional): The device to use. Default
+            ``get_default_device()``.
+        name (str): The name of the profiler, used in the diagnostics.
+        statistics (sequence): The statistics to collect, see
+            ``create_statistics_query_set()``. Default all.
+        max_passes (int): The maximum number of passes to query per frame.
+        ring_size (int): The number of frames that can be in flight.
+        history (int): The number of frames over which statistics are calculated.
+    """
+
+    _profilers = weakref.WeakSet()
+    _feature = "pipeline-statistics-query"
+
+    def __init__(
+        self,
+        device=None,
+        *,
+        name="stats",
+        statistics=ALL_STATISTICS,
+        max_passes=32,
+        ring_size=3,
+        history=60,
+    ):
+        self._statistics = _normalize_statistics(statistics)
+        self._values = {}  # label -> {statistic -> deque of values}
+        self._active = set()  # ids of pass encoders with an active query
+        super().__init__(device, name, max_passes, ring_size, history)
+        PipelineStatisticsProfiler._profilers.add(self)
+
+    @property
+    def statistics(self):
+        """The names of the collected statistics."""
+        return self._statistics
+
+    @property
+    def enabled(self):
+        """Whether the device supports pipeline statistics queries."""
+        return bool(self._slots)
+
+    def _create_query_set(self):
+        return create_statistics_query_set(
+            self._device, count=self._max_passes, statistics=self._statistics
+        )
+
+    def _get_entry_size(self):
+        return 8 * len(self._statistics)
+
+    def begin(self, pass_encoder, label):
+        """Start collecting statistics for the given pass encoder.
+
+        Returns True if a query was started, and False if the profiler is
+        disabled or when ``max_passes`` passes were already queried in this
+        frame. If multiple passes in a frame have the same label, their
+        statistics are summed.
+        """
+        slot_index = self._add_pass(label)
+        if slot_index is None:
+            return False
+        slot, i = slot_index
+        begin_pipeline_statistics_query(pass_encoder, slot["query_set"], i)
+        self._active.add(id(pass_encoder))
+        return True
+
+    def end(self, pass_encoder):
+        """Stop collecting statistics for the given pass encoder.
+
+        Does nothing if ``begin()`` did not start a query for this pass.
+        """
+        if id(pass_encoder) in self._active:
+            self._active.discard(id(pass_encoder))
+            end_pipeline_statistics_query(pass_encoder)
+
+    def _collect_frame(self, values, labels):
+        nstats = len(self._statistics)
+        frame_values = {}
+        for i, label in enumerate(labels):
+            totals = frame_values.setdefault(label, [0] * nstats)
+            for j in range(nstats):
+                totals[j] += values[i * nstats + j]
+        for label, totals in frame_values.items():
+            label_values = self._values.get(label)
+            if label_values is None:
+                label_values = self._values[label] = {
+                    statistic: deque(maxlen=self._history)
+                    for statistic in self._statistics
+                }
+            for statistic, value in zip(self._statistics, totals, strict=True):
+                label_values[statistic].append(value)
+
+    def get_stats(self):
+        """Get the collected statistics.
+
+        Returns a dict that maps labels to dicts that map statistic names to
+        dicts with the fields "last", "mean", "min" and "max", calculated over
+        the last ``history`` frames.
+        """
+        result = {}
+        for label, label_values in self._values.items():
+            result[label] = {}
+            for statistic, values in label_values.items():
+                if values:
+                    result[label][statistic] = {
+                        "last": values[-1],
+                        "mean": sum(values) / len(values),
+                        "min": min(values),
+                        "max": max(values),
+                    }
+        return result
+
+    def clear(self):
+        """Clear the collected statistics."""
+        self._values.clear()
+
+
+def _normalize_statistics(statistics):
+    # Accept the same names as create_statistics_query_set(), and sort them in
+    # the order in which the results are written.
+    names = set()
+    for name in statistics:
+        key = str(name).replace("_", "-")
+        key = "".join("-" + c.lower() if c.isupper() else c for c in key)
+        key = key.lstrip("-")
+        if key not in ALL_STATISTICS:
+            raise ValueError(f"Invalid pipeline statistic: {name!r}")
+        names.add(key)
+    if not names:
+        raise ValueError("Need at least one pipeline statistic.")
+    return tuple(s for s in ALL_STATISTICS if s in names)
+
+
+class PipelineStatisticsDiagnostics(DiagnosticsBase):
+    def get_subscript(self):
+        text = ""
+        text += "    * Mean values over the profiler's recent history.\n"
+        return text
+
+    def get_dict(self):
+        result = {}
+        for profiler in list(PipelineStatisticsProfiler._profilers):
+            for label, stats in profiler.get_stats().items():
+                result[f"{profiler.name}.{label}"] = {
+                    statistic: round(values["mean"])
+                    for statistic, values in stats.items()
+                }
+        return result
+
+
+pipeline_statistics_diagnostics = PipelineStatisticsDiagnostics("pipeline_statistics")
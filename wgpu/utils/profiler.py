@@ -0,0 +1,270 @@
+"""
+Measure the GPU time of render and compute passes using timestamp queries.
+"""
+
+import weakref
+from collections import deque
+
+import wgpu.utils
+from .._diagnostics import DiagnosticsBase
+
+
+class _QueryRing:
+    """Base class for profilers that read back the queries of each frame,
+    using a ring of query sets, one for each frame in flight.
+
+    Subclasses set ``_feature`` and ``_queries_per_pass``, and implement
+    ``_create_query_set()``, ``_get_entry_size()`` and ``_collect_frame()``.
+    """
+
+    _feature = ""
+    _queries_per_pass = 1
+
+    def __init__(self, device, name, max_passes, ring_size, history):
+        self._device = device or wgpu.utils.get_default_device()
+        self._name = str(name)
+        self._max_passes = int(max_passes)
+        self._history = int(history)
+        self._pending = deque()  # (promise, labels) of frames not yet read back
+        self._slots = []
+        self._index = 0
+        if self._feature in self._device.features:
+            for _ in range(max(1, int(ring_size))):
+                resolve_buffer = self._device.create_buffer(
+                    size=self._get_entry_size() * self._max_passes,
+                    usage=wgpu.BufferUsage.QUERY_RESOLVE | wgpu.BufferUsage.COPY_SRC,
+                )
+                slot = {
+                    "query_set": self._create_query_set(),
+                    "resolve_buffer": resolve_buffer,
+                    "labels": [],
+                    "promise": None,
+                }
+                self._slots.append(slot)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} '{self._name}' at {hex(id(self))}>"
+
+    @property
+    def name(self):
+        """The name of this profiler."""
+        return self._name
+
+    def _create_query_set(self):
+        raise NotImplementedError()
+
+    def _get_entry_size(self):
+        raise NotImplementedError()
+
+    def _add_pass(self, label):
+        # Get the slot and the index of the pass in the current frame, or None
+        if not self._slots:
+            return None
+        slot = self._slots[self._index]
+        i = len(slot["labels"])
+        if i >= self._max_passes:
+            return None
+        slot["labels"].append(str(label))
+        return slot, i
+
+    def end_frame(self):
+        """Resolve the queries of this frame, and start reading them back.
+
+        Call this after the passes of the frame have been submitted.
+        """
+        if not self._slots:
+            return
+        device = self._device
+        slot = self._slots[self._index]
+        n = len(slot["labels"])
+        if n:
+            command_encoder = device.create_command_encoder()
+            command_encoder.resolve_query_set(
+                slot["query_set"],
+                0,
+                self._queries_per_pass * n,
+                slot["resolve_buffer"],
+                0,
+            )
+            device.queue.submit([command_encoder.finish()])
+            slot["promise"] = device.queue.read_buffer_async(
+                slot["resolve_buffer"], 0, self._get_entry_size() * n
+            )
+        # Move to the next slot, collecting its results if they're available
+        self._index = (self._index + 1) % len(self._slots)
+        self._release_slot(self._slots[self._index])
+        self._collect(False)
+
+    def flush(self):
+        """Wait for and collect the results of all frames in flight."""
+        for i in range(len(self._slots)):
+            self._release_slot(self._slots[(self._index + i + 1) % len(self._slots)])
+        self._collect(True)
+
+    def _release_slot(self, slot):
+        # Make the slot available for a new frame, keeping its readback for later
+        if slot["promise"] is not None:
+            self._pending.append((slot["promise"], slot["labels"]))
+            slot["labels"] = []
+            slot["promise"] = None
+
+    def _collect(self, wait):
+        # Collect frames in order, so results (and callbacks) are processed in
+        # the same order as the passes were profiled. Stop at a frame that is
+        # not ready yet, unless wait is True.
+        while self._pending:
+            promise, labels = self._pending[0]
+            if not (wait or self._is_resolved(promise)):
+                break
+            self._pending.popleft()
+            self._collect_frame(promise.sync_wait().cast("Q"), labels)
+
+    def _is_resolved(self, promise):
+        # Poll the device (without blocking), and get whether the promise is resolved
+        if promise._state == "pending" and promise._poller is not None:
+            promise._poller()
+        return promise._state != "pending"
+
+    def _collect_frame(self, values, labels):
+        raise NotImplementedError()
+
+
+class GpuProfiler(_QueryRing):
+    """Measure the time that labelled passes take on the GPU.
+
+    For each pass to profile, call ``timestamp_writes(label)`` and pass the
+    result as the ``timestamp_writes`` argument of ``begin_compute_pass()``
+    or ``begin_render_pass()``. After submitting the work of a frame, call
+    ``end_frame()``. This resolves the timestamps of the frame, and starts
+    reading them back asynchronously.
+
+    The profiler has a ring of query sets, one for each frame in flight. The
+    timestamps of a frame are collected when its query set is about to be
+    reused, ``ring_size`` frames later. By then the GPU is typically done. If
+    it is not, the timestamps are collected in a later frame, so profiling
+    does not stall the pipeline. Only ``flush()`` waits for the GPU.
+
+    The device must have the "timestamp-query" feature. If it does not, the
+    profiler is disabled: ``timestamp_writes()`` returns None, and no times
+    are measured.
+
+    The measured times are available via ``get_times()``, and via the
+    ``wgpu.diagnostics.gpu_timings`` topic.
+
+    Arguments:
+        device (GPUDevice, optional): The device to use. Default
+            ``get_default_device()``.
+        name (str): The name of the profiler, used in the diagnostics.
+        max_passes (int): The maximum number of passes to profile per frame.
+        ring_size (int): The number of frames that can be in flight.
+        history (int): The number of frames over which statistics are calculated.
+        callback (callable, optional): A function that is called for each profiled
+            pass when its timestamps are collected, with arguments ``label``,
+            ``begin`` and ``end``. The latter two are the raw GPU timestamps in
+            nanoseconds.
+    """
+
+    _profilers = weakref.WeakSet()
+    _feature = "timestamp-query"
+    _queries_per_pass = 2  # begin and end
+
+    def __init__(
+        self,
+        device=None,
+        *,
+        name="gpu",
+        max_passes=32,
+        ring_size=3,
+        history=60,
+        callback=None,
+    ):
+        self._callback = callback
+        self._times = {}  # label -> deque of times in ms
+        super().__init__(device, name, max_passes, ring_size, history)
+        GpuProfiler._profilers.add(self)
+
+    @property
+    def enabled(self):
+        """Whether the device supports timestamp queries."""
+        return bool(self._slots)
+
+    def _create_query_set(self):
+        return self._device.create_query_set(
+            type="timestamp", count=2 * self._max_passes
+        )
+
+    def _get_entry_size(self):
+        return 16
+
+    def timestamp_writes(self, label):
+        """Get the timestamp writes for a pass with the given label.
+
+        Returns a dict to pass as ``timestamp_writes`` when beginning a
+        compute or render pass. Returns None if the profiler is disabled or
+        when ``max_passes`` passes were already profiled in this frame. If
+        multiple passes in a frame have the same label, their times are summed.
+        """
+        slot_index = self._add_pass(label)
+        if slot_index is None:
+            return None
+        slot, i = slot_index
+        return {
+            "query_set": slot["query_set"],
+            "beginning_of_pass_write_index": 2 * i,
+            "end_of_pass_write_index": 2 * i + 1,
+        }
+
+    def _collect_frame(self, timestamps, labels):
+        frame_times = {}
+        for i, label in enumerate(labels):
+            begin, end = timestamps[2 * i], timestamps[2 * i + 1]
+            if self._callback is not None:
+                self._callback(label, begin, end)
+            t = (end - begin) / 1e6
+            frame_times[label] = frame_times.get(label, 0) + t
+        for label, t in frame_times.items():
+            times = self._times.get(label)
+            if times is None:
+                times = self._times[label] = deque(maxlen=self._history)
+            times.append(t)
+
+    def get_times(self):
+        """Get the measured times, in milliseconds.
+
+        Returns a dict that maps labels to dicts with the fields "last", "mean",
+        "min" and "max", calculated over the last ``history`` frames.
+        """
+        result = {}
+        for label, times in self._times.items():
+            if times:
+                result[label] = {
+                    "last": times[-1],
+                    "mean": sum(times) / len(times),
+                    "min": min(times),
+                    "max": max(times),
+                }
+        return result
+
+    def clear(self):
+        """Clear the measured times."""
+        self._times.clear()
+
+
+class GpuTimingsDiagnostics(DiagnosticsBase):
+    def get_subscript(self):
+        text = ""
+        text += "    * Times are in ms, as measured with a GpuProfiler.\n"
+        text += "    * The statistics are over the profiler's recent history.\n"
+        return text
+
+    def get_dict(self):
+        result = {}
+        for profiler in list(GpuProfiler._profilers):
+            for label, times in profiler.get_times().items():
+                result[f"{profiler.name}.{label}"] = {
+                    key: round(value, 3) for key, value in times.items()
+                }
+        return result
+
+
+gpu_timings_diagnostics = GpuTimingsDiagnostics("gpu_timings")
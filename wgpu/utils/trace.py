@@ -0,0 +1,285 @@
+"""
+Record CPU and GPU activity, and export it as a Chrome trace (for Perfetto or chrome://tracing).
+"""
+
+import json
+import time
+import threading
+import functools
+
+import wgpu
+import wgpu.utils
+from .profiler import GpuProfiler
+
+
+# The methods that are recorded as CPU spans: (class name, method name, span name)
+TRACED_METHODS = [
+    ("GPUCommandEncoder", "finish", "command_encoder.finish"),
+    ("GPUQueue", "submit", "queue.submit"),
+    ("GPUQueue", "write_buffer", "queue.write_buffer"),
+    ("GPUQueue", "write_texture", "queue.write_texture"),
+    ("GPUQueue", "read_buffer", "queue.read_buffer"),
+    ("GPUQueue", "read_texture", "queue.read_texture"),
+]
+
+
+class TraceRecorder:
+    """Record a timeline of CPU and GPU activity, to save as a Chrome trace.
+
+    While recording, the following is recorded on the CPU side: the encoding
+    of compute and render passes (from ``begin_*_pass()`` to ``end()``),
+    ``command_encoder.finish()``, ``queue.submit()``, the ``queue.read_*``
+    and ``queue.write_*`` methods, and the time spent in ``sync_wait()`` on
+    promises, e.g. when waiting for ``buffer.map_async()``.
+
+    If the device has the "timestamp-query" feature, passes that are begun
+    without ``timestamp_writes`` are profiled with a ``GpuProfiler``, and their
+    execution on the GPU is recorded as well. The GPU clock is aligned to the
+    CPU clock under the assumption that the GPU does not start a pass before
+    it is submitted: the GPU spans are shifted by the smallest offset that
+    puts each pass after its ``queue.submit()``.
+
+    The recorder works by temporarily replacing methods of the wgpu classes,
+    so only one recorder can record at a time. Recording also works as a
+    context manager:
+
+    .. code-block:: py
+
+        recorder = TraceRecorder(device)
+        with recorder:
+            ...  # do work
+        recorder.save("trace.json")
+
+    The resulting file can be opened in https://ui.perfetto.dev or in
+    ``chrome://tracing``.
+
+    Arguments:
+        device (GPUDevice, optional): The device to profile the GPU passes on.
+            Default ``get_default_device()``.
+        max_passes (int): The maximum number of passes to profile per submit.
+    """
+
+    _recording = None  # the recorder that is currently recording
+
+    def __init__(self, device=None, *, max_passes=32):
+        self._device = device or wgpu.utils.get_default_device()
+        self._max_passes = int(max_passes)
+        self._patches = []  # (cls, name, original) tuples
+        self._busy = False  # set while the recorder does its own gpu work
+        self._profiler = None
+        self._t_start = None
+        self._cpu_spans = []  # (name, tid, begin, end) in ns
+        self._gpu_spans = []  # (name, begin, end, submit) in ns
+        self._passes = []  # profiled passes, in the order of their timestamps
+        self._open_passes = {}  # id(pass_encoder) -> (name, tid, begin)
+        self._thread_names = {}
+
+    @property
+    def recording(self):
+        """Whether this recorder is currently recording."""
+        return TraceRecorder._recording is self
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def start(self):
+        """Start recording. Previously recorded spans are cleared."""
+        if TraceRecorder._recording is not None:
+            raise RuntimeError("Another TraceRecorder is already recording.")
+        TraceRecorder._recording = self
+        self._cpu_spans.clear()
+        self._gpu_spans.clear()
+        self._passes.clear()
+        self._open_passes.clear()
+        self._profiler = GpuProfiler(
+            self._device,
+            name="trace",
+            max_passes=self._max_passes,
+            callback=self._on_gpu_timestamps,
+        )
+        self._t_start = time.perf_counter_ns()
+        for cls_name, method_name, span_name in TRACED_METHODS:
+            self._patch(cls_name, method_name, self._wrap_span, span_name)
+        self._patch("GPUCommandEncoder", "begin_compute_pass", self._wrap_begin_pass)
+        self._patch("GPUCommandEncoder", "begin_render_pass", self._wrap_begin_pass)
+        self._patch("GPUComputePassEncoder", "end", self._wrap_end_pass)
+        self._patch("GPURenderPassEncoder", "end", self._wrap_end_pass)
+        self._patch("GPUPromise", "sync_wait", self._wrap_sync_wait)
+
+    def stop(self):
+        """Stop recording, and collect the GPU timestamps."""
+        if TraceRecorder._recording is not self:
+            return
+        for cls, name, original in reversed(self._patches):
+            setattr(cls, name, original)
+        self._patches.clear()
+        TraceRecorder._recording = None
+        self._profiler.end_frame()
+        self._profiler.flush()
+
+    def _patch(self, cls_name, method_name, wrap, *args):
+        # Patch the class that defines the method, and the subclasses that override it
+        base = getattr(wgpu.classes, cls_name)
+        base = next(c for c in base.__mro__ if method_name in c.__dict__)
+        classes = [base]
+        for cls in classes:
+            classes.extend(c for c in cls.__subclasses__() if c not in classes)
+        for cls in classes:
+            original = cls.__dict__.get(method_name, None)
+            if original is not None:
+                self._patches.append((cls, method_name, original))
+                wrapper = functools.wraps(original)(wrap(original, *args))
+                setattr(cls, method_name, wrapper)
+
+    def _add_cpu_span(self, name, begin, end, tid=None):
+        if tid is None:
+            thread = threading.current_thread()
+            tid = thread.ident
+            self._thread_names.setdefault(tid, thread.name)
+        self._cpu_spans.append((name, tid, begin, end))
+
+    def _wrap_span(self, func, name):
+        def wrapper(*args, **kwargs):
+            if self._busy:
+                return func(*args, **kwargs)
+            t0 = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._add_cpu_span(name, t0, time.perf_counter_ns())
+                if name == "queue.submit":
+                    self._on_submit(t0)
+
+        return wrapper
+
+    def _wrap_sync_wait(self, func):
+        def wrapper(promise):
+            if self._busy:
+                return func(promise)
+            t0 = time.perf_counter_ns()
+            try:
+                return func(promise)
+            finally:
+                name = f"sync_wait {promise._title}"
+                self._add_cpu_span(name, t0, time.perf_counter_ns())
+
+        return wrapper
+
+    def _wrap_begin_pass(self, func):
+        kind = "compute pass" if "compute" in func.__name__ else "render pass"
+
+        def wrapper(command_encoder, **kwargs):
+            if self._busy:
+                return func(command_encoder, **kwargs)
+            t0 = time.perf_counter_ns()
+            name = kwargs.get("label", "") or kind
+            if kwargs.get("timestamp_writes", None) is None:
+                timestamp_writes = self._profiler.timestamp_writes(name)
+                if timestamp_writes is not None:
+                    kwargs["timestamp_writes"] = timestamp_writes
+                    self._passes.append({"name": name, "submit": None})
+            pass_encoder = func(command_encoder, **kwargs)
+            thread = threading.current_thread()
+            self._thread_names.setdefault(thread.ident, thread.name)
+            self._open_passes[id(pass_encoder)] = (name, thread.ident, t0)
+            return pass_encoder
+
+        return wrapper
+
+    def _wrap_end_pass(self, func):
+        def wrapper(pass_encoder):
+            result = func(pass_encoder)
+            span = self._open_passes.pop(id(pass_encoder), None)
+            if span is not None:
+                name, tid, t0 = span
+                self._add_cpu_span(f"encode {name}", t0, time.perf_counter_ns(), tid)
+            return result
+
+        return wrapper
+
+    def _on_submit(self, t_submit):
+        # All profiled passes so far have been submitted (or never will be)
+        for info in self._passes:
+            if info["submit"] is None:
+                info["submit"] = t_submit
+        # Resolve the timestamps of the submitted passes
+        self._busy = True
+        try:
+            self._profiler.end_frame()
+        finally:
+            self._busy = False
+
+    def _on_gpu_timestamps(self, label, begin, end):
+        # The profiler reports passes in the same order as they were begun
+        info = self._passes.pop(0)
+        if info["submit"] is not None and 0 < begin <= end:
+            self._gpu_spans.append((label, begin, end, info["submit"]))
+
+    def get_events(self):
+        """Get the recorded spans as a list of Chrome trace events.
+
+        CPU spans are in process 1, with a thread per Python thread. GPU spans
+        are in process 2. Timestamps are in microseconds since the start of
+        the recording.
+        """
+        if self._t_start is None:
+            return []
+        t_start = self._t_start
+        events = [
+            _metadata_event("process_name", 1, None, "CPU"),
+            _metadata_event("process_name", 2, None, "GPU"),
+            _metadata_event("thread_name", 2, 0, self._device.adapter.summary),
+        ]
+        for tid, name in self._thread_names.items():
+            events.append(_metadata_event("thread_name", 1, tid, name))
+        for name, tid, begin, end in self._cpu_spans:
+            events.append(
+                _span_event(name, "cpu", 1, tid, begin - t_start, end - begin)
+            )
+        if self._gpu_spans:
+            offset = max(submit - begin for _, begin, _, submit in self._gpu_spans)
+            for name, begin, end, _ in self._gpu_spans:
+                ts = begin + offset - t_start
+                events.append(_span_event(name, "gpu", 2, 0, ts, end - begin))
+        return events
+
+    def save(self, filename):
+        """Save the recording as a Chrome trace JSON file.
+
+        The trace's metadata includes a snapshot of ``wgpu.diagnostics``.
+        """
+        self.stop()
+        trace = {
+            "traceEvents": self.get_events(),
+            "displayTimeUnit": "ms",
+            "metadata": {
+                "wgpu-version": wgpu.__version__,
+                "adapter": self._device.adapter.summary,
+                "diagnostics": wgpu.diagnostics.get_dict(),
+            },
+        }
+        with open(filename, "wb") as f:
+            f.write(json.dumps(trace, default=str).encode())
+
+
+def _span_event(name, cat, pid, tid, begin, duration):
+    return {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "pid": pid,
+        "tid": tid,
+        "ts": begin / 1000,
+        "dur": duration / 1000,
+    }
+
+
+def _metadata_event(name, pid, tid, value):
+    event = {"name": name, "ph": "M", "pid": pid, "args": {"name": value}}
+    if tid is not None:
+        event["tid"] = tid
+    return event